@@ -0,0 +1,5 @@
+"""
+Benchmark suite for Telegram Tool
+Local stand-ins for Odoo and the Telegram Bot API, and runners that measure
+the wrapper functions and command handlers against them
+"""
@@ -0,0 +1,348 @@
+"""
+Fake Bot API Server
+A local stand-in for the Telegram Bot API: answers the methods the bot
+calls with well-formed results, serves voice files and hands out queued
+updates to getUpdates, so handlers run end to end without Telegram
+
+Point TelegramCommandBot at it with TELEGRAM_API_BASE_URL=http://127.0.0.1:<port>
+
+Usage:
+    python -m benchmarks.fake_bot_api --port 8081
+"""
+
+import sys
+import json
+import time
+import argparse
+import threading
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+
+BOT_USER = {
+    "id": 100000001,
+    "is_bot": True,
+    "first_name": "Benchmark Bot",
+    "username": "benchmark_bot",
+    "can_join_groups": True,
+    "can_read_all_group_messages": False,
+    "supports_inline_queries": True,
+}
+
+# Methods that simply succeed
+TRUE_METHODS = {
+    "answerCallbackQuery", "answerInlineQuery", "sendChatAction", "setMyCommands", "deleteMyCommands",
+    "setWebhook", "deleteWebhook", "deleteMessage", "logOut", "close",
+}
+MESSAGE_METHODS = {"sendMessage", "sendPhoto", "sendDocument", "sendVoice", "sendAudio"}
+EDIT_METHODS = {"editMessageText", "editMessageReplyMarkup", "editMessageCaption"}
+
+# Parameters sent as numbers (everything else stays a string unless it is JSON)
+NUMERIC_PARAMETERS = {"chat_id", "message_id", "offset", "limit", "timeout", "reply_to_message_id", "cache_time"}
+
+# A few KB of "OGG" audio for voice downloads
+DEFAULT_FILE_CONTENT = b"OggS" + bytes(4092)
+
+
+def _parse_parameters(content_type: str, body: bytes) -> Dict[str, Any]:
+    """Decode Bot API parameters sent as JSON, form data or multipart."""
+    if not body:
+        return {}
+
+    if content_type.startswith("application/json"):
+        return json.loads(body)
+
+    if content_type.startswith("multipart/form-data"):
+        message = BytesParser().parsebytes(b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + body)
+        raw = {
+            part.get_param("name", header="content-disposition"): part.get_payload(decode=True).decode(errors="replace")
+            for part in message.get_payload()
+            if not part.get_filename()
+        }
+    else:
+        raw = {key: values[-1] for key, values in parse_qs(body.decode(), keep_blank_values=True).items()}
+
+    parameters: Dict[str, Any] = {}
+    for key, value in raw.items():
+        if key in NUMERIC_PARAMETERS:
+            try:
+                value = int(value)
+            except ValueError:
+                pass
+        elif value[:1] in ("{", "["):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                pass
+        parameters[key] = value
+    return parameters
+
+
+class FakeBotApiServer:
+    """
+    Answers Bot API calls locally and counts them per method.
+
+    Updates pushed with push_updates() (or POST /_updates) are returned by
+    getUpdates, so a polling bot receives them like real traffic. Control
+    endpoints: GET /_stats, POST /_reset, POST /_updates.
+
+    Example:
+        server = FakeBotApiServer(latency=0.03).start()
+        os.environ["TELEGRAM_API_BASE_URL"] = server.url
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 file_content: bytes = DEFAULT_FILE_CONTENT):
+        """
+        Initialize the server.
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free one)
+            latency: Seconds added to every Bot API call, to mimic the round trip to Telegram
+            file_content: Bytes served for every file download (voice messages)
+        """
+        self.latency = latency
+        self.file_content = file_content
+
+        self._calls: Dict[str, int] = {}
+        self._updates: List[Dict[str, Any]] = []
+        self._next_update_id = 1
+        self._next_message_id = 1
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+        self._server = ThreadingHTTPServer((host, port), _RequestHandler)
+        self._server.daemon_threads = True
+        self._server.api = self
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def url(self) -> str:
+        return f"http://{self._server.server_address[0]}:{self.port}"
+
+    def serve_forever(self):
+        """Serve until the process is stopped."""
+        self._server.serve_forever()
+
+    def start(self) -> "FakeBotApiServer":
+        """Serve on a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-bot-api", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeBotApiServer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    # ============================================
+    # UPDATES AND STATS
+    # ============================================
+
+    def push_updates(self, updates: List[Dict[str, Any]]) -> int:
+        """Queue updates for getUpdates (update_id is assigned if missing); returns the queue length."""
+        with self._condition:
+            for update in updates:
+                update = dict(update)
+                update.setdefault("update_id", self._next_update_id)
+                self._next_update_id = max(self._next_update_id, update["update_id"]) + 1
+                self._updates.append(update)
+            self._condition.notify_all()
+            return len(self._updates)
+
+    def stats(self) -> Dict[str, Any]:
+        """Call counts since the last reset and the number of undelivered updates."""
+        with self._condition:
+            calls = dict(self._calls)
+            pending = len(self._updates)
+        return {"calls": sum(calls.values()), "by_method": calls, "pending_updates": pending}
+
+    def reset_stats(self):
+        with self._condition:
+            self._calls.clear()
+
+    # ============================================
+    # BOT API METHODS
+    # ============================================
+
+    def call(self, method: str, parameters: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """Answer one Bot API call; returns (HTTP status, response body)."""
+        with self._condition:
+            self._calls[method] = self._calls.get(method, 0) + 1
+
+        if method == "getUpdates":
+            return 200, {"ok": True, "result": self._get_updates(parameters)}
+
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        if method == "getMe":
+            result: Any = BOT_USER
+        elif method in MESSAGE_METHODS:
+            result = self._message(parameters)
+        elif method in EDIT_METHODS:
+            result = True if "inline_message_id" in parameters else self._message(parameters, parameters.get("message_id"))
+        elif method == "getFile":
+            file_id = str(parameters.get("file_id", ""))
+            result = {"file_id": file_id, "file_unique_id": file_id, "file_size": len(self.file_content),
+                      "file_path": f"voice/{file_id}.oga"}
+        elif method == "getWebhookInfo":
+            result = {"url": "", "has_custom_certificate": False, "pending_update_count": self.stats()["pending_updates"]}
+        elif method in TRUE_METHODS:
+            result = True
+        else:
+            return 404, {"ok": False, "error_code": 404, "description": "Not Found: method not found"}
+
+        return 200, {"ok": True, "result": result}
+
+    def _message(self, parameters: Dict[str, Any], message_id: Optional[int] = None) -> Dict[str, Any]:
+        if message_id is None:
+            with self._condition:
+                message_id = self._next_message_id
+                self._next_message_id += 1
+
+        message = {
+            "message_id": message_id,
+            "date": int(time.time()),
+            "chat": {"id": parameters.get("chat_id", 0), "type": "private"},
+            "from": BOT_USER,
+            "text": str(parameters.get("text", "")),
+        }
+        if isinstance(parameters.get("reply_markup"), dict):
+            message["reply_markup"] = parameters["reply_markup"]
+        return message
+
+    def _get_updates(self, parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        offset = int(parameters.get("offset") or 0)
+        limit = int(parameters.get("limit") or 100)
+        timeout = float(parameters.get("timeout") or 0)
+        deadline = time.monotonic() + timeout
+
+        with self._condition:
+            while True:
+                # Updates below the offset were confirmed by the bot
+                self._updates = [update for update in self._updates if update["update_id"] >= offset]
+                if self._updates:
+                    return self._updates[:limit]
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return []
+                self._condition.wait(remaining)
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this, keep-alive calls wait for delayed ACKs
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, data: Any):
+        self._send(status, json.dumps(data).encode())
+
+    def _handle(self):
+        api: FakeBotApiServer = self.server.api
+        path = urlparse(self.path).path
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        if path == "/_stats":
+            return self._send_json(200, api.stats())
+        if path == "/_reset":
+            api.reset_stats()
+            return self._send_json(200, {"ok": True})
+        if path == "/_updates":
+            updates = json.loads(body or b"[]")
+            queued = api.push_updates(updates if isinstance(updates, list) else [updates])
+            return self._send_json(200, {"ok": True, "pending_updates": queued})
+
+        if path.startswith("/file/bot"):
+            return self._send(200, api.file_content, "application/octet-stream")
+
+        # /bot<token>/<method>
+        if not path.startswith("/bot") or path.count("/") != 2:
+            return self._send_json(404, {"ok": False, "error_code": 404, "description": "Not Found"})
+
+        method = path.rsplit("/", 1)[1]
+        parameters = {key: values[-1] for key, values in parse_qs(urlparse(self.path).query).items()}
+        try:
+            parameters.update(_parse_parameters(self.headers.get("Content-Type", ""), body))
+        except ValueError as e:
+            return self._send_json(400, {"ok": False, "error_code": 400, "description": f"Bad Request: {e}"})
+
+        status, response = api.call(method, parameters)
+        self._send_json(status, response)
+
+    do_GET = _handle
+    do_POST = _handle
+
+
+class FakeBotApiControl:
+    """Reads stats from and queues updates on a FakeBotApiServer running in another process."""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        self._client = httpx.Client(timeout=30)
+
+    def stats(self) -> Dict[str, Any]:
+        return self._client.get(f"{self.url}/_stats").json()
+
+    def calls(self) -> int:
+        return self.stats()["calls"]
+
+    def reset_stats(self):
+        self._client.post(f"{self.url}/_reset")
+
+    def push_updates(self, updates: List[Dict[str, Any]]) -> int:
+        """Queue updates for the bot's getUpdates; returns the queue length."""
+        return self._client.post(f"{self.url}/_updates", json=updates).json()["pending_updates"]
+
+    def close(self):
+        self._client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake Telegram Bot API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every Bot API call")
+    args = parser.parse_args()
+
+    server = FakeBotApiServer(host=args.host, port=args.port, latency=args.latency)
+    print(f"✓ Fake Bot API listening on {server.url}")
+    print(f"   Run the bot with TELEGRAM_API_BASE_URL={server.url}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Fake Bot API stopped")
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
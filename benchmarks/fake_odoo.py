@@ -0,0 +1,654 @@
+"""
+Fake Odoo Server
+A local stand-in for Odoo's external XML-RPC API (/xmlrpc/2/common and
+/xmlrpc/2/object), seeded with realistic volumes of projects, tasks,
+timesheet lines and invoices, with configurable per-call latency
+
+Usage:
+    python -m benchmarks.fake_odoo --port 8069 --latency 0.05
+"""
+
+import sys
+import time
+import random
+import argparse
+import threading
+from datetime import date, timedelta
+from itertools import accumulate
+from socketserver import ThreadingMixIn
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from xmlrpc.client import Fault
+from xmlrpc.server import SimpleXMLRPCServer, SimpleXMLRPCRequestHandler
+
+# Credentials accepted by the fake server
+DATABASE = "bench"
+LOGIN = "bench@example.com"
+PASSWORD = "bench"
+UID = 2
+
+SERVER_VERSION = "17.0"
+
+# Many2one fields and the model they point to
+RELATIONS = {
+    'company_id': 'res.company',
+    'user_id': 'res.users',
+    'partner_id': 'res.partner',
+    'project_id': 'project.project',
+    'task_id': 'project.task',
+    'employee_id': 'hr.employee',
+}
+
+# Date fields, grouped by month unless a granularity like 'date:day' is given
+DATE_FIELDS = {'date', 'invoice_date', 'date_deadline', 'create_date', 'write_date'}
+
+# Odoo's default ordering per model
+DEFAULT_ORDER = {
+    'account.analytic.line': 'date desc, id desc',
+    'account.move': 'invoice_date desc, id desc',
+    'project.project': 'name, id',
+}
+
+CLIENTS = [
+    "Acme", "Globex", "Initech", "Umbrella", "Stark Industries", "Wayne Enterprises", "Hooli",
+    "Soylent", "Cyberdyne", "Tyrell", "Wonka", "Vandelay", "Gringotts", "Oscorp", "Monarch",
+    "Aperture", "Black Mesa", "Massive Dynamic", "Pied Piper", "Dunder Mifflin",
+]
+PROJECT_KINDS = [
+    "Website", "Mobile App", "ERP Rollout", "Data Migration", "Support", "Maintenance",
+    "Consulting", "Audit", "Training", "Integration", "Redesign", "Analytics", "Infrastructure",
+]
+TASK_VERBS = ["Design", "Implement", "Review", "Test", "Deploy", "Document", "Fix", "Plan", "Refactor", "Migrate"]
+TASK_OBJECTS = [
+    "login flow", "invoice export", "dashboard", "API client", "search page", "reporting",
+    "user roles", "checkout", "email templates", "backups", "CI pipeline", "data model",
+]
+DESCRIPTIONS = ["Meeting", "Development", "Code review", "Bug fixing", "Specification", "Call with client", "Testing"]
+
+
+class FakeOdooData:
+    """
+    In-memory Odoo records, seeded deterministically.
+
+    Implements the ORM methods the bot calls over execute_kw (search,
+    search_read, search_count, read, read_group, create, write, unlink)
+    with Odoo's domain, ordering and many2one conventions.
+    """
+
+    def __init__(
+        self,
+        timesheets: int = 50000,
+        invoices: int = 20000,
+        projects: int = 300,
+        tasks_per_project: int = 40,
+        days: int = 730,
+        seed: int = 42,
+        today: Optional[date] = None
+    ):
+        """
+        Build and seed the dataset.
+
+        Args:
+            timesheets: Number of account.analytic.line rows (about 40% belong to the benchmark user)
+            invoices: Number of account.move rows
+            projects: Number of project.project rows
+            tasks_per_project: Average number of tasks per project (one project gets ten times as many)
+            days: How far back timesheets and invoices go
+            seed: Random seed, so every run sees the same data
+            today: Last day of the seeded history (defaults to today)
+        """
+        self.models: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        self._next_id: Dict[str, int] = {}
+        self.lock = threading.RLock()
+
+        self._seed(timesheets, invoices, projects, tasks_per_project, days, random.Random(seed), today or date.today())
+
+    # ============================================
+    # SEEDING
+    # ============================================
+
+    def add(self, model: str, values: Dict[str, Any]) -> int:
+        """Insert a record and return its ID."""
+        records = self.models.setdefault(model, {})
+        record_id = self._next_id.get(model, 1)
+        self._next_id[model] = record_id + 1
+        records[record_id] = {"id": record_id, **values}
+        return record_id
+
+    def _seed(self, timesheets: int, invoices: int, projects: int, tasks_per_project: int, days: int, rng: random.Random, today: date):
+        main_company = self.add('res.company', {"name": "Acme Consulting"})
+        other_company = self.add('res.company', {"name": "Acme Labs"})
+
+        self.add('res.users', {"name": "Admin", "login": "admin", "company_id": main_company, "company_ids": [main_company]})
+        uid = self.add('res.users', {
+            "name": "Benchmark User", "login": LOGIN,
+            "company_id": main_company, "company_ids": [main_company, other_company],
+        })
+        assert uid == UID
+        colleagues = [
+            self.add('res.users', {"name": f"Colleague {i}", "login": f"colleague{i}", "company_id": main_company,
+                                   "company_ids": [main_company]})
+            for i in range(1, 7)
+        ]
+
+        for user_id in [uid] + colleagues:
+            self.add('hr.employee', {"name": self.models['res.users'][user_id]["name"], "user_id": user_id,
+                                     "company_id": main_company, "active": True})
+
+        partners = [self.add('res.partner', {"name": f"{client} {suffix}"})
+                    for client in CLIENTS for suffix in ("Inc", "GmbH", "SA", "Ltd")]
+
+        project_ids: List[int] = []
+        project_tasks: Dict[int, List[int]] = {}
+        for i in range(projects):
+            client = CLIENTS[i % len(CLIENTS)]
+            kind = PROJECT_KINDS[(i // len(CLIENTS)) % len(PROJECT_KINDS)]
+            name = f"{client} - {kind}" + (f" {i // (len(CLIENTS) * len(PROJECT_KINDS)) + 1}" if i >= len(CLIENTS) * len(PROJECT_KINDS) else "")
+            project_id = self.add('project.project', {
+                "name": name,
+                "company_id": main_company if rng.random() < 0.85 else other_company,
+                "partner_id": rng.choice(partners),
+                "active": rng.random() > 0.05,
+            })
+            project_ids.append(project_id)
+
+            # The first project is the big internal one with hundreds of tasks
+            count = tasks_per_project * 10 if i == 0 else rng.randint(1, max(1, tasks_per_project * 2))
+            project_tasks[project_id] = [
+                self.add('project.task', {
+                    "name": f"{rng.choice(TASK_VERBS)} {rng.choice(TASK_OBJECTS)} #{n + 1}",
+                    "project_id": project_id,
+                    "company_id": self.models['project.project'][project_id]["company_id"],
+                })
+                for n in range(count)
+            ]
+
+        # A few busy projects get most of the hours, like in real life
+        cum_weights = list(accumulate(1.0 / (rank + 1) for rank in range(len(project_ids))))
+        start = today - timedelta(days=days)
+        for _ in range(timesheets):
+            project_id = rng.choices(project_ids, cum_weights=cum_weights)[0]
+            day = start + timedelta(days=rng.randint(0, days))
+            self.add('account.analytic.line', {
+                "name": rng.choice(DESCRIPTIONS),
+                "date": day.isoformat(),
+                "unit_amount": rng.choice([0.25, 0.5, 1.0, 1.5, 2.0, 3.0, 4.0, 6.0, 8.0]),
+                "user_id": uid if rng.random() < 0.4 else rng.choice(colleagues),
+                "project_id": project_id,
+                "task_id": rng.choice(project_tasks[project_id]),
+                "company_id": self.models['project.project'][project_id]["company_id"],
+            })
+
+        for n in range(invoices):
+            untaxed = round(rng.uniform(200, 20000), 2)
+            total = round(untaxed * rng.choice([1.0, 1.077, 1.2]), 2)
+            paid = rng.random()
+            residual = 0.0 if paid < 0.7 else (round(total * rng.random(), 2) if paid < 0.8 else total)
+            move_type = rng.choices(["out_invoice", "in_invoice", "out_refund"], [85, 10, 5])[0]
+            self.add('account.move', {
+                "name": f"INV/{n + 1:06d}",
+                "move_type": move_type,
+                "state": rng.choices(["posted", "draft", "cancel"], [90, 7, 3])[0],
+                "invoice_date": (start + timedelta(days=rng.randint(0, days))).isoformat(),
+                "partner_id": rng.choice(partners),
+                "company_id": main_company if rng.random() < 0.9 else other_company,
+                "amount_untaxed": untaxed,
+                "amount_total": total,
+                "amount_residual": residual,
+            })
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of records per model."""
+        with self.lock:
+            return {model: len(records) for model, records in self.models.items()}
+
+    # ============================================
+    # ORM METHODS
+    # ============================================
+
+    def call(self, model: str, method: str, args: Sequence[Any], kwargs: Dict[str, Any]) -> Any:
+        """Run an ORM method like execute_kw would."""
+        if model not in self.models:
+            raise ValueError(f"Object {model} doesn't exist")
+
+        handler = getattr(self, f"_{method}", None)
+        if handler is None:
+            raise ValueError(f"The method '{method}' does not exist on the model '{model}'")
+
+        with self.lock:
+            return handler(model, *args, **kwargs)
+
+    def _records(self, model: str, domain: Optional[List[Any]], offset: int = 0, limit: Optional[int] = None,
+                 order: Optional[str] = None) -> List[Dict[str, Any]]:
+        matches = compile_domain(domain or [])
+        records = [record for record in self.models[model].values() if matches(record)]
+
+        for field, descending in reversed(parse_order(order or DEFAULT_ORDER.get(model, 'id'))):
+            records.sort(key=lambda record: _sort_key(record.get(field, False)), reverse=descending)
+
+        return records[offset:offset + limit if limit else None]
+
+    def _read_record(self, model: str, record: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+        fields = fields or [field for field in record if field != "id"]
+        row = {"id": record["id"]}
+
+        for field in fields:
+            if field == "display_name":
+                row[field] = record.get("name", f"{model},{record['id']}")
+                continue
+            if field not in record and field not in self._fields(model):
+                raise ValueError(f"Invalid field '{field}' on model '{model}'")
+
+            value = record.get(field, False)
+            if field in RELATIONS and not isinstance(value, list):
+                value = [value, self._display_name(RELATIONS[field], value)] if value else False
+            row[field] = value
+
+        return row
+
+    def _fields(self, model: str) -> set:
+        records = self.models[model]
+        return set(next(iter(records.values()))) if records else {"id"}
+
+    def _display_name(self, model: str, record_id: int) -> str:
+        record = self.models.get(model, {}).get(record_id)
+        return record.get("name", f"{model},{record_id}") if record else f"{model},{record_id}"
+
+    def _search(self, model: str, domain=None, offset: int = 0, limit: Optional[int] = None, order: Optional[str] = None,
+                count: bool = False, context=None):
+        records = self._records(model, domain, offset, limit, order)
+        return len(records) if count else [record["id"] for record in records]
+
+    def _search_count(self, model: str, domain=None, limit: Optional[int] = None, context=None) -> int:
+        return len(self._records(model, domain, limit=limit))
+
+    def _search_read(self, model: str, domain=None, fields=None, offset: int = 0, limit: Optional[int] = None,
+                     order: Optional[str] = None, context=None) -> List[Dict[str, Any]]:
+        return [self._read_record(model, record, fields) for record in self._records(model, domain, offset, limit, order)]
+
+    def _read(self, model: str, ids, fields=None, context=None, load=None) -> List[Dict[str, Any]]:
+        ids = [ids] if isinstance(ids, int) else ids
+        records = self.models[model]
+        return [self._read_record(model, records[record_id], fields) for record_id in ids if record_id in records]
+
+    def _read_group(self, model: str, domain, fields, groupby, offset: int = 0, limit: Optional[int] = None,
+                    orderby=False, lazy: bool = True, context=None) -> List[Dict[str, Any]]:
+        groupby = [groupby] if isinstance(groupby, str) else list(groupby)
+        if not groupby:
+            raise ValueError("read_group needs at least one groupby")
+        if lazy:
+            groupby = groupby[:1]
+
+        # 'unit_amount:sum' and 'unit_amount' both sum unit_amount
+        aggregates = []
+        for spec in fields:
+            name, _, function = spec.partition(":")
+            if name not in {spec.split(":")[0] for spec in groupby} and name != "__count":
+                aggregates.append((name, function or "sum"))
+
+        groups: Dict[Tuple, Dict[str, Any]] = {}
+        for record in self._records(model, domain, order='id'):
+            key = tuple(_group_key(record.get(spec.split(":")[0], False), spec) for spec in groupby)
+            group = groups.setdefault(key, {"__count": 0, "records": []})
+            group["__count"] += 1
+            group["records"].append(record)
+
+        result = []
+        for key in sorted(groups, key=lambda key: tuple(_sort_key(part) for part in key)):
+            group = groups[key]
+            row: Dict[str, Any] = {}
+            group_domain = list(domain or [])
+            ranges = {}
+
+            for spec, value in zip(groupby, key):
+                field, _, granularity = spec.partition(":")
+                if isinstance(value, tuple):
+                    start, end = value
+                    row[spec] = _date_label(start, granularity or "month")
+                    ranges[spec] = {"from": start.isoformat(), "to": end.isoformat()}
+                    group_domain += [(field, '>=', start.isoformat()), (field, '<', end.isoformat())]
+                elif field in RELATIONS:
+                    row[spec] = [value, self._display_name(RELATIONS[field], value)] if value else False
+                    group_domain.append((field, '=', value))
+                else:
+                    row[spec] = value
+                    group_domain.append((field, '=', value))
+
+            for name, function in aggregates:
+                values = [float(record.get(name) or 0.0) for record in group["records"]]
+                row[name] = {"sum": sum, "max": max, "min": min}.get(function, sum)(values) if values else 0.0
+
+            if lazy:
+                row[f"{groupby[0].split(':')[0]}_count"] = group["__count"]
+            else:
+                row["__count"] = group["__count"]
+            row["__domain"] = group_domain
+            if ranges:
+                row["__range"] = ranges
+            result.append(row)
+
+        return result[offset:offset + limit if limit else None]
+
+    def _create(self, model: str, values, context=None):
+        if isinstance(values, list):
+            return [self._create(model, item) for item in values]
+
+        values = dict(values)
+        if model == 'account.analytic.line':
+            values.setdefault("user_id", UID)
+            if values.get("project_id"):
+                values.setdefault("company_id", self.models['project.project'][values["project_id"]]["company_id"])
+            values.setdefault("date", date.today().isoformat())
+            values.setdefault("unit_amount", 0.0)
+
+        for field in self._fields(model):
+            values.setdefault(field, False)
+        values.pop("id", None)
+        return self.add(model, values)
+
+    def _write(self, model: str, ids, values, context=None) -> bool:
+        for record_id in [ids] if isinstance(ids, int) else ids:
+            self.models[model][record_id].update(values)
+        return True
+
+    def _unlink(self, model: str, ids, context=None) -> bool:
+        for record_id in [ids] if isinstance(ids, int) else ids:
+            self.models[model].pop(record_id, None)
+        return True
+
+    def _check_access_rights(self, model: str, operation, raise_exception: bool = True, context=None) -> bool:
+        return True
+
+
+# ============================================
+# DOMAINS AND ORDERING
+# ============================================
+
+_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    '=': lambda value, arg: value == arg or (arg is False and value in (None, False, [])),
+    '!=': lambda value, arg: not (value == arg or (arg is False and value in (None, False, []))),
+    '<': lambda value, arg: value is not False and value < arg,
+    '<=': lambda value, arg: value is not False and value <= arg,
+    '>': lambda value, arg: value is not False and value > arg,
+    '>=': lambda value, arg: value is not False and value >= arg,
+    'in': lambda value, arg: (any(item in arg for item in value) if isinstance(value, list) else value in arg),
+    'not in': lambda value, arg: not (any(item in arg for item in value) if isinstance(value, list) else value in arg),
+    'like': lambda value, arg: value is not False and str(arg) in str(value),
+    'ilike': lambda value, arg: value is not False and str(arg).lower() in str(value).lower(),
+    'not ilike': lambda value, arg: value is False or str(arg).lower() not in str(value).lower(),
+    'child_of': lambda value, arg: value in (arg if isinstance(arg, list) else [arg]),
+}
+
+
+def compile_domain(domain: List[Any]) -> Callable[[Dict[str, Any]], bool]:
+    """
+    Turn an Odoo domain (prefix notation with '&', '|', '!') into a predicate.
+
+    Raises:
+        ValueError: On unknown operators or malformed domains
+    """
+    stack: List[Callable[[Dict[str, Any]], bool]] = []
+
+    for term in reversed(domain):
+        if term == '!':
+            operand = stack.pop()
+            stack.append(lambda record, operand=operand: not operand(record))
+        elif term in ('&', '|'):
+            left, right = stack.pop(), stack.pop()
+            if term == '&':
+                stack.append(lambda record, left=left, right=right: left(record) and right(record))
+            else:
+                stack.append(lambda record, left=left, right=right: left(record) or right(record))
+        elif isinstance(term, (list, tuple)) and len(term) == 3:
+            field, operator, arg = term
+            if field in (0, 1):
+                # TRUE_LEAF (1, '=', 1) / FALSE_LEAF (0, '=', 1)
+                stack.append(lambda record, result=(field == arg): result)
+                continue
+            if operator not in _OPERATORS:
+                raise ValueError(f"Invalid domain operator '{operator}'")
+            check = _OPERATORS[operator]
+            stack.append(lambda record, field=field, check=check, arg=arg: check(record.get(field, False), arg))
+        else:
+            raise ValueError(f"Invalid domain term {term!r}")
+
+    # Leftover terms are implicitly and-ed
+    return lambda record: all(predicate(record) for predicate in stack)
+
+
+def parse_order(order: str) -> List[Tuple[str, bool]]:
+    """Parse "date desc, id" into [("date", True), ("id", False)]."""
+    result = []
+    for part in order.split(","):
+        words = part.split()
+        if words:
+            result.append((words[0], len(words) > 1 and words[1].lower() == "desc"))
+    return result
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    # Empty values sort last, like NULLs in PostgreSQL
+    if value is False or value is None:
+        return (1, 0)
+    if isinstance(value, tuple):
+        return (0, value[0].isoformat())
+    if isinstance(value, list):
+        return (0, value[0] if value else 0)
+    return (0, value)
+
+
+def _group_key(value: Any, spec: str) -> Any:
+    """Bucket a value for a groupby spec such as 'date:day' or 'project_id'."""
+    field, _, granularity = spec.partition(":")
+    if not value:
+        return False
+    if field not in DATE_FIELDS:
+        return value
+
+    day = date.fromisoformat(value[:10])
+    granularity = granularity or "month"
+    if granularity == "day":
+        start, end = day, day + timedelta(days=1)
+    elif granularity == "week":
+        start = day - timedelta(days=day.weekday())
+        end = start + timedelta(days=7)
+    elif granularity == "month":
+        start = day.replace(day=1)
+        end = (start + timedelta(days=32)).replace(day=1)
+    elif granularity == "quarter":
+        start = day.replace(month=(day.month - 1) // 3 * 3 + 1, day=1)
+        end = (start + timedelta(days=93)).replace(day=1)
+    elif granularity == "year":
+        start, end = day.replace(month=1, day=1), day.replace(year=day.year + 1, month=1, day=1)
+    else:
+        raise ValueError(f"Invalid date granularity '{granularity}'")
+    return (start, end)
+
+
+def _date_label(start: date, granularity: str) -> str:
+    # Same (localized-looking) labels as Odoo, which is why callers should use __range
+    if granularity == "day":
+        return start.strftime("%d %b %Y")
+    if granularity == "week":
+        return f"W{start.isocalendar()[1]:02d} {start.isocalendar()[0]}"
+    if granularity == "quarter":
+        return f"Q{(start.month - 1) // 3 + 1} {start.year}"
+    if granularity == "year":
+        return str(start.year)
+    return start.strftime("%B %Y")
+
+
+# ============================================
+# SERVER
+# ============================================
+
+class _RequestHandler(SimpleXMLRPCRequestHandler):
+    rpc_paths = ('/xmlrpc/2/common', '/xmlrpc/2/object', '/xmlrpc/common', '/xmlrpc/object', '/xmlrpc/2/benchmark')
+    # Keep connections open between calls, like Odoo behind a reverse proxy
+    protocol_version = "HTTP/1.1"
+
+
+class _ThreadingXMLRPCServer(ThreadingMixIn, SimpleXMLRPCServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class FakeOdooServer:
+    """
+    Serves a FakeOdooData over Odoo's XML-RPC endpoints.
+
+    Log in with DATABASE / LOGIN / PASSWORD. Every call to the object
+    endpoint sleeps ``latency`` (plus up to ``jitter``) seconds and is
+    counted per model and method; /xmlrpc/2/benchmark exposes stats()
+    and reset_stats() so a benchmark can read the RPC count of each step.
+
+    Example:
+        with FakeOdooServer(latency=0.02, timesheets=5000).start() as server:
+            client = XmlRpcOdooClient(server.url, DATABASE, LOGIN, PASSWORD)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 data: Optional[FakeOdooData] = None, **seed_options):
+        """
+        Initialize the server (seeding happens here, serving starts with start() or serve_forever()).
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free one)
+            latency: Seconds added to every RPC, to mimic a remote Odoo
+            jitter: Extra random delay of up to this many seconds per RPC
+            data: Dataset to serve (defaults to a FakeOdooData built from seed_options)
+            **seed_options: Passed to FakeOdooData (timesheets, invoices, projects, ...)
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.data = data or FakeOdooData(**seed_options)
+
+        self._calls: Dict[str, int] = {}
+        self._stats_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        self._server = _ThreadingXMLRPCServer(
+            (host, port), requestHandler=_RequestHandler, allow_none=True, logRequests=False
+        )
+        for function in (self.version, self.authenticate, self.login, self.execute_kw, self.execute,
+                         self.stats, self.reset_stats):
+            self._server.register_function(function)
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def url(self) -> str:
+        return f"http://{self._server.server_address[0]}:{self.port}"
+
+    def serve_forever(self):
+        """Serve until the process is stopped."""
+        self._server.serve_forever()
+
+    def start(self) -> "FakeOdooServer":
+        """Serve on a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-odoo", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeOdooServer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _delay(self):
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self._calls[name] = self._calls.get(name, 0) + 1
+
+    # /xmlrpc/2/common
+
+    def version(self) -> Dict[str, Any]:
+        return {"server_version": SERVER_VERSION, "server_serie": SERVER_VERSION, "protocol_version": 1}
+
+    def authenticate(self, db: str, login: str, password: str, user_agent_env: Any = None):
+        self._delay()
+        self._count("common.authenticate")
+        return UID if (db, login, password) == (DATABASE, LOGIN, PASSWORD) else False
+
+    def login(self, db: str, login: str, password: str):
+        return self.authenticate(db, login, password)
+
+    # /xmlrpc/2/object
+
+    def execute_kw(self, db: str, uid: int, password: str, model: str, method: str,
+                   args: Optional[List[Any]] = None, kwargs: Optional[Dict[str, Any]] = None) -> Any:
+        if (db, uid, password) != (DATABASE, UID, PASSWORD):
+            raise Fault(3, "Access Denied")
+
+        self._delay()
+        self._count(f"{model}.{method}")
+
+        try:
+            return self.data.call(model, method, args or [], kwargs or {})
+        except (ValueError, KeyError, TypeError) as e:
+            raise Fault(1, f"{type(e).__name__}: {e}")
+
+    def execute(self, db: str, uid: int, password: str, model: str, method: str, *args) -> Any:
+        return self.execute_kw(db, uid, password, model, method, list(args), {})
+
+    # /xmlrpc/2/benchmark
+
+    def stats(self) -> Dict[str, Any]:
+        """RPC counts since the last reset, and the number of records per model."""
+        with self._stats_lock:
+            calls = dict(self._calls)
+        return {"calls": sum(calls.values()), "by_method": calls, "records": self.data.counts()}
+
+    def reset_stats(self) -> bool:
+        with self._stats_lock:
+            self._calls.clear()
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake Odoo XML-RPC server with seeded data")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8069)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every RPC")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra delay per RPC, in seconds")
+    parser.add_argument("--timesheets", type=int, default=50000)
+    parser.add_argument("--invoices", type=int, default=20000)
+    parser.add_argument("--projects", type=int, default=300)
+    parser.add_argument("--tasks-per-project", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print("⏳ Seeding fake Odoo data...")
+    server = FakeOdooServer(
+        host=args.host, port=args.port, latency=args.latency, jitter=args.jitter,
+        timesheets=args.timesheets, invoices=args.invoices, projects=args.projects,
+        tasks_per_project=args.tasks_per_project, seed=args.seed,
+    )
+    for model, count in sorted(server.data.counts().items()):
+        print(f"   {model:<24} {count:>7}")
+    print(f"✓ Fake Odoo listening on {server.url} (db {DATABASE}, login {LOGIN}, password {PASSWORD})")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Fake Odoo stopped")
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
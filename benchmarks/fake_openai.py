@@ -0,0 +1,219 @@
+"""
+Fake OpenAI Server
+A local stand-in for the two OpenAI endpoints the voice handler calls:
+Whisper transcriptions and chat completions
+
+Transcriptions cycle through spoken phrases; some are resolved by the
+local intent matcher, the others go on to the chat completion, which
+answers with the command the phrase was written for (or "none").
+
+Point VoiceCommandHandler at it with OPENAI_BASE_URL=http://127.0.0.1:<port>/v1
+
+Usage:
+    python -m benchmarks.fake_openai --port 8082 --transcription-latency 0.5
+"""
+
+import sys
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+# (what the user said, command the LLM answers with); "none" when nothing matches
+DEFAULT_PHRASES: List[Tuple[str, str]] = [
+    ("ping", "ping"),
+    ("please show me the status", "status"),
+    ("recent time entries", "showtime"),
+    ("show me my invoices", "invoiced"),
+    ("how many hours did I work this week", "timeweek"),
+    ("what did I work on lately", "showtime"),
+    ("how are we doing this month", "timemonth"),
+    ("give me the big picture of my hours", "summary"),
+    ("what is the weather like today", "none"),
+]
+
+
+class FakeOpenAIServer:
+    """
+    Answers /v1/audio/transcriptions and /v1/chat/completions locally and
+    counts the calls. Control endpoints: GET /_stats, POST /_reset.
+
+    Example:
+        server = FakeOpenAIServer(transcription_latency=0.5).start()
+        os.environ["OPENAI_BASE_URL"] = f"{server.url}/v1"
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, transcription_latency: float = 0.0,
+                 completion_latency: float = 0.0, phrases: Optional[List[Tuple[str, str]]] = None):
+        """
+        Initialize the server.
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free one)
+            transcription_latency: Seconds each transcription takes
+            completion_latency: Seconds each chat completion takes
+            phrases: (transcription, command) pairs to cycle through (defaults to DEFAULT_PHRASES)
+        """
+        self.transcription_latency = transcription_latency
+        self.completion_latency = completion_latency
+        self.phrases = phrases or DEFAULT_PHRASES
+        self._commands = {phrase.lower(): command for phrase, command in self.phrases}
+
+        self._calls: Dict[str, int] = {}
+        self._next_phrase = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        self._server = ThreadingHTTPServer((host, port), _RequestHandler)
+        self._server.daemon_threads = True
+        self._server.api = self
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def url(self) -> str:
+        return f"http://{self._server.server_address[0]}:{self.port}"
+
+    def serve_forever(self):
+        """Serve until the process is stopped."""
+        self._server.serve_forever()
+
+    def start(self) -> "FakeOpenAIServer":
+        """Serve on a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-openai", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Call counts per endpoint since the last reset."""
+        with self._lock:
+            calls = dict(self._calls)
+        return {"calls": sum(calls.values()), "by_endpoint": calls}
+
+    def reset_stats(self):
+        with self._lock:
+            self._calls.clear()
+
+    # ============================================
+    # OPENAI ENDPOINTS
+    # ============================================
+
+    def call(self, endpoint: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        """Answer one API call; returns (HTTP status, response body)."""
+        with self._lock:
+            self._calls[endpoint] = self._calls.get(endpoint, 0) + 1
+
+        if endpoint == "audio/transcriptions":
+            if self.transcription_latency > 0:
+                time.sleep(self.transcription_latency)
+            return 200, {"text": self._next_transcription()}
+
+        if endpoint == "chat/completions":
+            if self.completion_latency > 0:
+                time.sleep(self.completion_latency)
+            return 200, self._completion(json.loads(body or b"{}"))
+
+        return 404, {"error": {"message": f"Unknown endpoint {endpoint}", "type": "invalid_request_error"}}
+
+    def _next_transcription(self) -> str:
+        with self._lock:
+            phrase = self.phrases[self._next_phrase % len(self.phrases)][0]
+            self._next_phrase += 1
+        return phrase
+
+    def _completion(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        prompt = str((request.get("messages") or [{}])[-1].get("content", ""))
+
+        # The voice handler quotes the transcription: The user said:\n\n"<text>"
+        _, _, rest = prompt.partition('"')
+        said, _, _ = rest.partition('"')
+        command = self._commands.get(said.strip().lower(), "none")
+
+        return {
+            "id": f"chatcmpl-bench{int(time.time() * 1000)}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "gpt-4o-mini"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": command},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": len(prompt.split()), "completion_tokens": 1,
+                      "total_tokens": len(prompt.split()) + 1},
+        }
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, data: Any):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self):
+        api: FakeOpenAIServer = self.server.api
+        path = urlparse(self.path).path
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        if path == "/_stats":
+            return self._send_json(200, api.stats())
+        if path == "/_reset":
+            api.reset_stats()
+            return self._send_json(200, {"ok": True})
+
+        if not path.startswith("/v1/"):
+            return self._send_json(404, {"error": {"message": "Not Found", "type": "invalid_request_error"}})
+
+        status, response = api.call(path[len("/v1/"):], body)
+        self._send_json(status, response)
+
+    do_GET = _handle
+    do_POST = _handle
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake OpenAI server for voice commands")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8082)
+    parser.add_argument("--transcription-latency", type=float, default=0.0, help="Seconds per transcription")
+    parser.add_argument("--completion-latency", type=float, default=0.0, help="Seconds per chat completion")
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(host=args.host, port=args.port, transcription_latency=args.transcription_latency,
+                              completion_latency=args.completion_latency)
+    print(f"✓ Fake OpenAI listening on {server.url}")
+    print(f"   Run the bot with OPENAI_BASE_URL={server.url}/v1 and any OPENAI_API_KEY")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Fake OpenAI stopped")
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
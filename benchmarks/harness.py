@@ -0,0 +1,190 @@
+"""
+Benchmark Harness
+Starts the fake Odoo, Bot API and (optionally) OpenAI servers in their own
+processes and points the bot's configuration and Odoo client pool at them
+"""
+
+import os
+import sys
+import asyncio
+import threading
+import xmlrpc.client
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+# Make src importable when run as python benchmarks/<script>.py
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.process import start_server_process, stop_server_process
+from benchmarks.fake_odoo import DATABASE, LOGIN, PASSWORD
+
+# Private chat of the (admin) user sending the synthetic updates
+CHAT_ID = 424242
+BOT_TOKEN = "123456:benchmark-token"
+
+
+@dataclass
+class FakeServers:
+    """URLs and processes of a running fake Odoo, fake Bot API and (optionally) fake OpenAI."""
+    odoo_url: str
+    bot_api_url: str
+    openai_url: Optional[str] = None
+    processes: list = field(default_factory=list)
+
+    def stop(self):
+        for process in self.processes:
+            stop_server_process(process)
+        self.processes.clear()
+
+
+def start_fake_servers(odoo_latency: float = 0.0, bot_api_latency: float = 0.0, openai: bool = False,
+                       transcription_latency: float = 0.0, completion_latency: float = 0.0,
+                       **seed_options) -> FakeServers:
+    """
+    Start a seeded fake Odoo and a fake Bot API, each in its own process.
+
+    Args:
+        odoo_latency: Seconds added to every Odoo RPC
+        bot_api_latency: Seconds added to every Bot API call
+        openai: Also start a fake OpenAI, so voice messages are handled
+        transcription_latency: Seconds each fake transcription takes
+        completion_latency: Seconds each fake chat completion takes
+        **seed_options: Dataset size for FakeOdooData (timesheets, invoices, projects, tasks_per_project)
+
+    Returns:
+        The running servers; call stop() when done
+    """
+    odoo_process, odoo_port = start_server_process(
+        "benchmarks.fake_odoo.FakeOdooServer", latency=odoo_latency, **seed_options
+    )
+    bot_api_process, bot_api_port = start_server_process(
+        "benchmarks.fake_bot_api.FakeBotApiServer", latency=bot_api_latency
+    )
+    servers = FakeServers(
+        odoo_url=f"http://127.0.0.1:{odoo_port}",
+        bot_api_url=f"http://127.0.0.1:{bot_api_port}",
+        processes=[odoo_process, bot_api_process],
+    )
+
+    if openai:
+        openai_process, openai_port = start_server_process(
+            "benchmarks.fake_openai.FakeOpenAIServer",
+            transcription_latency=transcription_latency,
+            completion_latency=completion_latency,
+        )
+        servers.openai_url = f"http://127.0.0.1:{openai_port}"
+        servers.processes.append(openai_process)
+
+    return servers
+
+
+def configure_environment(servers: FakeServers, **overrides: str):
+    """
+    Point the bot at the fake servers and turn off everything that would
+    reach the outside world or run on its own schedule.
+
+    Must run before src modules are imported (some read settings at import).
+
+    Args:
+        servers: Running fake servers
+        **overrides: Extra environment variables, e.g. TELEGRAM_CONCURRENT_UPDATES="8"
+    """
+    settings = {
+        "TELEGRAM_BOT_TOKEN": BOT_TOKEN,
+        "TELEGRAM_API_BASE_URL": servers.bot_api_url,
+        "TELEGRAM_CHAT_ID": str(CHAT_ID),
+        "TELEGRAM_ADMIN_IDS": str(CHAT_ID),
+        "TELEGRAM_MODE": "polling",
+        "TELEGRAM_WORKERS": "1",
+        "TELEGRAM_PERSISTENCE": "none",
+        "ODOO_WARMUP": "false",
+        "SYSTEM_METRICS_INTERVAL": "0",
+        "OPENAI_API_KEY": "",
+        # The fake Bot API has no flood limits; measure the handlers, not the 1 msg/s per chat pacing
+        "TELEGRAM_GLOBAL_RATE": "100000",
+        "TELEGRAM_CHAT_RATE": "100000",
+        "URL": servers.odoo_url,
+        "DB": DATABASE,
+        "USERNAME": LOGIN,
+        "API_KEY": PASSWORD,
+    }
+    if servers.openai_url:
+        settings["OPENAI_BASE_URL"] = f"{servers.openai_url}/v1"
+        settings["OPENAI_API_KEY"] = "bench"
+    settings.update(overrides)
+    os.environ.update(settings)
+
+
+def use_fake_odoo(servers: FakeServers):
+    """Make the wrapper's client pool log in to the fake Odoo over XML-RPC."""
+    from src.utils.odoo_time_wrapper import set_odoo_client_factory
+    from benchmarks.odoo_client import XmlRpcOdooClient
+
+    set_odoo_client_factory(lambda: XmlRpcOdooClient(servers.odoo_url, DATABASE, LOGIN, PASSWORD))
+
+
+def find_fixtures(odoo_url: str) -> Dict[str, Any]:
+    """Pick the project and task IDs and search terms to send from the seeded data."""
+    from benchmarks.odoo_client import XmlRpcOdooClient
+
+    client = XmlRpcOdooClient(odoo_url, DATABASE, LOGIN, PASSWORD)
+    company_id = client.get_companies()[0].id
+
+    # The project with the most tasks exercises paging and the task index
+    groups = client.odoo.env['project.task'].read_group(
+        [('company_id', '=', company_id)], ['project_id'], ['project_id']
+    )
+    biggest = max(groups, key=lambda group: group['project_id_count'])
+    project_id, project_name = biggest['project_id']
+    task = client.odoo.env['project.task'].search_read([('project_id', '=', project_id)], ['name'], limit=1)[0]
+    client.odoo.logout()
+
+    return {
+        "project_id": project_id,
+        "project_query": project_name.split()[0].lower(),
+        "task_id": task['id'],
+        "task_query": task['name'].split()[0].lower(),
+        "task_count": biggest['project_id_count'],
+    }
+
+
+class OdooStats:
+    """RPC counters of a fake Odoo running in another process."""
+
+    def __init__(self, url: str):
+        self._proxy = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/benchmark", allow_none=True)
+
+    def get(self) -> Dict[str, Any]:
+        return self._proxy.stats()
+
+    def calls(self) -> int:
+        return self._proxy.stats()["calls"]
+
+    def reset(self):
+        self._proxy.reset_stats()
+
+
+async def wait_for_background_work(timeout: float = 60):
+    """
+    Wait until work a handler started in the background is done: tasks it
+    created (e.g. a report refresh) and Odoo calls still queued on the
+    thread pool (e.g. a call submitted without awaiting it).
+
+    Only meant for an Application that is initialized but not running
+    (no polling loop or job queue tasks to wait for).
+    """
+    current = asyncio.current_task()
+    pending = [task for task in asyncio.all_tasks() if task is not current and not task.done()]
+    if pending:
+        await asyncio.wait(pending, timeout=timeout)
+
+    from src.utils.odoo_async import get_executor
+
+    # One barrier task per worker: they can only all start once every earlier call has finished
+    executor = get_executor()
+    workers = getattr(executor, "_max_workers", 1)
+    barrier = threading.Barrier(workers)
+    futures = [executor.submit(barrier.wait, timeout) for _ in range(workers)]
+    await asyncio.gather(*(asyncio.wrap_future(future) for future in futures), return_exceptions=True)
@@ -0,0 +1,545 @@
+#!/usr/bin/env python3
+"""
+Load Test
+Feeds a stream of updates (commands, /logtime conversations, voice messages,
+inline queries) into TelegramCommandBot at a target rate, with Odoo, the Bot
+API and OpenAI replaced by local fakes, and reports handler latency
+percentiles, throughput and queue depth
+
+Each synthetic session (one command, a whole /logtime conversation, ...)
+runs in a chat of its own for its duration, with --think-time seconds
+between its updates. Sessions arrive at random (Poisson) times, paced so
+the bot receives --rate updates per second on average. The generated
+stream can be saved with --record and replayed with --replay.
+
+Usage:
+    python -m benchmarks.load_test --rate 20 --duration 30
+    python -m benchmarks.load_test --rate 50 --mix commands=1,logtime=1 --concurrency 16
+    python -m benchmarks.load_test --replay stream.jsonl --ingress polling
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.harness import CHAT_ID, configure_environment, find_fixtures, start_fake_servers, use_fake_odoo
+from benchmarks.fake_bot_api import FakeBotApiControl
+from benchmarks.updates import UpdateFactory
+
+# Commands a "commands" session picks from (no admin or script-running commands)
+COMMANDS = ["/start", "/help", "/ping", "/status", "/showtime", "/timeweek", "/timemonth", "/summary", "/invoiced"]
+
+# Updates per session kind, used to turn --rate (updates/s) into sessions/s
+SESSION_LENGTHS = {"commands": 1, "logtime": 6, "voice": 1, "inline": 1}
+
+DEFAULT_MIX = "commands=6,logtime=2,voice=1,inline=1"
+
+
+@dataclass
+class ScheduledUpdate:
+    """One update of the stream, sent `at` seconds after the start."""
+    at: float
+    label: str
+    update: Dict[str, Any]
+
+
+# ============================================
+# UPDATE STREAMS
+# ============================================
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parse "commands=6,logtime=2" into session weights."""
+    mix = {}
+    for item in text.split(","):
+        kind, _, weight = item.partition("=")
+        kind = kind.strip()
+        if kind not in SESSION_LENGTHS:
+            raise ValueError(f"Unknown session kind '{kind}'. Use {', '.join(SESSION_LENGTHS)}.")
+        mix[kind] = float(weight or 1)
+    if not any(weight > 0 for weight in mix.values()):
+        raise ValueError("The mix needs at least one session kind with a positive weight.")
+    return mix
+
+
+def session_updates(kind: str, updates: UpdateFactory, fixtures: Dict[str, Any],
+                    rng: random.Random) -> List[Tuple[str, Dict[str, Any]]]:
+    """The (label, update) pairs one session of this kind sends, in order."""
+    project_id, task_id = fixtures["project_id"], fixtures["task_id"]
+
+    if kind == "commands":
+        command = rng.choice(COMMANDS)
+        return [(command, updates.command(command))]
+    if kind == "logtime":
+        return [
+            ("/logtime: start", updates.command("/logtime")),
+            ("/logtime: search", updates.text(fixtures["project_query"])),
+            ("/logtime: pick project", updates.callback(f"proj_{project_id}")),
+            ("/logtime: pick task", updates.callback(f"task_{task_id}")),
+            ("/logtime: hours", updates.text("0.5")),
+            ("/logtime: description", updates.text("Load test entry")),
+        ]
+    if kind == "voice":
+        return [("voice", updates.voice())]
+    if rng.random() < 0.5:
+        return [("inline: projects", updates.inline(fixtures["project_query"]))]
+    return [("inline: tasks", updates.inline(f"#{project_id} {fixtures['task_query']}"))]
+
+
+def generate_stream(rate: float, duration: float, chats: int, mix: Dict[str, float], think_time: float,
+                    fixtures: Dict[str, Any], seed: int = 42) -> List[ScheduledUpdate]:
+    """
+    Build a synthetic update stream.
+
+    Args:
+        rate: Average updates per second
+        duration: Seconds during which new sessions start (the last ones finish a little later)
+        chats: Chats to spread sessions over; more are added when all are busy
+        mix: Relative weight of each session kind
+        think_time: Seconds between the updates of one session
+        fixtures: Project and task IDs from find_fixtures()
+        seed: Random seed, so runs are repeatable
+
+    Returns:
+        The updates ordered by send time
+    """
+    rng = random.Random(seed)
+    kinds = [kind for kind, weight in mix.items() if weight > 0]
+    weights = [mix[kind] for kind in kinds]
+    mean_length = sum(SESSION_LENGTHS[kind] * mix[kind] for kind in kinds) / sum(weights)
+    session_rate = rate / mean_length
+
+    factories = {CHAT_ID + index: UpdateFactory(CHAT_ID + index) for index in range(chats)}
+    free_at = dict.fromkeys(factories, 0.0)
+    stream: List[ScheduledUpdate] = []
+
+    started = rng.expovariate(session_rate)
+    while started < duration:
+        kind = rng.choices(kinds, weights)[0]
+
+        # A chat runs one session at a time, so conversation steps never interleave
+        idle = [chat_id for chat_id, free in free_at.items() if free <= started]
+        if idle:
+            chat_id = rng.choice(idle)
+        else:
+            chat_id = CHAT_ID + len(factories)
+            factories[chat_id] = UpdateFactory(chat_id)
+
+        steps = session_updates(kind, factories[chat_id], fixtures, rng)
+        for index, (label, update) in enumerate(steps):
+            stream.append(ScheduledUpdate(started + index * think_time, label, update))
+        free_at[chat_id] = started + len(steps) * think_time
+
+        started += rng.expovariate(session_rate)
+
+    stream.sort(key=lambda item: item.at)
+    return stream
+
+
+def label_for(update: Dict[str, Any]) -> str:
+    """Name an update from a recorded stream by what it triggers."""
+    message = update.get("message") or update.get("edited_message")
+    if message:
+        text = message.get("text") or ""
+        if text.startswith("/"):
+            return text.split()[0].split("@")[0]
+        if "voice" in message:
+            return "voice"
+        return "text" if text else "message"
+    if "callback_query" in update:
+        data = update["callback_query"].get("data") or ""
+        return f"callback: {re.sub(r'[_0-9]+$', '', data) or 'empty'}"
+    if "inline_query" in update:
+        return "inline"
+    return "other"
+
+
+def sender_id(update: Dict[str, Any]) -> Optional[int]:
+    """User ID an update comes from."""
+    for key in ("message", "edited_message", "callback_query", "inline_query"):
+        if key in update:
+            return (update[key].get("from") or {}).get("id")
+    return None
+
+
+def read_stream(path: str, rate: float) -> List[ScheduledUpdate]:
+    """
+    Load a recorded stream.
+
+    Each line is either {"at": seconds, "label": name, "update": {...}} as
+    written by --record, or a bare update dict (e.g. logged from getUpdates);
+    lines without "at" are spaced 1/rate seconds apart.
+    """
+    stream = []
+    with open(path) as f:
+        for index, line in enumerate(line for line in f if line.strip()):
+            entry = json.loads(line)
+            update = entry["update"] if "update" in entry else entry
+            update = {key: value for key, value in update.items() if key != "update_id"}
+            stream.append(ScheduledUpdate(
+                at=float(entry.get("at", index / rate)),
+                label=entry.get("label") or label_for(update),
+                update=update,
+            ))
+
+    stream.sort(key=lambda item: item.at)
+    return stream
+
+
+def write_stream(path: str, stream: List[ScheduledUpdate]):
+    with open(path, "w") as f:
+        for item in stream:
+            f.write(json.dumps(asdict(item)) + "\n")
+
+
+# ============================================
+# MEASUREMENT
+# ============================================
+
+class LoadRecorder:
+    """
+    Timestamps every update as it is sent, starts running and finishes,
+    counts handler errors and samples the queue depth.
+    """
+
+    def __init__(self, labels: Dict[int, str]):
+        self.labels = labels
+        self.sent: Dict[int, float] = {}
+        self.started: Dict[int, float] = {}
+        self.finished: Dict[int, float] = {}
+        self.errors: Dict[int, str] = {}
+        self.lag: List[float] = []
+        # (seconds since start, waiting in queues, sent but not finished, handlers running)
+        self.samples: List[Tuple[float, int, int, int]] = []
+
+    def instrument(self, processor):
+        """Wrap the update processor so handler start and end are recorded per update."""
+        original = processor.do_process_update
+
+        async def do_process_update(update, coroutine):
+            update_id = getattr(update, "update_id", None)
+
+            async def timed():
+                # Runs once the chat's earlier updates are done and a concurrency slot is free
+                self.started[update_id] = time.perf_counter()
+                try:
+                    await coroutine
+                finally:
+                    self.finished[update_id] = time.perf_counter()
+
+            await original(update, timed())
+
+        processor.do_process_update = do_process_update
+
+    async def error_handler(self, update, context):
+        update_id = getattr(update, "update_id", None)
+        if update_id is not None:
+            self.errors[update_id] = type(context.error).__name__
+
+    @property
+    def in_flight(self) -> int:
+        return len(self.sent) - len(self.finished)
+
+    async def sample(self, app, processor, started: float, interval: float,
+                     bot_api: Optional[FakeBotApiControl] = None):
+        """Record queue depth every `interval` seconds until cancelled."""
+        while True:
+            queued = app.update_queue.qsize()
+            if bot_api is not None:
+                # Polling: updates not yet fetched from the Bot API are queued too
+                queued += (await asyncio.to_thread(bot_api.stats))["pending_updates"]
+            self.samples.append((time.perf_counter() - started, queued, self.in_flight, processor.active))
+            await asyncio.sleep(interval)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile (0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(recorder: LoadRecorder, label: str, update_ids: List[int]) -> Dict[str, Any]:
+    """Latency percentiles (ms) of some updates: queue wait, handler time and the total."""
+    done = [update_id for update_id in update_ids if update_id in recorder.finished]
+    wait = [(recorder.started[i] - recorder.sent[i]) * 1000 for i in done]
+    handler = [(recorder.finished[i] - recorder.started[i]) * 1000 for i in done]
+    total = [(recorder.finished[i] - recorder.sent[i]) * 1000 for i in done]
+
+    return {
+        "label": label,
+        "sent": len(update_ids),
+        "done": len(done),
+        "errors": sum(1 for update_id in update_ids if update_id in recorder.errors),
+        "wait_p50": percentile(wait, 0.50),
+        "wait_p95": percentile(wait, 0.95),
+        "handler_p50": percentile(handler, 0.50),
+        "handler_p95": percentile(handler, 0.95),
+        "handler_p99": percentile(handler, 0.99),
+        "total_p50": percentile(total, 0.50),
+        "total_p95": percentile(total, 0.95),
+        "total_p99": percentile(total, 0.99),
+        "total_max": max(total, default=0.0),
+    }
+
+
+def print_header():
+    print(f"{'update':<26} {'sent':>6} {'done':>6} {'err':>4} {'wait p50':>9} {'p95':>8} "
+          f"{'handler p50':>12} {'p95':>8} {'p99':>8} {'total p50':>10} {'p95':>8} {'p99':>8}")
+    print("-" * 126)
+
+
+def print_row(row: Dict[str, Any]):
+    print(f"{row['label'][:26]:<26} {row['sent']:>6} {row['done']:>6} {row['errors']:>4} "
+          f"{row['wait_p50']:>9.1f} {row['wait_p95']:>8.1f} {row['handler_p50']:>12.1f} "
+          f"{row['handler_p95']:>8.1f} {row['handler_p99']:>8.1f} {row['total_p50']:>10.1f} "
+          f"{row['total_p95']:>8.1f} {row['total_p99']:>8.1f}")
+
+
+# ============================================
+# RUN
+# ============================================
+
+async def feed(stream: List[ScheduledUpdate], deliver, recorder: LoadRecorder, started: float):
+    """Send each update at its time; updates that are due together go out as one batch."""
+    index = 0
+    while index < len(stream):
+        delay = started + stream[index].at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        now = time.perf_counter()
+        batch = []
+        while index < len(stream) and started + stream[index].at <= now:
+            batch.append(stream[index].update)
+            # How far behind schedule the generator is (the event loop is saturated if this grows)
+            recorder.lag.append(now - started - stream[index].at)
+            index += 1
+
+        for update in batch:
+            recorder.sent[update["update_id"]] = now
+        await deliver(batch)
+
+
+async def run_load(args, servers, stream: List[ScheduledUpdate]) -> Dict[str, Any]:
+    from telegram import Update
+    from src.utils.telegram_listener import TelegramCommandBot
+    from src.scripts import run_command_bot
+    from src.utils.odoo_async import shutdown_executor
+
+    use_fake_odoo(servers)
+
+    bot = TelegramCommandBot()
+    run_command_bot.register_handlers(bot)
+    app = bot.app
+
+    recorder = LoadRecorder({item.update["update_id"]: item.label for item in stream})
+    recorder.instrument(bot.update_processor)
+    app.add_error_handler(recorder.error_handler)
+
+    bot_api = FakeBotApiControl(servers.bot_api_url)
+
+    async def deliver_to_queue(updates: List[Dict[str, Any]]):
+        for update in updates:
+            await app.update_queue.put(Update.de_json(update, app.bot))
+
+    async def deliver_to_bot_api(updates: List[Dict[str, Any]]):
+        await asyncio.to_thread(bot_api.push_updates, updates)
+
+    await app.initialize()
+    await app.start()
+    if args.ingress == "polling":
+        await app.updater.start_polling(poll_interval=0.0, timeout=10, allowed_updates=Update.ALL_TYPES)
+        deliver = deliver_to_bot_api
+    else:
+        deliver = deliver_to_queue
+
+    started = time.perf_counter()
+    sampler = asyncio.create_task(recorder.sample(
+        app, bot.update_processor, started, args.sample_interval,
+        bot_api if args.ingress == "polling" else None,
+    ))
+
+    try:
+        await feed(stream, deliver, recorder, started)
+        fed = time.perf_counter() - started
+
+        # Drain: wait for every sent update to finish
+        deadline = time.perf_counter() + args.drain_timeout
+        while recorder.in_flight > 0 and time.perf_counter() < deadline:
+            await asyncio.sleep(0.05)
+        elapsed = time.perf_counter() - started
+    finally:
+        sampler.cancel()
+        if args.ingress == "polling":
+            await app.updater.stop()
+        await app.stop()
+        await app.shutdown()
+        if run_command_bot.voice_handler:
+            await run_command_bot.voice_handler.close()
+        shutdown_executor(wait=True)
+        bot_api.close()
+
+    # Group by label
+    by_label: Dict[str, List[int]] = {}
+    for update_id, label in recorder.labels.items():
+        by_label.setdefault(label, []).append(update_id)
+
+    rows = [summarize(recorder, label, update_ids) for label, update_ids in sorted(by_label.items())]
+    overall = summarize(recorder, "all", list(recorder.labels))
+
+    queued = [sample[1] for sample in recorder.samples] or [0]
+    in_flight = [sample[2] for sample in recorder.samples] or [0]
+    running = [sample[3] for sample in recorder.samples] or [0]
+    last_finish = max(recorder.finished.values(), default=started) - started
+
+    return {
+        "rows": rows,
+        "overall": overall,
+        "sent": len(recorder.sent),
+        "done": len(recorder.finished),
+        "errors": len(recorder.errors),
+        "feed_seconds": fed,
+        "elapsed_seconds": elapsed,
+        "offered_rate": len(stream) / max(stream[-1].at, 1e-9) if stream else 0.0,
+        "sent_rate": len(recorder.sent) / max(fed, 1e-9),
+        "throughput": len(recorder.finished) / max(last_finish, 1e-9),
+        "lag_p99_ms": percentile(recorder.lag, 0.99) * 1000,
+        "queue_avg": sum(queued) / len(queued),
+        "queue_max": max(queued),
+        "in_flight_avg": sum(in_flight) / len(in_flight),
+        "in_flight_max": max(in_flight),
+        "running_avg": sum(running) / len(running),
+        "running_max": max(running),
+        "samples": recorder.samples,
+    }
+
+
+def print_report(report: Dict[str, Any], concurrency: int):
+    print()
+    print_header()
+    for row in report["rows"]:
+        print_row(row)
+    print("-" * 126)
+    print_row(report["overall"])
+    print("   (ms; wait = sent → handler starts, total = sent → handler done)")
+
+    print()
+    print(f"📨 Offered {report['offered_rate']:.1f} updates/s, sent {report['sent_rate']:.1f}/s "
+          f"(generator p99 lag {report['lag_p99_ms']:.1f} ms)")
+    print(f"✓ Handled {report['done']}/{report['sent']} updates at {report['throughput']:.1f}/s "
+          f"in {report['elapsed_seconds']:.1f}s, {report['errors']} error(s)")
+    print(f"📥 Queue depth: avg {report['queue_avg']:.1f}, max {report['queue_max']}   "
+          f"In flight: avg {report['in_flight_avg']:.1f}, max {report['in_flight_max']}   "
+          f"Running handlers: avg {report['running_avg']:.1f}, max {report['running_max']} of {concurrency}")
+
+    if report["done"] < report["sent"]:
+        print(f"⚠️  {report['sent'] - report['done']} update(s) still unfinished after the drain timeout")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay an update stream into the bot and measure latency and throughput")
+    parser.add_argument("--rate", type=float, default=10.0, help="Updates per second (default 10)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of traffic to generate (default 30)")
+    parser.add_argument("--chats", type=int, default=20, help="Chats the sessions are spread over (default 20)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Session weights (default {DEFAULT_MIX})")
+    parser.add_argument("--think-time", type=float, default=1.0, help="Seconds between a session's updates")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--replay", help="Send the updates from this JSON-lines file instead of generating them")
+    parser.add_argument("--record", help="Save the update stream to this JSON-lines file")
+    parser.add_argument("--ingress", choices=("queue", "polling"), default="queue",
+                        help="Put updates straight on the update queue, or serve them to getUpdates polling")
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv('TELEGRAM_CONCURRENT_UPDATES', '8')),
+                        help="Updates handled at once (TELEGRAM_CONCURRENT_UPDATES, at least 2)")
+    parser.add_argument("--telegram-limits", action="store_true",
+                        help="Keep Telegram's flood limits (30 msg/s, 1 msg/s per chat) instead of lifting them")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds per Odoo RPC (default 0.02)")
+    parser.add_argument("--bot-api-latency", type=float, default=0.03, help="Seconds per Bot API call (default 0.03)")
+    parser.add_argument("--transcription-latency", type=float, default=0.5, help="Seconds per transcription")
+    parser.add_argument("--completion-latency", type=float, default=0.4, help="Seconds per chat completion")
+    parser.add_argument("--timesheets", type=int, default=50000)
+    parser.add_argument("--invoices", type=int, default=20000)
+    parser.add_argument("--projects", type=int, default=300)
+    parser.add_argument("--tasks-per-project", type=int, default=40)
+    parser.add_argument("--sample-interval", type=float, default=0.1, help="Seconds between queue depth samples")
+    parser.add_argument("--drain-timeout", type=float, default=60.0, help="Seconds to wait for the last updates")
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args()
+
+    if args.concurrency < 2:
+        # With 1, the Application awaits updates itself and skips the processor the timings come from
+        parser.error("--concurrency must be at least 2")
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print("⏳ Starting fake Odoo, Bot API and OpenAI servers...")
+    servers = start_fake_servers(
+        odoo_latency=args.latency,
+        bot_api_latency=args.bot_api_latency,
+        openai=True,
+        transcription_latency=args.transcription_latency,
+        completion_latency=args.completion_latency,
+        timesheets=args.timesheets,
+        invoices=args.invoices,
+        projects=args.projects,
+        tasks_per_project=args.tasks_per_project,
+    )
+
+    try:
+        if args.replay:
+            stream = read_stream(args.replay, args.rate)
+        else:
+            fixtures = find_fixtures(servers.odoo_url)
+            stream = generate_stream(args.rate, args.duration, args.chats, mix, args.think_time,
+                                     fixtures, args.seed)
+
+        if not stream:
+            print("❌ The update stream is empty")
+            sys.exit(1)
+
+        if args.record:
+            write_stream(args.record, stream)
+            print(f"✓ Update stream written to {args.record}")
+
+        for update_id, item in enumerate(stream, start=1):
+            item.update["update_id"] = update_id
+
+        # Every sender may use the inline picker and admin-only views
+        senders = sorted({sender for sender in map(sender_id, (item.update for item in stream)) if sender})
+        overrides = {
+            "TELEGRAM_ADMIN_IDS": ",".join(map(str, senders or [CHAT_ID])),
+            "TELEGRAM_CONCURRENT_UPDATES": str(args.concurrency),
+        }
+        if args.telegram_limits:
+            overrides.update(TELEGRAM_GLOBAL_RATE="30", TELEGRAM_CHAT_RATE="1")
+        configure_environment(servers, **overrides)
+
+        print(f"🚀 Sending {len(stream)} updates from {len(senders)} chats over {stream[-1].at:.1f}s "
+              f"({args.ingress} ingress, {args.concurrency} concurrent updates)")
+        report = asyncio.run(run_load(args, servers, stream))
+    finally:
+        servers.stop()
+
+    print_report(report, args.concurrency)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"settings": vars(args), **report}, f, indent=2)
+        print(f"\n✓ Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+XML-RPC Odoo Client
+Implements the part of odoo-logger's OdooClient the bot uses on top of
+Odoo's standard XML-RPC API, so the wrapper functions can run against the
+fake server (or any Odoo) without odoo-logger installed
+"""
+
+import xmlrpc.client
+from datetime import date
+from typing import Any, Dict, List, Optional, Union
+
+TIMESHEET_MODEL = 'account.analytic.line'
+ENTRY_FIELDS = ['date', 'project_id', 'task_id', 'name', 'unit_amount']
+
+
+class OdooRecord:
+    """A search_read row with attribute access; many2one values become records with id and name."""
+
+    def __init__(self, values: Dict[str, Any]):
+        for field, value in values.items():
+            if field.endswith('_id') and isinstance(value, list) and len(value) == 2:
+                value = OdooRecord({"id": value[0], "name": value[1]})
+            setattr(self, field, value)
+
+    def __repr__(self) -> str:
+        return f"OdooRecord({vars(self)})"
+
+
+class OdooModel:
+    """Proxy for one model, e.g. env['project.task'].search_read(domain, fields)."""
+
+    def __init__(self, env: "OdooEnvironment", name: str):
+        self.env = env
+        self.name = name
+
+    def search(self, domain: List[Any], **kwargs) -> List[int]:
+        return self.env.execute(self.name, 'search', [domain], kwargs)
+
+    def search_count(self, domain: List[Any], **kwargs) -> int:
+        return self.env.execute(self.name, 'search_count', [domain], kwargs)
+
+    def search_read(self, domain: Optional[List[Any]] = None, fields: Optional[List[str]] = None, **kwargs) -> List[Dict[str, Any]]:
+        return self.env.execute(self.name, 'search_read', [domain or []], {"fields": fields or [], **kwargs})
+
+    def read(self, ids: List[int], fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        return self.env.execute(self.name, 'read', [ids], {"fields": fields or []})
+
+    def read_group(self, domain: List[Any], fields: List[str], groupby: Union[str, List[str]], **kwargs) -> List[Dict[str, Any]]:
+        return self.env.execute(self.name, 'read_group', [domain, fields, groupby], kwargs)
+
+    def create(self, values: Dict[str, Any]) -> int:
+        return self.env.execute(self.name, 'create', [values], {})
+
+    def write(self, ids: List[int], values: Dict[str, Any]) -> bool:
+        return self.env.execute(self.name, 'write', [ids, values], {})
+
+
+class OdooEnvironment:
+    """env[model] access plus the logged-in user's uid, like odoorpc's env."""
+
+    def __init__(self, proxy: xmlrpc.client.ServerProxy, database: str, uid: int, password: str):
+        self._proxy = proxy
+        self.database = database
+        self.uid = uid
+        self._password = password
+
+    def __getitem__(self, model: str) -> OdooModel:
+        return OdooModel(self, model)
+
+    def execute(self, model: str, method: str, args: List[Any], kwargs: Dict[str, Any]) -> Any:
+        """Call an ORM method through execute_kw."""
+        return self._proxy.execute_kw(self.database, self.uid, self._password, model, method, args, kwargs)
+
+
+class OdooConnection:
+    """The ``client.odoo`` object: an environment and logout()."""
+
+    def __init__(self, env: OdooEnvironment, proxy: xmlrpc.client.ServerProxy):
+        self.env = env
+        self._proxy = proxy
+
+    def logout(self):
+        self._proxy("close")()
+
+
+class XmlRpcOdooClient:
+    """
+    Odoo client over XML-RPC with the methods odoo_time_wrapper calls.
+
+    Logs in when created, like odoo-logger's OdooClient, so it can be used
+    as the factory of the wrapper's client pool:
+
+        set_odoo_client_factory(lambda: XmlRpcOdooClient(url, db, login, password))
+
+    Not thread-safe; the pool hands each client to one caller at a time.
+    """
+
+    def __init__(self, url: str, database: str, username: str, password: str):
+        """
+        Log in to Odoo.
+
+        Args:
+            url: Server URL, e.g. http://127.0.0.1:8069
+            database: Database name
+            username: Login
+            password: Password or API key
+
+        Raises:
+            PermissionError: If the credentials are rejected
+        """
+        url = url.rstrip('/')
+        common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common", allow_none=True)
+        uid = common.authenticate(database, username, password, {})
+        common("close")()
+
+        if not uid:
+            raise PermissionError(f"Odoo login failed for {username} on {database}")
+
+        proxy = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object", allow_none=True)
+        self.odoo = OdooConnection(OdooEnvironment(proxy, database, uid, password), proxy)
+
+    @property
+    def uid(self) -> int:
+        return self.odoo.env.uid
+
+    def get_companies(self) -> List[OdooRecord]:
+        """Companies the user has access to."""
+        user = self.odoo.env['res.users'].read([self.uid], ['company_ids'])[0]
+        rows = self.odoo.env['res.company'].search_read([('id', 'in', user['company_ids'])], ['name'], order='id')
+        return [OdooRecord(row) for row in rows]
+
+    def get_projects_by_company(self, company_id: int) -> List[OdooRecord]:
+        """Active projects of a company, by name."""
+        rows = self.odoo.env['project.project'].search_read(
+            [('company_id', '=', company_id), ('active', '=', True)], ['name'], order='name'
+        )
+        return [OdooRecord(row) for row in rows]
+
+    def get_tasks(self, project_id: int) -> List[OdooRecord]:
+        """Tasks of a project, by name."""
+        rows = self.odoo.env['project.task'].search_read([('project_id', '=', project_id)], ['name'], order='name')
+        return [OdooRecord(row) for row in rows]
+
+    def _entry_domain(self, company_id: Optional[int]) -> List[Any]:
+        domain = [('user_id', '=', self.uid), ('project_id', '!=', False)]
+        if company_id:
+            domain.append(('company_id', '=', company_id))
+        return domain
+
+    def get_recent_entries(self, limit: int = 5, company_id: Optional[int] = None) -> List[OdooRecord]:
+        """The user's latest timesheet lines."""
+        rows = self.odoo.env[TIMESHEET_MODEL].search_read(
+            self._entry_domain(company_id), ENTRY_FIELDS, order='date desc, id desc', limit=limit
+        )
+        return [OdooRecord(row) for row in rows]
+
+    def get_time_entries(self, start: date, end: date, company_id: Optional[int] = None) -> List[OdooRecord]:
+        """The user's timesheet lines between two dates (inclusive)."""
+        domain = self._entry_domain(company_id) + [('date', '>=', str(start)), ('date', '<=', str(end))]
+        rows = self.odoo.env[TIMESHEET_MODEL].search_read(domain, ENTRY_FIELDS, order='date desc, id desc')
+        return [OdooRecord(row) for row in rows]
+
+    def _employee_ids(self, company_id: int) -> List[int]:
+        return self.odoo.env['hr.employee'].search([('user_id', '=', self.uid), ('company_id', '=', company_id)], limit=1)
+
+    def check_employee_exists(self, company_id: int) -> bool:
+        """Whether the user has an employee record (required for timesheets) in a company."""
+        return bool(self._employee_ids(company_id))
+
+    def log_time(self, project_id: int, task_id: int, description: str, time_spent: float,
+                 log_date: str, company_id: int) -> int:
+        """
+        Create a timesheet line.
+
+        Returns:
+            ID of the new line
+
+        Raises:
+            ValueError: If the user has no employee record in the company
+        """
+        employee_ids = self._employee_ids(company_id)
+        if not employee_ids:
+            raise ValueError(f"No employee record for user {self.uid} in company {company_id}")
+
+        return self.odoo.env[TIMESHEET_MODEL].create({
+            'project_id': project_id,
+            'task_id': task_id,
+            'name': description,
+            'unit_amount': time_spent,
+            'date': log_date,
+            'company_id': company_id,
+            'employee_id': employee_ids[0],
+        })
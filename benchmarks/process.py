@@ -0,0 +1,65 @@
+"""
+Server Processes
+Runs a fake server in its own process, so its CPU time and allocations do
+not show up in the measurements of the code under test
+"""
+
+import importlib
+import multiprocessing
+from typing import Any, Dict, Tuple
+
+
+def _serve(target: str, options: Dict[str, Any], connection):
+    module_name, _, class_name = target.rpartition(".")
+    server_class = getattr(importlib.import_module(module_name), class_name)
+
+    server = server_class(**options)
+    connection.send(server.port)
+    connection.close()
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+def start_server_process(target: str, timeout: float = 120, **options) -> Tuple[multiprocessing.Process, int]:
+    """
+    Start a fake server in a child process and wait until it listens.
+
+    Args:
+        target: Dotted path of the server class, e.g. "benchmarks.fake_odoo.FakeOdooServer"
+        timeout: Seconds to wait for the server (seeding large datasets takes a while)
+        **options: Keyword arguments for the server class (port=0 picks a free port)
+
+    Returns:
+        (process, port the server listens on)
+
+    Raises:
+        RuntimeError: If the server did not start in time
+    """
+    context = multiprocessing.get_context("spawn")
+    parent, child = context.Pipe(duplex=False)
+
+    process = context.Process(target=_serve, args=(target, options, child), daemon=True)
+    process.start()
+    child.close()
+
+    if not parent.poll(timeout):
+        process.terminate()
+        raise RuntimeError(f"{target} did not start within {timeout}s")
+
+    try:
+        port = parent.recv()
+    except EOFError:
+        raise RuntimeError(f"{target} exited during startup (exit code {process.exitcode})")
+
+    return process, port
+
+
+def stop_server_process(process: multiprocessing.Process, timeout: float = 5):
+    """Terminate a server process started by start_server_process()."""
+    process.terminate()
+    process.join(timeout)
+    if process.is_alive():
+        process.kill()
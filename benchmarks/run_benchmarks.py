@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Benchmark Runner
+Measures Odoo RPC count, Bot API calls, wall time and peak memory of every
+Odoo wrapper function and command handler against a seeded fake Odoo and
+a fake Bot API, each running in its own process
+
+Every case runs cold (Odoo caches and report snapshots flushed first) and
+warm. Save the results with --json and compare a later run against them
+with --baseline; the exit code is 1 if a case got slower or needs more RPCs.
+
+Usage:
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --latency 0.05 --json bench.json
+    python -m benchmarks.run_benchmarks --baseline bench.json --only summary
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tracemalloc
+import statistics
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.harness import (
+    CHAT_ID,
+    OdooStats,
+    configure_environment,
+    find_fixtures,
+    start_fake_servers,
+    use_fake_odoo,
+    wait_for_background_work,
+)
+from benchmarks.fake_bot_api import FakeBotApiControl
+from benchmarks.updates import UpdateFactory
+
+# A step is (label, coroutine function); a case runs its steps in order
+Step = Tuple[str, Callable[[], Awaitable[Any]]]
+
+
+@dataclass
+class Result:
+    """Measurements of one step in one mode."""
+    group: str
+    name: str
+    mode: str
+    runs: int
+    wall_ms: float
+    wall_min_ms: float
+    wall_max_ms: float
+    odoo_rpcs: int
+    bot_api_calls: int
+    peak_kb: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.group}:{self.name}:{self.mode}"
+
+
+class BenchmarkRunner:
+    """Runs cases against the fake servers and collects one Result per step and mode."""
+
+    def __init__(self, odoo: OdooStats, bot_api: FakeBotApiControl, repeat: int):
+        self.odoo = odoo
+        self.bot_api = bot_api
+        self.repeat = repeat
+        self.results: List[Result] = []
+
+    def reset_state(self):
+        """Cold start: drop cached Odoo data and report snapshots (the pool stays logged in)."""
+        from src.utils.odoo_time_wrapper import flush_odoo_caches
+        from src.scripts.run_command_bot import report_snapshots
+
+        flush_odoo_caches()
+        report_snapshots.clear()
+
+    async def _run_steps(self, steps: List[Step], samples: Dict[str, Dict[str, list]], traced: bool):
+        for label, step in steps:
+            self.odoo.reset()
+            self.bot_api.reset_stats()
+
+            if traced:
+                tracemalloc.start()
+            started = time.perf_counter()
+
+            await step()
+            await wait_for_background_work()
+
+            elapsed = time.perf_counter() - started
+            if traced:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                samples[label]["peak"].append(peak)
+            else:
+                samples[label]["wall"].append(elapsed)
+                samples[label]["rpcs"].append(self.odoo.calls())
+                samples[label]["api"].append(self.bot_api.calls())
+
+    async def run(self, group: str, name: str, steps: List[Step], prepare: Optional[Callable[[], Awaitable[Any]]] = None):
+        """
+        Measure a case cold and warm.
+
+        Args:
+            group: "wrapper" or "handler"
+            name: Case name (steps after the first are reported as "name: label")
+            steps: Coroutine functions run in order, each measured separately
+            prepare: Coroutine run (unmeasured) before every repetition, e.g. to open a conversation
+        """
+        for mode in ("cold", "warm"):
+            samples = {label: {"wall": [], "rpcs": [], "api": [], "peak": []} for label, _ in steps}
+
+            if mode == "warm":
+                # Prime caches and snapshots once
+                if prepare:
+                    await prepare()
+                await self._run_steps(steps, {label: {"wall": [], "rpcs": [], "api": [], "peak": []} for label, _ in steps}, False)
+
+            # Timed runs without tracemalloc, then one traced run for memory
+            for index in range(self.repeat + 1):
+                if mode == "cold":
+                    self.reset_state()
+                if prepare:
+                    await prepare()
+                await self._run_steps(steps, samples, traced=index == self.repeat)
+
+            for label, _ in steps:
+                data = samples[label]
+                step_name = name if len(steps) == 1 else f"{name}: {label}"
+                result = Result(
+                    group=group,
+                    name=step_name,
+                    mode=mode,
+                    runs=len(data["wall"]),
+                    wall_ms=statistics.median(data["wall"]) * 1000,
+                    wall_min_ms=min(data["wall"]) * 1000,
+                    wall_max_ms=max(data["wall"]) * 1000,
+                    odoo_rpcs=int(statistics.median(data["rpcs"])),
+                    bot_api_calls=int(statistics.median(data["api"])),
+                    peak_kb=data["peak"][0] / 1024,
+                )
+                self.results.append(result)
+                print_result(result)
+
+
+def print_header():
+    print(f"{'group':<8} {'case':<44} {'mode':<5} {'median ms':>10} {'min':>8} {'max':>8} "
+          f"{'odoo rpc':>8} {'bot api':>7} {'peak KB':>9}")
+    print("-" * 116)
+
+
+def print_result(result: Result):
+    print(f"{result.group:<8} {result.name[:44]:<44} {result.mode:<5} {result.wall_ms:>10.1f} "
+          f"{result.wall_min_ms:>8.1f} {result.wall_max_ms:>8.1f} {result.odoo_rpcs:>8} "
+          f"{result.bot_api_calls:>7} {result.peak_kb:>9.0f}")
+
+
+# ============================================
+# CASES
+# ============================================
+
+def wrapper_cases(fixtures: Dict[str, Any]) -> List[Tuple[str, List[Step]]]:
+    """Every public odoo_time_wrapper function, called directly (no thread pool)."""
+    from src.utils import odoo_time_wrapper as wrapper
+
+    project_id, task_id = fixtures["project_id"], fixtures["task_id"]
+
+    def call(func, *args, **kwargs) -> Callable[[], Awaitable[Any]]:
+        async def step():
+            return func(*args, **kwargs)
+        return step
+
+    cases = [
+        ("get_recent_time_entries", call(wrapper.get_recent_time_entries, limit=5)),
+        ("get_weekly_summary", call(wrapper.get_weekly_summary)),
+        ("get_monthly_summary", call(wrapper.get_monthly_summary)),
+        ("get_time_summary_tables", call(wrapper.get_time_summary_tables)),
+        ("get_invoice_summary", call(wrapper.get_invoice_summary)),
+        ("get_projects_list", call(wrapper.get_projects_list)),
+        ("find_projects", call(wrapper.find_projects, fixtures["project_query"])),
+        ("get_project", call(wrapper.get_project, project_id)),
+        ("get_tasks_list", call(wrapper.get_tasks_list, project_id)),
+        ("get_tasks_page (first)", call(wrapper.get_tasks_page, project_id, 0, 10)),
+        ("get_tasks_page (deep)", call(wrapper.get_tasks_page, project_id, fixtures["task_count"] - 10, 10)),
+        ("find_tasks", call(wrapper.find_tasks, project_id, fixtures["task_query"])),
+        ("get_task", call(wrapper.get_task, project_id, task_id)),
+        ("warm_up_reference_data", call(wrapper.warm_up_reference_data)),
+        ("log_time_entry", call(wrapper.log_time_entry, project_id, task_id, "Benchmark entry", 0.25)),
+    ]
+    return [(name, [(name, step)]) for name, step in cases]
+
+
+def handler_cases(app, fixtures: Dict[str, Any]) -> List[Tuple[str, List[Step], Optional[Callable]]]:
+    """Every command handler and each step of the /logtime conversation, through Application.process_update."""
+    from telegram import Update
+
+    updates = UpdateFactory(CHAT_ID)
+    project_id, task_id = fixtures["project_id"], fixtures["task_id"]
+
+    def send(make_update: Callable[[], Dict[str, Any]]) -> Callable[[], Awaitable[Any]]:
+        async def step():
+            data = {"update_id": 1, **make_update()}
+            await app.process_update(Update.de_json(data, app.bot))
+        return step
+
+    def command(text: str) -> List[Step]:
+        return [(text, send(lambda: updates.command(text)))]
+
+    async def cancel_conversation():
+        await send(lambda: updates.command("/cancel"))()
+
+    cases: List[Tuple[str, List[Step], Optional[Callable]]] = [
+        (text, command(text), None)
+        for text in ("/start", "/help", "/ping", "/status", "/showtime", "/timeweek", "/timemonth",
+                     "/summary", "/invoiced", "/cacheflush")
+    ]
+    cases += [
+        ("refresh summary", [("refresh", send(lambda: updates.callback("refresh_summary")))], None),
+        ("inline projects", [("query", send(lambda: updates.inline(fixtures["project_query"])))], None),
+        ("inline tasks", [("query", send(lambda: updates.inline(f"#{project_id} {fixtures['task_query']}")))], None),
+        ("/logtime", [
+            ("start", send(lambda: updates.command("/logtime"))),
+            ("search", send(lambda: updates.text(fixtures["project_query"]))),
+            ("pick project", send(lambda: updates.callback(f"proj_{project_id}"))),
+            ("next page", send(lambda: updates.callback(f"taskpage_{project_id}_1"))),
+            ("pick task", send(lambda: updates.callback(f"task_{task_id}"))),
+            ("hours", send(lambda: updates.text("1.5"))),
+            ("description", send(lambda: updates.text("Benchmark entry"))),
+        ], cancel_conversation),
+        ("/logtime ids", [
+            ("start", send(lambda: updates.command(f"/logtime {project_id} {task_id}"))),
+            ("hours", send(lambda: updates.text("0.5"))),
+            ("description", send(lambda: updates.text("Benchmark entry"))),
+        ], cancel_conversation),
+    ]
+    return cases
+
+
+# ============================================
+# REPORTING
+# ============================================
+
+def compare(results: List[Result], baseline_path: str, tolerance: float, noise_ms: float) -> List[str]:
+    """Return a line per case that needs more RPCs or got slower than in the baseline."""
+    with open(baseline_path) as f:
+        baseline = {f"{row['group']}:{row['name']}:{row['mode']}": row for row in json.load(f)["results"]}
+
+    regressions = []
+    for result in results:
+        before = baseline.get(result.key)
+        if before is None:
+            continue
+
+        if result.odoo_rpcs > before["odoo_rpcs"]:
+            regressions.append(f"{result.key}: {before['odoo_rpcs']} → {result.odoo_rpcs} Odoo RPCs")
+        if result.bot_api_calls > before["bot_api_calls"]:
+            regressions.append(f"{result.key}: {before['bot_api_calls']} → {result.bot_api_calls} Bot API calls")
+        if (result.wall_ms > before["wall_ms"] * (1 + tolerance)
+                and result.wall_ms - before["wall_ms"] > noise_ms):
+            regressions.append(f"{result.key}: {before['wall_ms']:.1f} → {result.wall_ms:.1f} ms")
+
+    return regressions
+
+
+async def run_all(args, servers) -> List[Result]:
+    from src.utils.telegram_listener import TelegramCommandBot
+    from src.scripts.run_command_bot import register_handlers
+    from src.utils.odoo_async import shutdown_executor
+
+    use_fake_odoo(servers)
+    fixtures = find_fixtures(servers.odoo_url)
+
+    odoo = OdooStats(servers.odoo_url)
+    bot_api = FakeBotApiControl(servers.bot_api_url)
+    runner = BenchmarkRunner(odoo, bot_api, repeat=args.repeat)
+
+    records = odoo.get()["records"]
+    print(f"📦 Fake Odoo: {records.get('account.analytic.line', 0)} timesheet lines, "
+          f"{records.get('account.move', 0)} invoices, {records.get('project.project', 0)} projects, "
+          f"{records.get('project.task', 0)} tasks; {args.latency * 1000:.0f} ms per RPC")
+    print()
+    print_header()
+
+    def selected(name: str) -> bool:
+        return not args.only or any(pattern in name for pattern in args.only)
+
+    if not args.handlers_only:
+        for name, steps in wrapper_cases(fixtures):
+            if selected(name):
+                await runner.run("wrapper", name, steps)
+
+    if not args.wrappers_only:
+        bot = TelegramCommandBot()
+        register_handlers(bot)
+        await bot.app.initialize()
+        try:
+            for name, steps, prepare in handler_cases(bot.app, fixtures):
+                if selected(name):
+                    await runner.run("handler", name, steps, prepare)
+        finally:
+            await bot.app.shutdown()
+
+    shutdown_executor(wait=True)
+    bot_api.close()
+    return runner.results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Odoo wrapper functions and command handlers")
+    parser.add_argument("--latency", type=float, default=0.01, help="Seconds added to every Odoo RPC (default 0.01)")
+    parser.add_argument("--bot-api-latency", type=float, default=0.0, help="Seconds added to every Bot API call")
+    parser.add_argument("--timesheets", type=int, default=50000)
+    parser.add_argument("--invoices", type=int, default=20000)
+    parser.add_argument("--projects", type=int, default=300)
+    parser.add_argument("--tasks-per-project", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case and mode")
+    parser.add_argument("--only", nargs="*", help="Only run cases whose name contains one of these")
+    parser.add_argument("--wrappers-only", action="store_true")
+    parser.add_argument("--handlers-only", action="store_true")
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--baseline", help="Compare against results saved with --json")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown vs. baseline (0.25 = 25%%)")
+    parser.add_argument("--noise-ms", type=float, default=5.0, help="Slowdowns below this many ms are ignored")
+    args = parser.parse_args()
+
+    print("⏳ Starting fake Odoo and Bot API servers...")
+    servers = start_fake_servers(
+        odoo_latency=args.latency,
+        bot_api_latency=args.bot_api_latency,
+        timesheets=args.timesheets,
+        invoices=args.invoices,
+        projects=args.projects,
+        tasks_per_project=args.tasks_per_project,
+    )
+
+    try:
+        configure_environment(servers)
+        results = asyncio.run(run_all(args, servers))
+    finally:
+        servers.stop()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"settings": vars(args), "results": [asdict(result) for result in results]}, f, indent=2)
+        print(f"\n✓ Results written to {args.json}")
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance, args.noise_ms)
+        if regressions:
+            print(f"\n⚠️  {len(regressions)} regression(s) against {args.baseline}:")
+            for line in regressions:
+                print(f"   {line}")
+            sys.exit(1)
+        print(f"\n✓ No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
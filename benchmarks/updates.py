@@ -0,0 +1,94 @@
+"""
+Synthetic Updates
+Builds Bot API update dicts (commands, text, callback queries, inline
+queries, voice messages) as Telegram would send them
+"""
+
+import time
+import itertools
+from typing import Any, Dict, Optional
+
+
+class UpdateFactory:
+    """
+    Creates update dicts for one private chat.
+
+    Update IDs are left out so FakeBotApiServer.push_updates() can number
+    them; pass the dict to Update.de_json() to process it directly.
+
+    Example:
+        updates = UpdateFactory(chat_id=424242)
+        app.process_update(Update.de_json(updates.command("/ping"), app.bot))
+    """
+
+    _message_ids = itertools.count(1)
+    _query_ids = itertools.count(1)
+
+    def __init__(self, chat_id: int, first_name: str = "Bench"):
+        """
+        Initialize the factory.
+
+        Args:
+            chat_id: Private chat (and user) ID the updates come from
+            first_name: Sender's first name
+        """
+        self.chat_id = chat_id
+        self.user = {"id": chat_id, "is_bot": False, "first_name": first_name, "language_code": "en"}
+        self.chat = {"id": chat_id, "type": "private", "first_name": first_name}
+
+    def _message(self, **fields) -> Dict[str, Any]:
+        return {
+            "message_id": next(self._message_ids),
+            "date": int(time.time()),
+            "chat": self.chat,
+            "from": self.user,
+            **fields,
+        }
+
+    def text(self, text: str) -> Dict[str, Any]:
+        """A plain text message; a leading /command gets its bot_command entity."""
+        message = self._message(text=text)
+        if text.startswith("/"):
+            message["entities"] = [{"type": "bot_command", "offset": 0, "length": len(text.split()[0])}]
+        return {"message": message}
+
+    def command(self, command: str) -> Dict[str, Any]:
+        """A command such as "/logtime 12 345"."""
+        return self.text(command if command.startswith("/") else f"/{command}")
+
+    def callback(self, data: str, message_id: Optional[int] = None) -> Dict[str, Any]:
+        """A button press on one of the bot's inline keyboards."""
+        message = {
+            "message_id": message_id or next(self._message_ids),
+            "date": int(time.time()),
+            "chat": self.chat,
+            "from": {"id": 100000001, "is_bot": True, "first_name": "Benchmark Bot", "username": "benchmark_bot"},
+            "text": "…",
+        }
+        return {"callback_query": {
+            "id": str(next(self._query_ids)),
+            "from": self.user,
+            "chat_instance": str(self.chat_id),
+            "data": data,
+            "message": message,
+        }}
+
+    def inline(self, query: str, offset: str = "") -> Dict[str, Any]:
+        """An inline query ("@bot acme")."""
+        return {"inline_query": {
+            "id": str(next(self._query_ids)),
+            "from": self.user,
+            "query": query,
+            "offset": offset,
+            "chat_type": "private",
+        }}
+
+    def voice(self, duration: int = 3, file_id: str = "voice-benchmark") -> Dict[str, Any]:
+        """A voice message (the fake Bot API serves its audio)."""
+        return {"message": self._message(voice={
+            "file_id": file_id,
+            "file_unique_id": file_id,
+            "duration": duration,
+            "mime_type": "audio/ogg",
+            "file_size": 4096,
+        })}
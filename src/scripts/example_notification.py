@@ -7,16 +7,13 @@ in various scenarios like cron jobs or monitoring scripts.
 from src.utils.telegram_bot import TelegramNotifier
 
 
-def example_simple_notification():
+def example_simple_notification(notifier: TelegramNotifier):
     """Send a simple notification."""
-    notifier = TelegramNotifier()
     notifier.send_sync("🔔 Simple notification from your script!")
 
 
-def example_status_report():
+def example_status_report(notifier: TelegramNotifier):
     """Send a formatted status report."""
-    notifier = TelegramNotifier()
-
     status_report = """
 📊 *System Status Report*
 
@@ -31,10 +28,8 @@ _Generated automatically_
     notifier.send_sync(status_report, parse_mode="Markdown")
 
 
-def example_error_notification():
+def example_error_notification(notifier: TelegramNotifier):
     """Send an error notification."""
-    notifier = TelegramNotifier()
-
     error_message = """
 ❌ *Error Alert*
 
@@ -49,6 +44,15 @@ Action required: Check server logs
     notifier.send_sync(error_message, parse_mode="Markdown")
 
 
+def example_burst_of_alerts(notifier: TelegramNotifier):
+    """Queue many alerts at once; they are merged within the coalesce window."""
+    for disk in ["/dev/sda1", "/dev/sdb1", "/dev/sdc1"]:
+        notifier.enqueue(f"⚠️ Disk {disk} above 90%")
+
+    # Block until everything queued so far has been sent
+    notifier.flush()
+
+
 def example_with_error_handling():
     """Example with proper error handling."""
     try:
@@ -67,14 +71,19 @@ def example_with_error_handling():
 
 
 if __name__ == "__main__":
-    print("=== Example 1: Simple Notification ===")
-    example_simple_notification()
+    # One long-lived notifier: a single event loop and connection pool for all alerts
+    with TelegramNotifier(coalesce_window=1.0) as notifier:
+        print("=== Example 1: Simple Notification ===")
+        example_simple_notification(notifier)
+
+        print("\n=== Example 2: Status Report ===")
+        example_status_report(notifier)
 
-    print("\n=== Example 2: Status Report ===")
-    example_status_report()
+        print("\n=== Example 3: Error Notification ===")
+        example_error_notification(notifier)
 
-    print("\n=== Example 3: Error Notification ===")
-    example_error_notification()
+        print("\n=== Example 4: Burst of Alerts ===")
+        example_burst_of_alerts(notifier)
 
-    print("\n=== Example 4: With Error Handling ===")
+    print("\n=== Example 5: With Error Handling ===")
     example_with_error_handling()
@@ -16,13 +16,24 @@ from src.utils.telegram_listener import (
     help_command,
     ping_command,
     status_command,
-    echo_handler
+    stats_command,
+    echo_handler,
+    is_admin,
+    set_readiness
 )
 from src.utils.voice_handler import VoiceCommandHandler, download_voice_file
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
-from telegram.ext import ContextTypes, MessageHandler, CallbackQueryHandler, ConversationHandler, filters
+from src.utils.update_workers import UpdateWorkerPool, is_primary_worker
+from src.utils.report_snapshots import ReportSnapshotStore
+from src.utils.update_processor import command_slot
+from src.utils.metrics import instrument_conversation, instrument_handler
+from src.utils.tracing import span
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, InlineQueryResultArticle, InputTextMessageContent
+from telegram.ext import ContextTypes, MessageHandler, CallbackQueryHandler, ConversationHandler, InlineQueryHandler, filters
 import os
 from datetime import date as dt_date
+from typing import Tuple
+from telegram.error import BadRequest
+from dotenv import load_dotenv
 
 
 # ============================================
@@ -95,8 +106,8 @@ async def showtime_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text("⏳ Fetching recent time entries from Odoo...")
 
     try:
-        from src.utils.odoo_time_wrapper import get_recent_time_entries
-        result = get_recent_time_entries(limit=5)
+        from src.utils.odoo_async import get_recent_time_entries
+        result = await get_recent_time_entries(limit=5)
         await update.message.reply_text(result, parse_mode="Markdown")
     except Exception as e:
         await update.message.reply_text(f"❌ Error: {str(e)}")
@@ -107,8 +118,8 @@ async def timeweek_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text("⏳ Fetching weekly summary from Odoo...")
 
     try:
-        from src.utils.odoo_time_wrapper import get_weekly_summary
-        result = get_weekly_summary()
+        from src.utils.odoo_async import get_weekly_summary
+        result = await get_weekly_summary()
         await update.message.reply_text(result, parse_mode="Markdown")
     except Exception as e:
         await update.message.reply_text(f"❌ Error: {str(e)}")
@@ -119,8 +130,8 @@ async def timemonth_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text("⏳ Fetching monthly summary from Odoo...")
 
     try:
-        from src.utils.odoo_time_wrapper import get_monthly_summary
-        result = get_monthly_summary()
+        from src.utils.odoo_async import get_monthly_summary
+        result = await get_monthly_summary()
         await update.message.reply_text(result, parse_mode="Markdown")
     except Exception as e:
         await update.message.reply_text(f"❌ Error: {str(e)}")
@@ -128,24 +139,76 @@ async def timemonth_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def summary_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Custom command: /summary - Show comprehensive time summary with MD tables"""
-    await update.message.reply_text("⏳ Generating comprehensive time summary from Odoo...")
+    await send_report(update, "summary", "⏳ Generating comprehensive time summary from Odoo...")
 
+
+async def invoiced_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Custom command: /invoiced - Show invoice summary with amounts invoiced and paid"""
+    await send_report(update, "invoiced", "💰 Fetching invoice summary from Odoo...")
+
+
+def render_report(name: str, snapshot) -> Tuple[str, InlineKeyboardMarkup]:
+    """Add the snapshot's age and a refresh button to a report"""
+    text = f"{snapshot.text}\n\n_Updated {snapshot.age_text()}_"
+    if snapshot.error and not snapshot.text.startswith("❌"):
+        text += "\n⚠️ _Last refresh failed, showing the previous report_"
+
+    keyboard = InlineKeyboardMarkup([[InlineKeyboardButton("🔄 Refresh", callback_data=f"refresh_{name}")]])
+    return text, keyboard
+
+
+async def send_report(update: Update, name: str, loading_text: str):
+    """Reply with the latest snapshot of a report, computing it first if needed"""
     try:
-        from src.utils.odoo_time_wrapper import get_time_summary_tables
-        result = get_time_summary_tables()
-        await update.message.reply_text(result, parse_mode="Markdown")
+        snapshot = report_snapshots.get(name)
+        if snapshot is None:
+            await update.message.reply_text(loading_text)
+            snapshot = await report_snapshots.get_or_refresh(name)
+
+        text, keyboard = render_report(name, snapshot)
+        await update.message.reply_text(text, reply_markup=keyboard, parse_mode="Markdown")
     except Exception as e:
         await update.message.reply_text(f"❌ Error: {str(e)}")
 
 
-async def invoiced_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Custom command: /invoiced - Show invoice summary with amounts invoiced and paid"""
-    await update.message.reply_text("💰 Fetching invoice summary from Odoo...")
+async def refresh_report(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle the 🔄 Refresh button under /summary and /invoiced"""
+    query = update.callback_query
+    name = query.data.split("_", 1)[1]
+    await query.answer("Refreshing...")
 
     try:
-        from src.utils.odoo_time_wrapper import get_invoice_summary
-        result = get_invoice_summary()
-        await update.message.reply_text(result, parse_mode="Markdown")
+        # Same TELEGRAM_COMMAND_LIMITS cap as typing the command
+        async with command_slot(context.application, name):
+            snapshot = await report_snapshots.refresh(name)
+        text, keyboard = render_report(name, snapshot)
+        await query.edit_message_text(text, reply_markup=keyboard, parse_mode="Markdown")
+    except BadRequest as e:
+        # Telegram rejects edits that change nothing
+        if "not modified" not in str(e).lower():
+            await query.message.reply_text(f"❌ Error: {str(e)}")
+    except Exception as e:
+        await query.message.reply_text(f"❌ Error: {str(e)}")
+
+
+async def cacheflush_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Admin command: /cacheflush - Drop cached Odoo companies, projects and tasks"""
+    if not is_admin(update):
+        await update.message.reply_text("⛔ This command is restricted to admins.")
+        return
+
+    try:
+        from src.utils.odoo_time_wrapper import flush_odoo_caches, get_odoo_cache_stats
+
+        lines = ["🧹 *Odoo cache flushed*", ""]
+        for stats in get_odoo_cache_stats():
+            lines.append(
+                f"`{stats['name']:<9}` {stats['size']} entries, "
+                f"{stats['hits']} hits / {stats['misses']} misses ({stats['hit_rate']:.0%})"
+            )
+        flush_odoo_caches()
+
+        await update.message.reply_text("\n".join(lines), parse_mode="Markdown")
     except Exception as e:
         await update.message.reply_text(f"❌ Error: {str(e)}")
 
@@ -159,21 +222,23 @@ SEARCHING_PROJECT, SELECTING_PROJECT, SELECTING_TASK, ENTERING_HOURS, ENTERING_D
 
 
 async def logtime_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Start the time logging conversation"""
+    """Start the time logging conversation: /logtime [project_id [task_id]]"""
+    if context.args:
+        # Sent by the inline picker (@bot project name), skip the search steps
+        return await logtime_with_ids(update, context)
+
     await update.message.reply_text("⏱️ Loading projects...")
 
     try:
-        from src.utils.odoo_time_wrapper import get_projects_list
+        from src.utils.odoo_async import get_projects_list
 
-        projects = get_projects_list()
+        projects = await get_projects_list()
 
         if not projects:
             await update.message.reply_text("❌ No projects found or could not connect to Odoo.")
             return ConversationHandler.END
 
-        # Store all projects in context
-        context.user_data['all_projects'] = projects
-
+        # The project list stays in the shared Odoo cache; user_data only holds this session's choices
         await update.message.reply_text(
             "📁 *Search for a project*\n\n"
             f"Type part of the project name to search.\n"
@@ -189,6 +254,54 @@ async def logtime_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return ConversationHandler.END
 
 
+async def logtime_with_ids(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Jump into the conversation with a project (and task) picked inline"""
+    try:
+        ids = [int(arg) for arg in context.args[:2]]
+    except ValueError:
+        await update.message.reply_text("❌ Usage: /logtime [project_id [task_id]]")
+        return ConversationHandler.END
+
+    try:
+        from src.utils.odoo_async import get_project, get_task
+
+        # Names come from the cached project and task lists, not from Odoo
+        project = await get_project(ids[0])
+        if not project:
+            await update.message.reply_text(f"❌ Project {ids[0]} not found.")
+            return ConversationHandler.END
+
+        context.user_data['project_id'] = project['id']
+        context.user_data['project_name'] = project['name']
+
+        from src.utils.odoo_time_wrapper import record_project_use
+        record_project_use(project['id'])
+
+        if len(ids) == 1:
+            return await send_task_keyboard(update.message, project['id'], project['name'])
+
+        task = await get_task(project['id'], ids[1])
+        if not task:
+            await update.message.reply_text(f"❌ Task {ids[1]} not found in '{project['name']}'.")
+            return ConversationHandler.END
+
+        context.user_data['task_id'] = task['id']
+        context.user_data['task_name'] = task['name']
+
+        await update.message.reply_text(
+            f"📁 Project: *{project['name']}*\n"
+            f"📋 Task: *{task['name']}*\n\n"
+            f"⏱️ *How many hours did you work?*\n"
+            f"(Enter a number like: 2.5)",
+            parse_mode="Markdown"
+        )
+        return ENTERING_HOURS
+
+    except Exception as e:
+        await update.message.reply_text(f"❌ Error: {str(e)}")
+        return ConversationHandler.END
+
+
 async def search_projects(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle project search text"""
     search_term = update.message.text.strip().lower()
@@ -197,13 +310,14 @@ async def search_projects(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("❌ Please enter a search term.")
         return SEARCHING_PROJECT
 
-    all_projects = context.user_data.get('all_projects', [])
+    from src.utils.odoo_async import find_projects
 
-    # Filter projects by search term
-    matching_projects = [
-        p for p in all_projects
-        if search_term in p['name'].lower()
-    ]
+    # Indexed search over the shared project cache, best matches first
+    try:
+        matching_projects, total = await find_projects(search_term, limit=20)
+    except Exception as e:
+        await update.message.reply_text(f"❌ Error: {str(e)}\n\nSend the search term again or /cancel to abort.")
+        return SEARCHING_PROJECT
 
     if not matching_projects:
         await update.message.reply_text(
@@ -212,13 +326,6 @@ async def search_projects(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         return SEARCHING_PROJECT
 
-    if len(matching_projects) > 20:
-        await update.message.reply_text(
-            f"🔍 Found {len(matching_projects)} projects matching '{search_term}'\n\n"
-            "Please be more specific to narrow down the results."
-        )
-        return SEARCHING_PROJECT
-
     # Show matching projects as buttons
     keyboard = []
     for i in range(0, len(matching_projects), 2):
@@ -234,8 +341,12 @@ async def search_projects(update: Update, context: ContextTypes.DEFAULT_TYPE):
     keyboard.append([InlineKeyboardButton("❌ Cancel", callback_data="cancel")])
 
     reply_markup = InlineKeyboardMarkup(keyboard)
+    header = f"📁 *Found {total} project(s):*"
+    if total > len(matching_projects):
+        header += f"\nShowing the {len(matching_projects)} best matches. Type more to narrow down."
+
     await update.message.reply_text(
-        f"📁 *Found {len(matching_projects)} project(s):*",
+        header,
         reply_markup=reply_markup,
         parse_mode="Markdown"
     )
@@ -265,52 +376,96 @@ async def project_selected(update: Update, context: ContextTypes.DEFAULT_TYPE):
     project_id = int(query.data.split("_")[1])
     context.user_data['project_id'] = project_id
 
-    # Get project name (from button text)
-    project_name = query.message.reply_markup.inline_keyboard[0][0].text
-    for row in query.message.reply_markup.inline_keyboard:
-        for button in row:
-            if button.callback_data == query.data:
-                project_name = button.text
-                break
+    from src.utils.odoo_time_wrapper import record_project_use
+    record_project_use(project_id)
 
-    context.user_data['project_name'] = project_name
+    try:
+        from src.utils.odoo_async import get_project
 
-    await query.edit_message_text(f"📁 Project selected: *{project_name}*\n⏳ Loading tasks...", parse_mode="Markdown")
+        # Name comes from the cached project list, not from the keyboard
+        project = await get_project(project_id)
+        project_name = project['name'] if project else f"Project {project_id}"
+        context.user_data['project_name'] = project_name
 
-    try:
-        from src.utils.odoo_time_wrapper import get_tasks_list
+        await query.edit_message_text(f"📁 Project selected: *{project_name}*\n⏳ Loading tasks...", parse_mode="Markdown")
 
-        tasks = get_tasks_list(project_id)
+        return await send_task_keyboard(query.message, project_id, project_name)
+    except Exception as e:
+        await query.message.reply_text(f"❌ Error: {str(e)}")
+        return ConversationHandler.END
 
-        if not tasks:
-            await query.message.reply_text("❌ No tasks found for this project.")
-            return ConversationHandler.END
 
-        # Show all tasks as buttons (no search)
-        keyboard = []
-        for i in range(0, len(tasks), 2):
-            row = []
-            for task in tasks[i:i+2]:
-                row.append(InlineKeyboardButton(
-                    task['name'][:30],
-                    callback_data=f"task_{task['id']}"
-                ))
-            keyboard.append(row)
+TASK_PAGE_SIZE = 10
 
-        keyboard.append([InlineKeyboardButton("❌ Cancel", callback_data="cancel")])
 
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        await query.message.reply_text(
-            f"📋 *Select a task from '{project_name}':*\n({len(tasks)} tasks)",
-            reply_markup=reply_markup,
-            parse_mode="Markdown"
-        )
+async def send_task_keyboard(message, project_id: int, project_name: str, page: int = 0, edit: bool = False):
+    """
+    Show one page of the project's tasks as buttons and return the next state.
 
-        return SELECTING_TASK
+    Args:
+        message: Message to reply to, or to edit in place when paging
+        project_id: Project whose tasks are listed
+        project_name: Shown in the header
+        page: Zero-based page number
+        edit: Replace the keyboard of message instead of sending a new one
+    """
+    from src.utils.odoo_async import get_tasks_page
+
+    tasks, total = await get_tasks_page(project_id, page, TASK_PAGE_SIZE)
+
+    if not tasks:
+        await message.reply_text("❌ No tasks found for this project.")
+        return ConversationHandler.END
+
+    pages = (total + TASK_PAGE_SIZE - 1) // TASK_PAGE_SIZE
 
+    keyboard = []
+    for i in range(0, len(tasks), 2):
+        row = []
+        for task in tasks[i:i+2]:
+            row.append(InlineKeyboardButton(
+                task['name'][:30],
+                callback_data=f"task_{task['id']}"
+            ))
+        keyboard.append(row)
+
+    navigation = []
+    if page > 0:
+        navigation.append(InlineKeyboardButton("◀️ Prev", callback_data=f"taskpage_{project_id}_{page - 1}"))
+    if page + 1 < pages:
+        navigation.append(InlineKeyboardButton("Next ▶️", callback_data=f"taskpage_{project_id}_{page + 1}"))
+    if navigation:
+        keyboard.append(navigation)
+
+    keyboard.append([InlineKeyboardButton("🔎 Search tasks", switch_inline_query_current_chat=f"#{project_id} ")])
+    keyboard.append([InlineKeyboardButton("❌ Cancel", callback_data="cancel")])
+
+    text = f"📋 *Select a task from '{project_name}':*\n({total} tasks"
+    text += f", page {page + 1}/{pages})" if pages > 1 else ")"
+
+    reply_markup = InlineKeyboardMarkup(keyboard)
+    if edit:
+        await message.edit_text(text, reply_markup=reply_markup, parse_mode="Markdown")
+    else:
+        await message.reply_text(text, reply_markup=reply_markup, parse_mode="Markdown")
+
+    return SELECTING_TASK
+
+
+async def task_page(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle Prev/Next on the task keyboard"""
+    query = update.callback_query
+    await query.answer()
+
+    _, project_id, page = query.data.split("_")
+
+    try:
+        return await send_task_keyboard(
+            query.message, int(project_id), context.user_data.get('project_name', ''), page=int(page), edit=True
+        )
     except Exception as e:
         await query.message.reply_text(f"❌ Error: {str(e)}")
-        return ConversationHandler.END
+        return SELECTING_TASK
 
 
 async def task_selected(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -327,13 +482,14 @@ async def task_selected(update: Update, context: ContextTypes.DEFAULT_TYPE):
     task_id = int(query.data.split("_")[1])
     context.user_data['task_id'] = task_id
 
-    # Get task name
-    task_name = query.message.reply_markup.inline_keyboard[0][0].text
-    for row in query.message.reply_markup.inline_keyboard:
-        for button in row:
-            if button.callback_data == query.data:
-                task_name = button.text
-                break
+    # Name comes from the cached task list, not from the keyboard
+    from src.utils.odoo_async import get_task
+
+    try:
+        task = await get_task(context.user_data['project_id'], task_id)
+    except TimeoutError:
+        task = None
+    task_name = task['name'] if task else f"Task {task_id}"
 
     context.user_data['task_name'] = task_name
 
@@ -385,9 +541,9 @@ async def description_entered(update: Update, context: ContextTypes.DEFAULT_TYPE
     await update.message.reply_text("⏳ Logging time to Odoo...")
 
     try:
-        from src.utils.odoo_time_wrapper import log_time_entry
+        from src.utils.odoo_async import log_time_entry
 
-        result = log_time_entry(
+        result = await log_time_entry(
             project_id=context.user_data['project_id'],
             task_id=context.user_data['task_id'],
             description=description,
@@ -406,6 +562,9 @@ async def description_entered(update: Update, context: ContextTypes.DEFAULT_TYPE
 
         await update.message.reply_text(summary)
 
+        # The time summary changed; have it ready for the next /summary
+        report_snapshots.refresh_soon("summary")
+
         # Clear user data
         context.user_data.clear()
 
@@ -424,6 +583,64 @@ async def cancel_logging(update: Update, context: ContextTypes.DEFAULT_TYPE):
     return ConversationHandler.END
 
 
+# ============================================
+# INLINE PROJECT / TASK PICKER
+# ============================================
+
+INLINE_PAGE_SIZE = 20
+
+
+async def inline_picker(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """
+    Inline query: "@bot acme" lists projects, "@bot #<project_id> design" lists its tasks.
+
+    Picking a result sends "/logtime <project_id> [<task_id>]" to the chat,
+    which starts the time logging conversation at the right step.
+    """
+    inline_query = update.inline_query
+
+    # Inline queries can come from any chat, so only known users see Odoo data
+    if not is_admin(update):
+        await inline_query.answer([], cache_time=300, is_personal=True)
+        return
+
+    from src.utils.odoo_async import find_projects, find_tasks
+
+    text = inline_query.query.strip()
+    offset = int(inline_query.offset or 0)
+
+    try:
+        if text.startswith("#"):
+            project_ref, _, task_query = text[1:].partition(" ")
+            project_id = int(project_ref)
+            items, total = await find_tasks(project_id, task_query, limit=INLINE_PAGE_SIZE, offset=offset)
+            results = [
+                InlineQueryResultArticle(
+                    id=f"t{project_id}_{task['id']}",
+                    title=task['name'],
+                    description="Log time on this task",
+                    input_message_content=InputTextMessageContent(f"/logtime {project_id} {task['id']}"),
+                )
+                for task in items
+            ]
+        else:
+            items, total = await find_projects(text, limit=INLINE_PAGE_SIZE, offset=offset)
+            results = [
+                InlineQueryResultArticle(
+                    id=f"p{project['id']}",
+                    title=project['name'],
+                    description="Log time on this project",
+                    input_message_content=InputTextMessageContent(f"/logtime {project['id']}"),
+                )
+                for project in items
+            ]
+    except (ValueError, TimeoutError):
+        results, total = [], 0
+
+    next_offset = str(offset + INLINE_PAGE_SIZE) if offset + INLINE_PAGE_SIZE < total else ""
+    await inline_query.answer(results, cache_time=30, is_personal=True, next_offset=next_offset)
+
+
 # ============================================
 # VOICE MESSAGE HANDLER
 # ============================================
@@ -431,6 +648,23 @@ async def cancel_logging(update: Update, context: ContextTypes.DEFAULT_TYPE):
 # Initialize voice handler (will be set up in main)
 voice_handler = None
 
+
+async def _time_summary_report() -> str:
+    from src.utils.odoo_async import get_time_summary_tables
+    return await get_time_summary_tables()
+
+
+async def _invoice_report() -> str:
+    from src.utils.odoo_async import get_invoice_summary
+    return await get_invoice_summary()
+
+
+# Precomputed /summary and /invoiced, refreshed on the JobQueue
+report_snapshots = ReportSnapshotStore({
+    "summary": _time_summary_report,
+    "invoiced": _invoice_report,
+})
+
 # Map of command names to their handler functions
 COMMAND_MAP = {
     "status": status_command,
@@ -469,16 +703,13 @@ async def voice_message_handler(update: Update, context: ContextTypes.DEFAULT_TY
     try:
         # Download voice file
         voice_file = await update.message.voice.get_file()
-        audio_path = await download_voice_file(voice_file, context.bot)
+        audio = await download_voice_file(voice_file, context.bot)
 
         # Step 2: Transcribing
         await status_msg.edit_text("📝 Transcribing audio...")
 
         # Process voice message
-        result = await voice_handler.process_voice_message(audio_path)
-
-        # Clean up temp file
-        os.remove(audio_path)
+        result = await voice_handler.process_voice_message(audio)
 
         # Send transcription result
         await update.message.reply_text(result["explanation"])
@@ -487,7 +718,9 @@ async def voice_message_handler(update: Update, context: ContextTypes.DEFAULT_TY
         if result["command"]:
             command_func = COMMAND_MAP.get(result["command"])
             if command_func:
-                await command_func(update, context)
+                with span(f"/{result['command']}"):
+                    async with command_slot(context.application, result["command"]):
+                        await command_func(update, context)
             else:
                 await update.message.reply_text(f"⚠️ Command '{result['command']}' is not yet implemented.")
 
@@ -499,73 +732,150 @@ async def voice_message_handler(update: Update, context: ContextTypes.DEFAULT_TY
 # MAIN BOT SETUP
 # ============================================
 
-def main():
-    """Initialize and run the bot with all commands"""
+async def warm_up_odoo(app):
+    """Startup task: log in to Odoo and fill the caches while polling starts"""
+    import time
+    from src.utils.odoo_async import warm_up_reference_data
+
+    set_readiness("Odoo", "⏳ warming up")
+    started = time.monotonic()
+
+    try:
+        loaded = await warm_up_reference_data()
+    except Exception as e:
+        set_readiness("Odoo", f"⚠️ warm-up failed ({e}), loading on first use")
+        print(f"⚠️  Odoo warm-up failed: {e}")
+        return
+
+    elapsed = time.monotonic() - started
+    set_readiness(
+        "Odoo",
+        f"✅ ready in {elapsed:.1f}s ({loaded['projects']} projects, {loaded['task_lists']} task lists cached)"
+    )
+    print(f"✓ Odoo warmed up in {elapsed:.1f}s")
+
+
+async def close_odoo(app):
+    """Shutdown task: stop the Odoo thread pool"""
+    from src.utils.odoo_async import shutdown_executor
+    shutdown_executor()
+
+
+def register_handlers(bot: TelegramCommandBot):
+    """
+    Register every command and handler on a bot.
+
+    Runs once in single-process mode, and once in every worker process
+    when TELEGRAM_WORKERS is greater than 1. Report refresh jobs and the
+    Odoo warm-up only run in the primary process (worker 0).
+    """
     global voice_handler
 
+    # Initialize voice handler if OpenAI API key is available
+    try:
+        voice_handler = VoiceCommandHandler(command_names=COMMAND_MAP.keys())
+        print("✓ Voice commands enabled")
+    except ValueError:
+        print("⚠️  Voice commands disabled (no OPENAI_API_KEY)")
+        voice_handler = None
+
+    # Register built-in commands
+    bot.add_command("start", start_command)
+    bot.add_command("help", help_command)
+    bot.add_command("ping", ping_command)
+    bot.add_command("status", status_command)
+
+    # Register your custom commands
+    bot.add_command("hello", hello_command)
+    bot.add_command("time", time_command)
+    bot.add_command("joke", joke_command)
+    bot.add_command("backup", backup_command)
+    bot.add_command("deploy", deploy_command)
+    bot.add_command("test", test_command)
+
+    # Register Odoo time commands
+    bot.add_command("showtime", showtime_command)
+    bot.add_command("timeweek", timeweek_command)
+    bot.add_command("timemonth", timemonth_command)
+    bot.add_command("summary", summary_command)
+    bot.add_command("invoiced", invoiced_command)
+    bot.add_command("cacheflush", cacheflush_command)
+    bot.add_command("stats", stats_command)
+
+    # Register time logging conversation handler
+    from telegram.ext import CommandHandler
+    logtime_handler = ConversationHandler(
+        entry_points=[CommandHandler("logtime", logtime_command)],
+        states={
+            SEARCHING_PROJECT: [MessageHandler(filters.TEXT & ~filters.COMMAND, search_projects)],
+            SELECTING_PROJECT: [CallbackQueryHandler(project_selected, pattern=r"^(proj_\d+|search_again|cancel)$")],
+            SELECTING_TASK: [
+                CallbackQueryHandler(task_page, pattern=r"^taskpage_\d+_\d+$"),
+                CallbackQueryHandler(task_selected, pattern=r"^(task_\d+|cancel)$"),
+            ],
+            ENTERING_HOURS: [MessageHandler(filters.TEXT & ~filters.COMMAND, hours_entered)],
+            ENTERING_DESCRIPTION: [MessageHandler(filters.TEXT & ~filters.COMMAND, description_entered)],
+        },
+        fallbacks=[CommandHandler("cancel", cancel_logging)],
+        per_message=False,
+        per_chat=True,
+        per_user=True,
+        # Picking from the inline picker restarts a conversation already in progress
+        allow_reentry=True,
+        # Keep in-flight sessions across restarts when persistence is configured
+        name="logtime",
+        persistent=bot.persistence is not None,
+    )
+    bot.app.add_handler(instrument_conversation(logtime_handler))
+    print("✓ Time logging conversation handler registered")
+
+    # Serve /summary and /invoiced from snapshots refreshed in the background
+    bot.app.add_handler(CallbackQueryHandler(instrument_handler(refresh_report), pattern=r"^refresh_(summary|invoiced)$"))
+    report_snapshots.schedule(
+        bot.app.job_queue,
+        interval=float(os.getenv('REPORT_REFRESH_INTERVAL', '900')),
+        jobs=is_primary_worker(),
+    )
+    print("✓ Report snapshots scheduled" if is_primary_worker() else "✓ Report snapshots refreshed on use")
+
+    # Inline project/task picker (enable inline mode with @BotFather /setinline)
+    bot.app.add_handler(InlineQueryHandler(instrument_handler(inline_picker)))
+    print("✓ Inline project picker registered")
+
+    # Register voice message handler
+    if voice_handler:
+        bot.app.add_handler(MessageHandler(filters.VOICE, instrument_handler(voice_message_handler, "voice")))
+        print("✓ Voice message handler registered")
+
+    # Handle regular messages (non-commands)
+    bot.add_message_handler(echo_handler)
+
+    # Warm up Odoo in the background so the first command is as fast as the rest
+    if is_primary_worker() and os.getenv('ODOO_WARMUP', 'true').lower() not in ("0", "false", "no"):
+        bot.add_startup_task(warm_up_odoo)
+    bot.add_shutdown_task(close_odoo)
+
+
+def main():
+    """Initialize and run the bot with all commands"""
     try:
         print("=" * 50)
         print("🤖 Starting Telegram Command Bot")
         print("=" * 50)
 
-        # Initialize bot
-        bot = TelegramCommandBot()
+        load_dotenv()
+        workers = int(os.getenv('TELEGRAM_WORKERS', '1'))
 
-        # Initialize voice handler if OpenAI API key is available
-        try:
-            voice_handler = VoiceCommandHandler()
-            print("✓ Voice commands enabled")
-        except ValueError:
-            print("⚠️  Voice commands disabled (no OPENAI_API_KEY)")
-            voice_handler = None
-
-        # Register built-in commands
-        bot.add_command("start", start_command)
-        bot.add_command("help", help_command)
-        bot.add_command("ping", ping_command)
-        bot.add_command("status", status_command)
-
-        # Register your custom commands
-        bot.add_command("hello", hello_command)
-        bot.add_command("time", time_command)
-        bot.add_command("joke", joke_command)
-        bot.add_command("backup", backup_command)
-        bot.add_command("deploy", deploy_command)
-        bot.add_command("test", test_command)
-
-        # Register Odoo time commands
-        bot.add_command("showtime", showtime_command)
-        bot.add_command("timeweek", timeweek_command)
-        bot.add_command("timemonth", timemonth_command)
-        bot.add_command("summary", summary_command)
-        bot.add_command("invoiced", invoiced_command)
-
-        # Register time logging conversation handler
-        from telegram.ext import CommandHandler
-        logtime_handler = ConversationHandler(
-            entry_points=[CommandHandler("logtime", logtime_command)],
-            states={
-                SEARCHING_PROJECT: [MessageHandler(filters.TEXT & ~filters.COMMAND, search_projects)],
-                SELECTING_PROJECT: [CallbackQueryHandler(project_selected)],
-                SELECTING_TASK: [CallbackQueryHandler(task_selected)],
-                ENTERING_HOURS: [MessageHandler(filters.TEXT & ~filters.COMMAND, hours_entered)],
-                ENTERING_DESCRIPTION: [MessageHandler(filters.TEXT & ~filters.COMMAND, description_entered)],
-            },
-            fallbacks=[CommandHandler("cancel", cancel_logging)],
-            per_message=False,
-            per_chat=True,
-            per_user=True,
-        )
-        bot.app.add_handler(logtime_handler)
-        print("✓ Time logging conversation handler registered")
+        if workers > 1:
+            # One process receives updates, the workers run the handlers
+            print(f"⚙️  Running handlers in {workers} worker processes")
+            print("=" * 50)
+            UpdateWorkerPool(register_handlers, workers=workers).run()
+            return
 
-        # Register voice message handler
-        if voice_handler:
-            bot.app.add_handler(MessageHandler(filters.VOICE, voice_message_handler))
-            print("✓ Voice message handler registered")
-
-        # Handle regular messages (non-commands)
-        bot.add_message_handler(echo_handler)
+        # Initialize bot
+        bot = TelegramCommandBot()
+        register_handlers(bot)
 
         print("\n💡 Tip: Send /start to your bot to see available commands")
         if voice_handler:
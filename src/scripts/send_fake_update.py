@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Send a fake Telegram update to a bot running in webhook mode
+Useful for testing handlers locally without going through Telegram
+
+Usage:
+    python src/scripts/send_fake_update.py /ping --chat-id 123456789
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import urllib.request
+import urllib.error
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from dotenv import load_dotenv
+
+
+def build_message_update(text: str, chat_id: int, update_id: int) -> dict:
+    """Build a minimal Update payload for a private text message."""
+    message = {
+        "message_id": update_id,
+        "date": int(time.time()),
+        "chat": {"id": chat_id, "type": "private", "first_name": "Test"},
+        "from": {"id": chat_id, "is_bot": False, "first_name": "Test"},
+        "text": text,
+    }
+
+    if text.startswith("/"):
+        command = text.split()[0]
+        message["entities"] = [{"type": "bot_command", "offset": 0, "length": len(command)}]
+
+    return {"update_id": update_id, "message": message}
+
+
+def send_update(update: dict, url: str, secret_token: str) -> int:
+    """POST an update to the webhook and return the HTTP status code."""
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(update).encode("utf-8"),
+        headers={
+            "Content-Type": "application/json",
+            "X-Telegram-Bot-Api-Secret-Token": secret_token,
+        },
+        method="POST",
+    )
+
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def main():
+    load_dotenv()
+
+    port = os.getenv('TELEGRAM_WEBHOOK_PORT', '8443')
+    path = os.getenv('TELEGRAM_WEBHOOK_PATH', 'telegram').strip('/')
+    scheme = "https" if os.getenv('TELEGRAM_WEBHOOK_CERT') else "http"
+
+    parser = argparse.ArgumentParser(description="Send a fake update to the local webhook")
+    parser.add_argument("text", help="Message text, e.g. /ping")
+    parser.add_argument("--chat-id", type=int, default=int(os.getenv('TELEGRAM_CHAT_ID', '0') or 0),
+                        help="Chat the bot replies to (defaults to TELEGRAM_CHAT_ID)")
+    parser.add_argument("--url", default=f"{scheme}://127.0.0.1:{port}/{path}", help="Webhook URL")
+    parser.add_argument("--secret", default=os.getenv('TELEGRAM_WEBHOOK_SECRET', ''), help="Webhook secret token")
+    parser.add_argument("--update-id", type=int, default=int(time.time()), help="Update ID to use")
+    args = parser.parse_args()
+
+    update = build_message_update(args.text, args.chat_id, args.update_id)
+    status = send_update(update, args.url, args.secret)
+
+    if status == 200:
+        print(f"✓ Update {args.update_id} delivered to {args.url}")
+    elif status == 403:
+        print("❌ Rejected: secret token does not match TELEGRAM_WEBHOOK_SECRET")
+        sys.exit(1)
+    else:
+        print(f"❌ Webhook answered with HTTP {status}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Turn spans written to TRACE_FILE into timelines
+Prints the slowest traces as a tree of stages with a time bar per span and
+a per-stage summary, or writes Chrome trace events (--chrome) to open in
+https://ui.perfetto.dev or chrome://tracing as a flame-style timeline
+
+Usage:
+    python src/scripts/trace_timeline.py data/traces.jsonl --name voice
+    python src/scripts/trace_timeline.py data/traces.jsonl --chrome voice.json --name voice
+"""
+
+import os
+import sys
+import json
+import math
+import argparse
+from typing import Any, Dict, List, Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from dotenv import load_dotenv
+
+BAR_WIDTH = 40
+
+
+def load_traces(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Read spans and group them by trace ID (unreadable lines are skipped)."""
+    traces: Dict[str, List[Dict[str, Any]]] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                span = json.loads(line)
+            except ValueError:
+                continue
+            traces.setdefault(span["trace_id"], []).append(span)
+
+    for spans in traces.values():
+        spans.sort(key=lambda span: span["start"])
+    return traces
+
+
+def root_of(spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """The span that started the trace (the earliest one if it was never written)."""
+    return next((span for span in spans if span["parent_id"] is None), spans[0])
+
+
+def select_traces(traces: Dict[str, List[Dict[str, Any]]], name: Optional[str], trace_id: Optional[str],
+                  slowest: int) -> List[List[Dict[str, Any]]]:
+    """Filter by root span name or trace ID prefix, slowest first."""
+    selected = [
+        spans for tid, spans in traces.items()
+        if (not trace_id or tid.startswith(trace_id)) and (not name or name in root_of(spans)["name"])
+    ]
+    selected.sort(key=lambda spans: root_of(spans)["duration"], reverse=True)
+    return selected[:slowest] if slowest else selected
+
+
+def print_tree(spans: List[Dict[str, Any]]):
+    """One trace as an indented tree with offset, duration and a bar on a shared time axis."""
+    root = root_of(spans)
+    begin = min(span["start"] for span in spans)
+    end = max(span["start"] + span["duration"] for span in spans)
+    scale = BAR_WIDTH / max(end - begin, 1e-9)
+
+    attributes = ", ".join(f"{key} {value}" for key, value in root["attributes"].items() if value is not None)
+    print(f"\n🔎 {root['name']}  {root['duration'] * 1000:.1f} ms  trace {root['trace_id']}"
+          + (f"  ({attributes})" if attributes else ""))
+
+    known = {span["span_id"] for span in spans}
+    children: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    for span in spans:
+        # Spans whose parent was not written (still running) hang off the top
+        parent = span["parent_id"] if span["parent_id"] in known else None
+        children.setdefault(parent, []).append(span)
+
+    def walk(span: Dict[str, Any], depth: int):
+        offset = span["start"] - begin
+        left = int(offset * scale)
+        width = max(1, int(math.ceil(span["duration"] * scale)))
+        bar = " " * left + "█" * min(width, BAR_WIDTH - left)
+        label = ("  " * depth + span["name"])[:44]
+        details = []
+        if span["thread"] and span["thread"] != root["thread"]:
+            details.append(span["thread"])
+        details.extend(f"{key}={value}" for key, value in span["attributes"].items()
+                       if value is not None and span is not root)
+        if span.get("error"):
+            details.append(f"❌ {span['error']}")
+
+        print(f"  {offset * 1000:>8.1f} {span['duration'] * 1000:>9.1f} ms  {label:<44} {bar:<{BAR_WIDTH}}"
+              + (f"  {' '.join(map(str, details))}" if details else ""))
+        for child in children.get(span["span_id"], []):
+            walk(child, depth + 1)
+
+    for top in children.get(None, []):
+        walk(top, 0)
+
+
+def print_stage_summary(selected: List[List[Dict[str, Any]]]):
+    """Count, average and p95 per span name, and their share of the traces' total time."""
+    stages: Dict[str, List[float]] = {}
+    total = 0.0
+    for spans in selected:
+        total += root_of(spans)["duration"]
+        for span in spans:
+            stages.setdefault(span["name"], []).append(span["duration"])
+
+    print(f"\n{'stage':<44} {'count':>6} {'avg ms':>9} {'p95 ms':>9} {'share':>6}")
+    print("-" * 78)
+    for name, durations in sorted(stages.items(), key=lambda item: sum(item[1]), reverse=True):
+        ordered = sorted(durations)
+        p95 = ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+        share = sum(durations) / total if total else 0.0
+        print(f"{name[:44]:<44} {len(durations):>6} {sum(durations) / len(durations) * 1000:>9.1f} "
+              f"{p95 * 1000:>9.1f} {share:>6.0%}")
+
+
+def chrome_events(selected: List[List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Chrome trace event format: one process row per trace, one thread row
+    per thread the trace ran on (event loop, Odoo pool threads).
+    """
+    events: List[Dict[str, Any]] = []
+    thread_ids: Dict[str, int] = {}
+
+    for pid, spans in enumerate(selected, 1):
+        root = root_of(spans)
+        update_id = root["attributes"].get("update_id")
+        process_name = f"{root['name']} ({root['duration'] * 1000:.0f} ms)" + (f" update {update_id}" if update_id else "")
+        events.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": process_name}})
+        events.append({"name": "process_sort_index", "ph": "M", "pid": pid, "args": {"sort_index": pid}})
+
+        named = set()
+        for span in spans:
+            tid = thread_ids.setdefault(span["thread"], len(thread_ids) + 1)
+            if tid not in named:
+                events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                               "args": {"name": span["thread"]}})
+                named.add(tid)
+
+            args = dict(span["attributes"], trace_id=span["trace_id"])
+            if span.get("error"):
+                args["error"] = span["error"]
+            events.append({
+                "name": span["name"],
+                "cat": root["name"],
+                "ph": "X",
+                "ts": span["start"] * 1_000_000,
+                "dur": span["duration"] * 1_000_000,
+                "pid": pid,
+                "tid": tid,
+                "args": args,
+            })
+
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def main():
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Show traces written to TRACE_FILE as timelines")
+    parser.add_argument("trace_file", nargs="?", default=os.getenv('TRACE_FILE'),
+                        help="JSON-lines trace file (defaults to TRACE_FILE)")
+    parser.add_argument("--name", help="Only traces whose root span contains this, e.g. voice or /summary")
+    parser.add_argument("--trace", help="Only the trace with this ID (prefix)")
+    parser.add_argument("--slowest", type=int, default=5, help="Show the N slowest traces (0 = all, default 5)")
+    parser.add_argument("--chrome", help="Write Chrome trace events to this file instead of printing")
+    args = parser.parse_args()
+
+    if not args.trace_file:
+        parser.error("no trace file given and TRACE_FILE is not set")
+    if not os.path.exists(args.trace_file):
+        print(f"❌ Trace file not found: {args.trace_file}")
+        sys.exit(1)
+
+    traces = load_traces(args.trace_file)
+    selected = select_traces(traces, args.name, args.trace, 0 if args.chrome else args.slowest)
+    if not selected:
+        print(f"⚠️  No matching traces in {args.trace_file} ({len(traces)} traces in total)")
+        sys.exit(1)
+
+    if args.chrome:
+        with open(args.chrome, "w") as f:
+            json.dump(chrome_events(selected), f)
+        print(f"✓ {len(selected)} traces written to {args.chrome}")
+        print("   Open it in https://ui.perfetto.dev or chrome://tracing")
+        return
+
+    print(f"📊 {len(selected)} slowest of {len(traces)} traces"
+          + (f" matching '{args.name}'" if args.name else "") + "  (offset ms, duration)")
+    for spans in selected:
+        print_tree(spans)
+    print_stage_summary(selected)
+
+
+if __name__ == "__main__":
+    main()
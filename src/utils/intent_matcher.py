@@ -0,0 +1,182 @@
+"""
+Local Intent Matcher
+Resolves obvious voice commands from keywords, synonyms and fuzzy matching
+before falling back to the LLM
+"""
+
+import re
+import difflib
+import threading
+from typing import Optional, Dict, List, Iterable, Tuple
+
+# Words that carry no intent ("please show me the status" -> "status")
+FILLER_WORDS = {
+    "a", "an", "the", "please", "can", "could", "would", "you", "me", "my", "i",
+    "want", "to", "show", "give", "get", "tell", "what", "whats", "s", "is",
+    "are", "do", "for", "of", "on", "now", "just", "hey", "bot", "okay", "ok",
+}
+
+# Spoken phrasings for each command, in addition to the command name itself
+DEFAULT_SYNONYMS: Dict[str, List[str]] = {
+    "status": ["system status", "how is the system", "health", "server status"],
+    "ping": ["are you alive", "are you there", "pong"],
+    "time": ["what time is it", "current time", "clock"],
+    "joke": ["tell me a joke", "make me laugh", "something funny"],
+    "hello": ["hi", "hey there", "greeting", "good morning"],
+    "test": ["run test", "run the test", "test script"],
+    "backup": ["run backup", "back up"],
+    "deploy": ["deployment", "run deployment"],
+    "showtime": ["show time", "recent entries", "time entries", "recent time entries"],
+    "timeweek": ["this week", "weekly summary", "week summary", "time week", "week"],
+    "timemonth": ["this month", "monthly summary", "month summary", "time month", "month"],
+    "summary": ["time summary", "comprehensive summary", "overview"],
+    "invoiced": ["invoices", "invoice", "invoice summary", "billing"],
+    "logtime": ["log time", "log hours", "track time", "book time", "record time"],
+}
+
+
+def normalize(text: str) -> List[str]:
+    """Lowercase, strip punctuation and split into words."""
+    return re.sub(r"[^\w\s]", " ", text.lower()).split()
+
+
+class IntentMatcher:
+    """
+    Keyword, synonym and fuzzy-match index over the bot's commands.
+
+    match() returns the best command with a confidence between 0 and 1:
+    exact phrases score 1.0, phrases contained in the sentence up to 0.9
+    (scaled by how many of the sentence's content words they explain),
+    misheard single words (fuzzy) their similarity capped at 0.85 (about
+    one wrong letter in six passes the default threshold) and plain
+    keyword overlap at most 0.6, so only confident matches skip the LLM.
+    """
+
+    def __init__(
+        self,
+        commands: Dict[str, str],
+        synonyms: Optional[Dict[str, List[str]]] = None,
+        threshold: float = 0.8
+    ):
+        """
+        Build the index.
+
+        Args:
+            commands: Mapping of command name to description
+            synonyms: Extra phrases per command (defaults to DEFAULT_SYNONYMS)
+            threshold: Minimum confidence for resolve() to accept a local match
+        """
+        self.threshold = threshold
+        synonyms = DEFAULT_SYNONYMS if synonyms is None else synonyms
+
+        # Phrase (as tuple of words) -> command
+        self.phrases: Dict[Tuple[str, ...], str] = {}
+        # Single word -> commands whose description mentions it
+        self.keywords: Dict[str, set] = {}
+
+        for command, description in commands.items():
+            for phrase in [command] + list(synonyms.get(command, [])):
+                words = tuple(normalize(phrase))
+                if words:
+                    self.phrases.setdefault(words, command)
+
+            for word in normalize(description):
+                if word not in FILLER_WORDS and len(word) > 2:
+                    self.keywords.setdefault(word, set()).add(command)
+
+        self._single_words = [words[0] for words in self.phrases if len(words) == 1]
+        self._max_phrase_length = max((len(words) for words in self.phrases), default=0)
+
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.llm_fallbacks = 0
+
+    def match(self, text: str) -> Tuple[Optional[str], float]:
+        """
+        Score text against the index.
+
+        Returns:
+            (command, confidence); command is None if nothing matched at all
+        """
+        words = normalize(text)
+        content = [w for w in words if w not in FILLER_WORDS]
+
+        if not content:
+            return None, 0.0
+
+        # Exact phrase, e.g. "status" or "what time is it"
+        for candidate in (tuple(words), tuple(content)):
+            if candidate in self.phrases:
+                return self.phrases[candidate], 1.0
+
+        # Longest phrase contained in the sentence, e.g. "show me a time summary"
+        found: Dict[str, Tuple[str, ...]] = {}
+        for length in range(min(self._max_phrase_length, len(words)), 0, -1):
+            for start in range(len(words) - length + 1):
+                phrase = tuple(words[start:start + length])
+                command = self.phrases.get(phrase)
+                if command:
+                    found.setdefault(command, phrase)
+            if found:
+                break
+
+        if len(found) == 1:
+            command, phrase = found.popitem()
+            # Penalize leftover content words ("log my time" is not "/time")
+            covered = sum(1 for word in content if word in phrase)
+            return command, round(0.9 * covered / len(content), 3)
+        if found:
+            # Two commands with equally specific phrases: let the LLM decide
+            return sorted(found)[0], 0.5
+
+        # Misheard single word, e.g. "statis" -> "status"
+        if len(content) == 1:
+            close = difflib.get_close_matches(content[0], self._single_words, n=2, cutoff=0.75)
+            if close:
+                ratios = [difflib.SequenceMatcher(None, content[0], word).ratio() for word in close]
+                command = self.phrases[(close[0],)]
+                # Nearly as close to another command's name: let the LLM decide
+                if len(close) > 1 and self.phrases[(close[1],)] != command and ratios[0] - ratios[1] < 0.05:
+                    return command, 0.5
+                return command, round(min(0.85, ratios[0]), 3)
+
+        # Keyword overlap with command descriptions
+        scores: Dict[str, int] = {}
+        for word in content:
+            for command in self.keywords.get(word, ()):
+                scores[command] = scores.get(command, 0) + 1
+
+        if scores:
+            command, score = max(sorted(scores.items()), key=lambda item: item[1])
+            return command, round(min(0.6, 0.6 * score / len(content)), 3)
+
+        return None, 0.0
+
+    def resolve(self, text: str) -> Optional[str]:
+        """Return the command if the local match is confident enough, counting hits and fallbacks."""
+        command, confidence = self.match(text)
+
+        with self._lock:
+            if command and confidence >= self.threshold:
+                self.local_hits += 1
+                return command
+            self.llm_fallbacks += 1
+            return None
+
+    def stats(self) -> Dict[str, float]:
+        """Return local hit and LLM fallback counters."""
+        with self._lock:
+            total = self.local_hits + self.llm_fallbacks
+            return {
+                "local_hits": self.local_hits,
+                "llm_fallbacks": self.llm_fallbacks,
+                "hit_rate": (self.local_hits / total) if total else 0.0,
+            }
+
+
+def build_intent_matcher(commands: Dict[str, str], command_names: Optional[Iterable[str]] = None, **kwargs) -> IntentMatcher:
+    """Build a matcher restricted to the commands that are actually wired up."""
+    if command_names is not None:
+        allowed = set(command_names)
+        commands = {name: desc for name, desc in commands.items() if name in allowed}
+    return IntentMatcher(commands, **kwargs)
@@ -0,0 +1,456 @@
+"""
+Metrics
+Latency histograms and error counters for update handlers, Odoo calls and
+OpenAI requests, served in the Prometheus text format on METRICS_PORT
+"""
+
+import os
+import time
+import bisect
+import threading
+import functools
+import contextvars
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .tracing import span
+
+# Upper bounds (seconds) of the latency buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """A monotonically increasing count per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def values(self) -> Dict[Tuple[str, ...], float]:
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {value:g}"
+            for key, value in sorted(self.values().items())
+        ]
+
+
+class Histogram:
+    """
+    Observations counted into fixed buckets per label combination, plus their
+    sum, so rates, averages and quantiles can be derived.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [count per bucket (last one is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe how long the block takes."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def snapshot(self) -> Dict[Tuple[str, ...], Dict[str, Any]]:
+        """{label values: {"count", "sum", "buckets": per-bucket counts}}"""
+        with self._lock:
+            return {
+                key: {"count": sum(counts), "sum": total, "buckets": list(counts)}
+                for key, (counts, total) in self._series.items()
+            }
+
+    def quantile(self, fraction: float, buckets: List[int]) -> float:
+        """
+        Estimate a quantile from bucket counts, interpolating linearly inside
+        the bucket (like Prometheus' histogram_quantile).
+
+        Args:
+            fraction: Quantile between 0 and 1
+            buckets: Per-bucket counts from snapshot()
+
+        Returns:
+            Seconds (the largest finite bound if the quantile is in the +Inf bucket)
+        """
+        total = sum(buckets)
+        if total == 0:
+            return 0.0
+
+        rank = fraction * total
+        seen = 0
+        for index, count in enumerate(buckets):
+            if seen + count >= rank and count:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                return lower + (self.buckets[index] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def render(self) -> List[str]:
+        lines = []
+        for key, data in sorted(self.snapshot().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), data["buckets"]):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound:g}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {data['sum']:.6f}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {data['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """All metrics of the process, rendered together for /metrics."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        """Create a counter (or return the one already registered under this name)."""
+        return self._register(Counter(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Create a histogram (or return the one already registered under this name)."""
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Get the process-wide metrics registry."""
+    return _registry
+
+
+HANDLER_LATENCY = _registry.histogram(
+    "bot_handler_duration_seconds", "Time spent in update handlers", ["handler"]
+)
+HANDLER_ERRORS = _registry.counter(
+    "bot_handler_errors_total", "Update handlers that raised", ["handler"]
+)
+ODOO_CALL_LATENCY = _registry.histogram(
+    "odoo_call_duration_seconds", "Run time of Odoo wrapper functions on the thread pool", ["function"]
+)
+ODOO_CALL_ERRORS = _registry.counter(
+    "odoo_call_errors_total", "Odoo wrapper calls that raised, timed out or returned an error message", ["function"]
+)
+ODOO_RPC_LATENCY = _registry.histogram(
+    "odoo_rpc_duration_seconds", "Odoo RPC round trips, by the wrapper function that made them", ["function"]
+)
+ODOO_RPC_ERRORS = _registry.counter(
+    "odoo_rpc_errors_total", "Odoo RPCs that raised", ["function"]
+)
+OPENAI_LATENCY = _registry.histogram(
+    "openai_request_duration_seconds", "OpenAI API requests, including retries", ["operation"]
+)
+OPENAI_ERRORS = _registry.counter(
+    "openai_request_errors_total", "OpenAI API requests that failed", ["operation"]
+)
+VOICE_INTENTS = _registry.counter(
+    "voice_intents_total", "Voice transcriptions resolved by the local intent matcher or the LLM", ["resolved_by"]
+)
+
+
+# ============================================
+# INSTRUMENTATION
+# ============================================
+
+def instrument_handler(callback: Callable, name: Optional[str] = None) -> Callable:
+    """
+    Wrap an async handler callback so its run time and exceptions are recorded,
+    and each update it handles starts a trace (when TRACE_FILE is set).
+
+    Args:
+        callback: Async function accepting (update, context)
+        name: Label in the metrics (defaults to the function name)
+
+    Returns:
+        The wrapped callback (returns whatever the callback returns, e.g. the next conversation state)
+    """
+    if getattr(callback, "_metrics_name", None):
+        return callback
+
+    label = name or callback.__name__
+
+    @functools.wraps(callback)
+    async def wrapper(update, context):
+        chat = getattr(update, "effective_chat", None)
+        started = time.perf_counter()
+        try:
+            with span(label, update_id=getattr(update, "update_id", None), chat_id=chat.id if chat else None):
+                return await callback(update, context)
+        except Exception:
+            HANDLER_ERRORS.inc(handler=label)
+            raise
+        finally:
+            HANDLER_LATENCY.observe(time.perf_counter() - started, handler=label)
+
+    wrapper._metrics_name = label
+    return wrapper
+
+
+def instrument_conversation(conversation) -> Any:
+    """
+    Instrument the entry points, state handlers and fallbacks of a
+    ConversationHandler, labelled "<conversation name>:<callback name>".
+
+    Args:
+        conversation: A telegram.ext.ConversationHandler
+
+    Returns:
+        The same ConversationHandler
+    """
+    prefix = conversation.name or "conversation"
+    handlers = list(conversation.entry_points) + list(conversation.fallbacks)
+    for state_handlers in conversation.states.values():
+        handlers.extend(state_handlers)
+
+    for handler in handlers:
+        callback = getattr(handler, "callback", None)
+        if callback is not None:
+            handler.callback = instrument_handler(callback, f"{prefix}:{callback.__name__}")
+
+    return conversation
+
+
+# Wrapper function whose RPCs are being made (set per Odoo call, visible in the pool thread)
+_odoo_function: contextvars.ContextVar[str] = contextvars.ContextVar("odoo_function", default="other")
+
+
+def measure_odoo_call(name: str, func: Callable, *args, **kwargs) -> Any:
+    """
+    Run an Odoo wrapper function, timing it and labelling the RPCs it makes.
+
+    Wrapper functions report most failures as "❌ ..." messages instead of
+    raising, so those count as errors too.
+    """
+    token = _odoo_function.set(name)
+    started = time.perf_counter()
+    try:
+        with span(f"odoo {name}"):
+            result = func(*args, **kwargs)
+    except Exception:
+        ODOO_CALL_ERRORS.inc(function=name)
+        raise
+    finally:
+        ODOO_CALL_LATENCY.observe(time.perf_counter() - started, function=name)
+        _odoo_function.reset(token)
+
+    if isinstance(result, str) and result.startswith("❌"):
+        ODOO_CALL_ERRORS.inc(function=name)
+    return result
+
+
+def _rpc_name(args: Sequence[Any]) -> str:
+    """model.method of an RPC, from ODOO.json(url, params) or env.execute(model, method, ...) arguments."""
+    if len(args) >= 2 and isinstance(args[1], dict) and "model" in args[1]:
+        return f"{args[1]['model']}.{args[1].get('method')}"
+    if len(args) >= 2 and isinstance(args[0], str) and isinstance(args[1], str):
+        return f"{args[0]}.{args[1]}"
+    return str(args[0]) if args else "call"
+
+
+def _metered_rpc(method: Callable) -> Callable:
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        function = _odoo_function.get()
+        started = time.perf_counter()
+        try:
+            with span(f"odoo rpc {_rpc_name(args)}"):
+                return method(*args, **kwargs)
+        except Exception:
+            ODOO_RPC_ERRORS.inc(function=function)
+            raise
+        finally:
+            ODOO_RPC_LATENCY.observe(time.perf_counter() - started, function=function)
+
+    wrapper._metered = True
+    return wrapper
+
+
+def instrument_odoo_client(client: Any) -> Any:
+    """
+    Time every RPC an authenticated Odoo client makes.
+
+    odoorpc sends every RPC through ODOO.json(); XML-RPC clients with an
+    odoorpc-style env (like the benchmark client) through env.execute().
+    Clients with neither are returned unchanged.
+
+    Args:
+        client: Client from the pool's factory (may be None)
+
+    Returns:
+        The same client
+    """
+    odoo = getattr(client, "odoo", None)
+    if odoo is None:
+        return client
+
+    for owner, attribute in ((odoo, "json"), (getattr(odoo, "env", None), "execute")):
+        method = getattr(owner, attribute, None)
+        if not callable(method):
+            continue
+        if not getattr(method, "_metered", False):
+            try:
+                setattr(owner, attribute, _metered_rpc(method))
+            except AttributeError:
+                continue
+        break
+
+    return client
+
+
+@contextmanager
+def measure_openai(operation: str) -> Iterator[None]:
+    """Time an OpenAI request (e.g. "transcription", "chat") and count failures."""
+    started = time.perf_counter()
+    try:
+        with span(f"openai {operation}"):
+            yield
+    except Exception:
+        OPENAI_ERRORS.inc(operation=operation)
+        raise
+    finally:
+        OPENAI_LATENCY.observe(time.perf_counter() - started, operation=operation)
+
+
+# ============================================
+# SUMMARIES AND EXPOSITION
+# ============================================
+
+def summarize(histogram: Histogram, errors: Optional[Counter] = None) -> List[Dict[str, Any]]:
+    """
+    Per-label totals of a histogram, busiest first.
+
+    Returns:
+        [{"label", "count", "errors", "avg", "p50", "p95"}] with times in seconds
+    """
+    error_counts = errors.values() if errors is not None else {}
+    rows = []
+    for key, data in histogram.snapshot().items():
+        rows.append({
+            "label": ",".join(key),
+            "count": data["count"],
+            "errors": int(error_counts.get(key, 0)),
+            "avg": data["sum"] / data["count"] if data["count"] else 0.0,
+            "p50": histogram.quantile(0.50, data["buckets"]),
+            "p95": histogram.quantile(0.95, data["buckets"]),
+        })
+    rows.sort(key=lambda row: row["count"], reverse=True)
+    return rows
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+
+        body = get_metrics().render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MetricsServer:
+    """Serves GET /metrics on a background thread."""
+
+    def __init__(self, port: Optional[int] = None, host: Optional[str] = None):
+        """
+        Initialize the server.
+
+        Args:
+            port: Port to listen on (reads METRICS_PORT)
+            host: Interface to listen on (reads METRICS_HOST, defaults to 127.0.0.1)
+        """
+        self.port = port if port is not None else int(os.getenv('METRICS_PORT') or 0)
+        self.host = host or os.getenv('METRICS_HOST', '127.0.0.1')
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start listening; raises OSError if the port is taken."""
+        if self._server is not None:
+            return
+
+        self._server = ThreadingHTTPServer((self.host, self.port), _MetricsRequestHandler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._server is None:
+            return
+
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
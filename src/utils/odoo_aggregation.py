@@ -0,0 +1,319 @@
+"""
+Odoo Aggregation Engine
+Fetches time and invoice data once for a covering date range and rolls it
+up locally into ISO weeks, months and quarters
+"""
+
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+TIMESHEET_MODEL = 'account.analytic.line'
+
+
+# ============================================
+# PERIOD HELPERS
+# ============================================
+
+def get_week_range(d: date) -> Tuple[date, date]:
+    """Return the Monday and Sunday of the ISO week containing d."""
+    week_start = d - timedelta(days=d.weekday())
+    return week_start, week_start + timedelta(days=6)
+
+
+def get_month_range(year: int, month: int) -> Tuple[date, date]:
+    """Return the first and last day of a month."""
+    month_start = date(year, month, 1)
+    if month == 12:
+        next_month = date(year + 1, 1, 1)
+    else:
+        next_month = date(year, month + 1, 1)
+    return month_start, next_month - timedelta(days=1)
+
+
+def get_quarter(d: date) -> int:
+    """Return the quarter (1-4) containing d."""
+    return (d.month - 1) // 3 + 1
+
+
+def get_quarter_range(year: int, quarter: int) -> Tuple[date, date]:
+    """Return the first and last day of a quarter."""
+    start_month = (quarter - 1) * 3 + 1
+    quarter_start = date(year, start_month, 1)
+    _, quarter_end = get_month_range(year, start_month + 2)
+    return quarter_start, quarter_end
+
+
+def last_weeks(today: date, count: int) -> List[Tuple[int, int, date, date]]:
+    """Return (year, week_number, start, end) for the current week and the previous count-1."""
+    weeks = []
+    for i in range(count):
+        week_date = today - timedelta(weeks=i)
+        week_start, week_end = get_week_range(week_date)
+        weeks.append((week_date.year, week_date.isocalendar()[1], week_start, week_end))
+    return weeks
+
+
+def last_months(today: date, count: int) -> List[Tuple[int, int, date, date]]:
+    """Return (year, month, start, end) for the current month and the previous count-1."""
+    months = []
+    year, month = today.year, today.month
+    for _ in range(count):
+        month_start, month_end = get_month_range(year, month)
+        months.append((year, month, month_start, month_end))
+        month -= 1
+        if month < 1:
+            month = 12
+            year -= 1
+    return months
+
+
+def last_quarters(today: date, count: int) -> List[Tuple[int, int, date, date]]:
+    """Return (year, quarter, start, end) for the current quarter and the previous count-1."""
+    quarters = []
+    year, quarter = today.year, get_quarter(today)
+    for _ in range(count):
+        quarter_start, quarter_end = get_quarter_range(year, quarter)
+        quarters.append((year, quarter, quarter_start, quarter_end))
+        quarter -= 1
+        if quarter < 1:
+            quarter = 4
+            year -= 1
+    return quarters
+
+
+# ============================================
+# DAILY TOTALS
+# ============================================
+
+def _parse_day(value: Any) -> Optional[date]:
+    """Parse an Odoo date value ('YYYY-MM-DD', possibly with a time part)."""
+    if isinstance(value, date):
+        return value
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+
+
+def fetch_daily_hours(client, company_id: int, start: date, end: date) -> Dict[date, float]:
+    """
+    Fetch hours per day for a date range in a single call.
+
+    Goes through client.get_time_entries(), so the totals count exactly the
+    lines the weekly and monthly reports count (the library decides the
+    user, employee and project filters), and sums them per day locally.
+
+    Args:
+        client: Authenticated OdooClient
+        company_id: Company to report on
+        start: First day (inclusive)
+        end: Last day (inclusive)
+
+    Returns:
+        Dict mapping each day that has entries to its total hours
+    """
+    daily: Dict[date, float] = {}
+
+    for entry in client.get_time_entries(start, end, company_id=company_id):
+        day = _parse_day(getattr(entry, 'date', None))
+        if day is not None:
+            daily[day] = daily.get(day, 0.0) + (float(entry.unit_amount) if entry.unit_amount else 0.0)
+
+    return daily
+
+
+# ============================================
+# ROLLUP
+# ============================================
+
+def rollup_daily_hours(daily: Dict[date, float]) -> Dict[str, Dict[Any, float]]:
+    """
+    Roll daily totals up into ISO weeks, months and quarters in one pass.
+
+    Returns:
+        Dict with 'weeks' keyed by week start (Monday), 'months' keyed by
+        (year, month) and 'quarters' keyed by (year, quarter)
+    """
+    weeks: Dict[date, float] = {}
+    months: Dict[Tuple[int, int], float] = {}
+    quarters: Dict[Tuple[int, int], float] = {}
+
+    for day, hours in daily.items():
+        week_key = day - timedelta(days=day.weekday())
+        month_key = (day.year, day.month)
+        quarter_key = (day.year, get_quarter(day))
+
+        weeks[week_key] = weeks.get(week_key, 0.0) + hours
+        months[month_key] = months.get(month_key, 0.0) + hours
+        quarters[quarter_key] = quarters.get(quarter_key, 0.0) + hours
+
+    return {"weeks": weeks, "months": months, "quarters": quarters}
+
+
+def summarize_time_periods(client, company_id: int, today: date, count: int = 4) -> Dict[str, List[Tuple]]:
+    """
+    Compute hours for the last weeks, months and quarters with a single fetch.
+
+    Args:
+        client: Authenticated OdooClient
+        company_id: Company to report on
+        today: Reference day (current period)
+        count: Number of periods per granularity, current one included
+
+    Returns:
+        Dict with 'weeks' as (year, week_number, hours),
+        'months' as (month_start, hours) and 'quarters' as (year, quarter, hours)
+    """
+    weeks = last_weeks(today, count)
+    months = last_months(today, count)
+    quarters = last_quarters(today, count)
+
+    # One range covering every requested period
+    range_start = min(weeks[-1][2], months[-1][2], quarters[-1][2])
+    range_end = max(weeks[0][3], months[0][3], quarters[0][3])
+
+    totals = rollup_daily_hours(fetch_daily_hours(client, company_id, range_start, range_end))
+
+    return {
+        "weeks": [
+            (year, week_num, totals["weeks"].get(week_start, 0.0))
+            for year, week_num, week_start, _ in weeks
+        ],
+        "months": [
+            (month_start, totals["months"].get((year, month), 0.0))
+            for year, month, month_start, _ in months
+        ],
+        "quarters": [
+            (year, quarter, totals["quarters"].get((year, quarter), 0.0))
+            for year, quarter, _, _ in quarters
+        ],
+    }
+
+
+# ============================================
+# INVOICES
+# ============================================
+
+INVOICE_MODEL = 'account.move'
+INVOICE_FIELDS = ['invoice_date', 'amount_untaxed', 'amount_residual', 'amount_total']
+
+
+def fetch_invoices(client, company_id: int, start: date, end: date) -> List[Dict[str, Any]]:
+    """
+    Fetch posted customer invoices for a date range in a single search_read.
+
+    Args:
+        client: Authenticated OdooClient
+        company_id: Company to report on
+        start: First invoice date (inclusive)
+        end: Last invoice date (inclusive)
+
+    Returns:
+        Rows with invoice_date, amount_untaxed, amount_residual and amount_total
+    """
+    invoice_domain = [
+        ('company_id', '=', company_id),
+        ('move_type', '=', 'out_invoice'),
+        ('invoice_date', '>=', start.isoformat()),
+        ('invoice_date', '<=', end.isoformat()),
+        ('state', '=', 'posted')
+    ]
+
+    return client.odoo.env[INVOICE_MODEL].search_read(invoice_domain, INVOICE_FIELDS)
+
+
+def prorate_paid_amounts(untaxed: List[float], residual: List[float], total: List[float]) -> List[float]:
+    """
+    Compute the paid share of each invoice's untaxed amount.
+
+    Takes the batch as parallel lists (one per field) and walks them once in
+    plain Python; a year of invoices is too small to justify numpy.
+
+    An invoice with amount_total 100, amount_residual 25 and amount_untaxed 80
+    is 75% paid, so 60 of its untaxed amount counts as paid.
+    """
+    return [
+        ((t - r) / t) * u if t > 0 else 0.0
+        for u, r, t in zip(untaxed, residual, total)
+    ]
+
+
+def rollup_invoices(rows: List[Dict[str, Any]]) -> Dict[str, Dict[Tuple[int, int], Tuple[float, float]]]:
+    """
+    Bucket invoice rows into months and quarters in one pass.
+
+    Returns:
+        Dict with 'months' keyed by (year, month) and 'quarters' keyed by
+        (year, quarter), each mapping to (invoiced, paid)
+    """
+    days = [_parse_day(row.get('invoice_date')) for row in rows]
+    untaxed = [float(row.get('amount_untaxed') or 0.0) for row in rows]
+    residual = [float(row.get('amount_residual') or 0.0) for row in rows]
+    total = [float(row.get('amount_total') or 0.0) for row in rows]
+    paid = prorate_paid_amounts(untaxed, residual, total)
+
+    months: Dict[Tuple[int, int], Tuple[float, float]] = {}
+    quarters: Dict[Tuple[int, int], Tuple[float, float]] = {}
+
+    for day, invoiced_amount, paid_amount in zip(days, untaxed, paid):
+        if day is None:
+            continue
+
+        month_key = (day.year, day.month)
+        quarter_key = (day.year, get_quarter(day))
+
+        invoiced, paid_so_far = months.get(month_key, (0.0, 0.0))
+        months[month_key] = (invoiced + invoiced_amount, paid_so_far + paid_amount)
+
+        invoiced, paid_so_far = quarters.get(quarter_key, (0.0, 0.0))
+        quarters[quarter_key] = (invoiced + invoiced_amount, paid_so_far + paid_amount)
+
+    return {"months": months, "quarters": quarters}
+
+
+def summarize_invoice_periods(
+    client,
+    company_id: int,
+    today: date,
+    month_count: int = 3,
+    quarter_count: int = 4
+) -> Dict[str, List[Tuple]]:
+    """
+    Compute invoiced and paid amounts per month and quarter with a single fetch.
+
+    Args:
+        client: Authenticated OdooClient
+        company_id: Company to report on
+        today: Reference day (current period)
+        month_count: Number of months, current one included
+        quarter_count: Number of quarters, current one included
+
+    Returns:
+        Dict with 'months' as (month_start, invoiced, paid, paid_percentage)
+        and 'quarters' as (year, quarter, invoiced, paid, paid_percentage)
+    """
+    months = last_months(today, month_count)
+    quarters = last_quarters(today, quarter_count)
+
+    # One window covering every month and quarter (12 months for 4 quarters)
+    range_start = min(months[-1][2], quarters[-1][2])
+    range_end = max(months[0][3], quarters[0][3])
+
+    totals = rollup_invoices(fetch_invoices(client, company_id, range_start, range_end))
+
+    def with_percentage(invoiced: float, paid: float) -> Tuple[float, float, float]:
+        percentage_paid = (paid / invoiced * 100) if invoiced > 0 else 0.0
+        return invoiced, paid, percentage_paid
+
+    return {
+        "months": [
+            (month_start, *with_percentage(*totals["months"].get((year, month), (0.0, 0.0))))
+            for year, month, month_start, _ in months
+        ],
+        "quarters": [
+            (year, quarter, *with_percentage(*totals["quarters"].get((year, quarter), (0.0, 0.0))))
+            for year, quarter, _, _ in quarters
+        ],
+    }
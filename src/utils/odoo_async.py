@@ -0,0 +1,183 @@
+"""
+Async Odoo Facade
+Runs the synchronous odoo_time_wrapper functions on a bounded thread pool
+so async Telegram handlers never block the event loop
+"""
+
+import os
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Callable, Any, List, Dict, Tuple
+
+from .metrics import ODOO_CALL_ERRORS, measure_odoo_call
+
+# Seconds before an Odoo call is abandoned
+DEFAULT_TIMEOUT = float(os.getenv('ODOO_CALL_TIMEOUT', '30'))
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get the shared Odoo thread pool (sized by ODOO_MAX_WORKERS, defaults to 4)."""
+    global _executor
+
+    if _executor is None:
+        max_workers = int(os.getenv('ODOO_MAX_WORKERS', '4'))
+        _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="odoo")
+
+    return _executor
+
+
+def shutdown_executor(wait: bool = False):
+    """Stop the Odoo thread pool; pending calls that have not started are cancelled."""
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=wait, cancel_futures=True)
+        _executor = None
+
+
+async def run_odoo_call(func: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+    """
+    Run a blocking Odoo function on the shared thread pool.
+
+    Args:
+        func: Synchronous function to run
+        *args: Positional arguments for func
+        timeout: Seconds to wait (defaults to ODOO_CALL_TIMEOUT, 30s)
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Whatever func returns
+
+    Raises:
+        TimeoutError: If the call did not finish in time. A call that has not
+            started yet is cancelled; one already running finishes in the
+            background and its result is discarded.
+    """
+    loop = asyncio.get_running_loop()
+    timeout = DEFAULT_TIMEOUT if timeout is None else timeout
+
+    # Keep context variables (e.g. the current update) visible in the worker thread
+    name = getattr(func, '__name__', 'other')
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, measure_odoo_call, name, func, *args, **kwargs)
+
+    future = loop.run_in_executor(get_executor(), call)
+
+    try:
+        return await asyncio.wait_for(future, timeout=timeout)
+    except asyncio.TimeoutError:
+        ODOO_CALL_ERRORS.inc(function=name)
+        raise TimeoutError(f"Odoo did not respond within {timeout:g}s") from None
+
+
+def _wrapper():
+    # Imported lazily: odoo_time_wrapper needs odoo-logger on the path
+    from . import odoo_time_wrapper
+    return odoo_time_wrapper
+
+
+async def get_recent_time_entries(limit: int = 5, timeout: Optional[float] = None) -> str:
+    """Async version of odoo_time_wrapper.get_recent_time_entries."""
+    return await run_odoo_call(_wrapper().get_recent_time_entries, limit=limit, timeout=timeout)
+
+
+async def get_weekly_summary(timeout: Optional[float] = None) -> str:
+    """Async version of odoo_time_wrapper.get_weekly_summary."""
+    return await run_odoo_call(_wrapper().get_weekly_summary, timeout=timeout)
+
+
+async def get_monthly_summary(timeout: Optional[float] = None) -> str:
+    """Async version of odoo_time_wrapper.get_monthly_summary."""
+    return await run_odoo_call(_wrapper().get_monthly_summary, timeout=timeout)
+
+
+async def get_time_summary_tables(timeout: Optional[float] = None) -> str:
+    """Async version of odoo_time_wrapper.get_time_summary_tables."""
+    return await run_odoo_call(_wrapper().get_time_summary_tables, timeout=timeout)
+
+
+async def get_invoice_summary(timeout: Optional[float] = None) -> str:
+    """Async version of odoo_time_wrapper.get_invoice_summary."""
+    return await run_odoo_call(_wrapper().get_invoice_summary, timeout=timeout)
+
+
+async def get_projects_list(company_id: Optional[int] = None, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+    """Async version of odoo_time_wrapper.get_projects_list."""
+    return await run_odoo_call(_wrapper().get_projects_list, company_id, timeout=timeout)
+
+
+async def find_projects(
+    query: str,
+    limit: int = 20,
+    offset: int = 0,
+    timeout: Optional[float] = None
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Async version of odoo_time_wrapper.find_projects (loads projects from Odoo on a cold cache)."""
+    return await run_odoo_call(_wrapper().find_projects, query, limit, offset=offset, timeout=timeout)
+
+
+async def get_project(project_id: int, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """Async version of odoo_time_wrapper.get_project."""
+    return await run_odoo_call(_wrapper().get_project, project_id, timeout=timeout)
+
+
+async def find_tasks(
+    project_id: int,
+    query: str,
+    limit: int = 20,
+    offset: int = 0,
+    timeout: Optional[float] = None
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Async version of odoo_time_wrapper.find_tasks."""
+    return await run_odoo_call(_wrapper().find_tasks, project_id, query, limit, offset=offset, timeout=timeout)
+
+
+async def get_task(project_id: int, task_id: int, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """Async version of odoo_time_wrapper.get_task."""
+    return await run_odoo_call(_wrapper().get_task, project_id, task_id, timeout=timeout)
+
+
+async def get_tasks_page(
+    project_id: int,
+    page: int = 0,
+    page_size: int = 10,
+    timeout: Optional[float] = None
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Async version of odoo_time_wrapper.get_tasks_page, by page number."""
+    return await run_odoo_call(
+        _wrapper().get_tasks_page, project_id, page * page_size, page_size, timeout=timeout
+    )
+
+
+async def get_tasks_list(project_id: int, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+    """Async version of odoo_time_wrapper.get_tasks_list."""
+    return await run_odoo_call(_wrapper().get_tasks_list, project_id, timeout=timeout)
+
+
+async def log_time_entry(
+    project_id: int,
+    task_id: int,
+    description: str,
+    hours: float,
+    log_date: Optional[str] = None,
+    timeout: Optional[float] = None
+) -> str:
+    """Async version of odoo_time_wrapper.log_time_entry."""
+    return await run_odoo_call(
+        _wrapper().log_time_entry,
+        project_id=project_id,
+        task_id=task_id,
+        description=description,
+        hours=hours,
+        log_date=log_date,
+        timeout=timeout
+    )
+
+
+async def warm_up_reference_data(timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Async version of odoo_time_wrapper.warm_up_reference_data (defaults to a 120s timeout)."""
+    return await run_odoo_call(_wrapper().warm_up_reference_data, timeout=timeout or 120)
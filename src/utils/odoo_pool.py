@@ -0,0 +1,216 @@
+"""
+Odoo Client Pool
+Keeps authenticated Odoo clients alive and shares them across wrapper calls
+"""
+
+import os
+import time
+import threading
+from contextlib import contextmanager
+from typing import Optional, Callable, Any, List, Iterator
+
+
+class _PooledClient:
+    """An authenticated client plus the bookkeeping the pool needs."""
+
+    def __init__(self, client: Any, generation: int):
+        self.client = client
+        self.generation = generation
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class OdooClientPool:
+    """
+    A process-wide pool of authenticated Odoo clients.
+
+    Clients are created lazily through ``factory`` (which performs the login),
+    handed out exclusively via ``session()`` and returned afterwards so the
+    next caller reuses the same authenticated connection. A client that raised
+    while in use is discarded, so an expired session is re-authenticated on
+    the next checkout. Idle clients are health-checked before reuse.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Optional[Any]],
+        max_size: Optional[int] = None,
+        health_check_interval: Optional[float] = None,
+        max_lifetime: Optional[float] = None,
+        health_check: Optional[Callable[[Any], bool]] = None,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            factory: Callable returning a new authenticated client (or None if not configured)
+            max_size: Maximum number of clients (reads ODOO_POOL_MAX_SIZE, defaults to 4)
+            health_check_interval: Seconds a client may sit idle before it is
+                health-checked on checkout (reads ODOO_POOL_HEALTH_CHECK_INTERVAL, defaults to 300)
+            max_lifetime: Seconds after which a client is re-created
+                (reads ODOO_POOL_MAX_LIFETIME, defaults to 3600)
+            health_check: Callable returning True if a client is still usable
+        """
+        self.factory = factory
+        self.max_size = max_size or int(os.getenv('ODOO_POOL_MAX_SIZE', '4'))
+        self.health_check_interval = (
+            health_check_interval if health_check_interval is not None
+            else float(os.getenv('ODOO_POOL_HEALTH_CHECK_INTERVAL', '300'))
+        )
+        self.max_lifetime = (
+            max_lifetime if max_lifetime is not None
+            else float(os.getenv('ODOO_POOL_MAX_LIFETIME', '3600'))
+        )
+        self.health_check = health_check or default_health_check
+
+        self._idle: List[_PooledClient] = []
+        self._size = 0
+        self._generation = 0
+        self._condition = threading.Condition()
+
+    def _acquire(self, timeout: Optional[float]) -> Optional[_PooledClient]:
+        """Take an idle client, create a new one, or wait for one to be released."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._condition:
+            while True:
+                if self._idle:
+                    pooled = self._idle.pop()
+                    break
+
+                if self._size < self.max_size:
+                    self._size += 1
+                    pooled = None
+                    break
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"No Odoo client available after {timeout}s (pool size {self.max_size})")
+                self._condition.wait(remaining)
+
+        if pooled is not None and self._is_usable(pooled):
+            return pooled
+
+        if pooled is not None:
+            # The stale client's slot goes to its replacement
+            self._logout(pooled)
+
+        # Slot is reserved: authenticate outside the lock
+        try:
+            client = self.factory()
+        except Exception:
+            self._release_slot()
+            raise
+
+        if client is None:
+            self._release_slot()
+            return None
+
+        return _PooledClient(client, self._generation)
+
+    def _is_usable(self, pooled: _PooledClient) -> bool:
+        """Check lifetime and, for long-idle clients, run the health check."""
+        now = time.monotonic()
+
+        if self.max_lifetime and now - pooled.created_at > self.max_lifetime:
+            return False
+
+        if now - pooled.last_used < self.health_check_interval:
+            return True
+
+        try:
+            return bool(self.health_check(pooled.client))
+        except Exception:
+            return False
+
+    def _release(self, pooled: _PooledClient):
+        """Return a healthy client to the pool."""
+        pooled.last_used = time.monotonic()
+        with self._condition:
+            if pooled.generation == self._generation:
+                self._idle.append(pooled)
+                self._condition.notify()
+                return
+
+        self._close(pooled)
+
+    def _release_slot(self):
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    def _logout(self, pooled: _PooledClient):
+        """Drop a client without freeing its slot."""
+        logout = getattr(getattr(pooled.client, 'odoo', None), 'logout', None)
+        if callable(logout):
+            try:
+                logout()
+            except Exception:
+                pass
+
+    def _close(self, pooled: _PooledClient):
+        """Drop a client and free its slot."""
+        self._logout(pooled)
+        self._release_slot()
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = 30.0) -> Iterator[Optional[Any]]:
+        """
+        Check out an authenticated client for exclusive use.
+
+        Yields None if the factory could not build a client (missing configuration).
+        If the body raises, the client is discarded so the next checkout
+        re-authenticates instead of reusing a possibly expired session.
+
+        Example:
+            with pool.session() as client:
+                if client:
+                    client.get_companies()
+        """
+        pooled = self._acquire(timeout)
+
+        if pooled is None:
+            yield None
+            return
+
+        try:
+            yield pooled.client
+        except BaseException:
+            self._close(pooled)
+            raise
+        else:
+            self._release(pooled)
+
+    def clear(self):
+        """Close all idle clients; clients in use are dropped when returned."""
+        with self._condition:
+            self._generation += 1
+            idle, self._idle = self._idle, []
+
+        for pooled in idle:
+            self._close(pooled)
+
+    def stats(self) -> dict:
+        """Return pool usage counters."""
+        with self._condition:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "max_size": self.max_size,
+            }
+
+
+def default_health_check(client: Any) -> bool:
+    """
+    Cheap liveness probe for an OdooClient.
+
+    Reads the current user id back from the server, which fails if the
+    session expired or the connection was dropped.
+    """
+    odoo = getattr(client, 'odoo', None)
+    if odoo is None:
+        return True
+
+    uid = odoo.env.uid
+    return bool(odoo.env['res.users'].search([('id', '=', uid)], limit=1))
@@ -5,26 +5,46 @@ Provides simplified interface to show recent time entries
 
 import sys
 import os
+import threading
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Callable
+
+from .odoo_pool import OdooClientPool
+from .metrics import instrument_odoo_client
+from .ttl_cache import TTLCache
+from .odoo_aggregation import TIMESHEET_MODEL, summarize_time_periods, summarize_invoice_periods
+from .project_search import ProjectSearchIndex, ProjectUsage
 
 # Add odoo-logger to path
-ODOO_LOGGER_PATH = "/Users/quentin/Projects/odoo-logger"
+ODOO_LOGGER_PATH = os.getenv('ODOO_LOGGER_PATH', "/Users/quentin/Projects/odoo-logger")
 TIME_LOGGER_PATH = os.path.join(ODOO_LOGGER_PATH, "src", "time_logger")
 if ODOO_LOGGER_PATH not in sys.path:
     sys.path.insert(0, ODOO_LOGGER_PATH)
 if TIME_LOGGER_PATH not in sys.path:
     sys.path.insert(0, TIME_LOGGER_PATH)
 
-# Import from main module
-import main as odoo_main
-OdooClient = odoo_main.OdooClient
-load_env_config = odoo_main.load_env_config
-select_company = odoo_main.select_company
+# Import from main module (missing odoo-logger only disables the default client factory)
+try:
+    import main as odoo_main
+    OdooClient = odoo_main.OdooClient
+    load_env_config = odoo_main.load_env_config
+    select_company = odoo_main.select_company
+except (ImportError, AttributeError):
+    odoo_main = None
+    OdooClient = Any
 
 
 def get_odoo_client() -> Optional[OdooClient]:
-    """Get authenticated Odoo client."""
+    """
+    Create a new authenticated Odoo client.
+
+    Every call logs in again; wrapper functions should use odoo_session()
+    to reuse pooled clients instead.
+    """
+    if odoo_main is None:
+        print(f"Error connecting to Odoo: odoo-logger not found at {ODOO_LOGGER_PATH}")
+        return None
+
     try:
         # Load .env file from odoo-logger directory
         from dotenv import load_dotenv
@@ -66,6 +86,106 @@ def get_odoo_client() -> Optional[OdooClient]:
         return None
 
 
+def _metered(factory: Callable[[], Optional[Any]]) -> Callable[[], Optional[Any]]:
+    """Make every client the factory logs in report its RPCs to the metrics."""
+    def create():
+        return instrument_odoo_client(factory())
+    return create
+
+
+# Shared authenticated clients for all wrapper functions
+_odoo_pool = OdooClientPool(factory=_metered(get_odoo_client))
+
+
+def odoo_session():
+    """
+    Check out a pooled, authenticated Odoo client.
+
+    Use as a context manager; yields None if Odoo is not configured.
+    The client goes back to the pool afterwards instead of logging in again.
+    """
+    return _odoo_pool.session()
+
+
+def get_odoo_pool() -> OdooClientPool:
+    """Get the process-wide Odoo client pool."""
+    return _odoo_pool
+
+
+def set_odoo_client_factory(factory: Callable[[], Optional[Any]]):
+    """
+    Replace the function the pool uses to log in (e.g. a client for a local
+    test server); pooled clients from the previous factory are dropped.
+
+    Args:
+        factory: Callable returning a new authenticated client (or None if not configured)
+    """
+    _odoo_pool.factory = _metered(factory)
+    _odoo_pool.clear()
+
+
+# Reference data that changes a few times a day (TTLs in seconds)
+_companies_cache = TTLCache(
+    "companies",
+    ttl=float(os.getenv('ODOO_CACHE_TTL_COMPANIES', '3600')),
+    max_size=4
+)
+_projects_cache = TTLCache(
+    "projects",
+    ttl=float(os.getenv('ODOO_CACHE_TTL_PROJECTS', '900')),
+    max_size=int(os.getenv('ODOO_CACHE_MAX_PROJECT_LISTS', '16'))
+)
+_tasks_cache = TTLCache(
+    "tasks",
+    ttl=float(os.getenv('ODOO_CACHE_TTL_TASKS', '300')),
+    max_size=int(os.getenv('ODOO_CACHE_MAX_TASK_LISTS', '256'))
+)
+# Task names by (project_id, task_id), for tasks looked up one at a time
+_task_names_cache = TTLCache(
+    "tasknames",
+    ttl=float(os.getenv('ODOO_CACHE_TTL_TASKS', '300')),
+    max_size=int(os.getenv('ODOO_CACHE_MAX_TASK_NAMES', '4096'))
+)
+ODOO_CACHES = [_companies_cache, _projects_cache, _tasks_cache, _task_names_cache]
+
+# Project search indexes per company, rebuilt when the projects cache refreshes
+_project_indexes: Dict[Optional[int], ProjectSearchIndex] = {}
+_task_indexes: Dict[int, ProjectSearchIndex] = {}
+_project_indexes_lock = threading.Lock()
+_project_usage = ProjectUsage()
+
+
+def get_cached_companies(client) -> List[Dict[str, Any]]:
+    """Get the user's companies as {"id", "name"} dicts, cached."""
+    return _companies_cache.get_or_load(
+        "companies",
+        lambda: [{"id": c.id, "name": c.name} for c in client.get_companies()]
+    )
+
+
+def invalidate_odoo_caches(project_id: Optional[int] = None):
+    """
+    Invalidate cached reference data after a write.
+
+    Args:
+        project_id: Project whose task list should be dropped (all projects lists are always dropped)
+    """
+    _projects_cache.clear()
+    if project_id is not None:
+        _tasks_cache.invalidate(project_id)
+
+
+def flush_odoo_caches():
+    """Drop every cached company, project and task list."""
+    for cache in ODOO_CACHES:
+        cache.clear()
+
+
+def get_odoo_cache_stats() -> List[Dict[str, Any]]:
+    """Get size and hit/miss counters for each Odoo cache."""
+    return [cache.stats() for cache in ODOO_CACHES]
+
+
 def format_time_entry(entry) -> str:
     """Format a single time entry as a string."""
     date = str(entry.date) if entry.date else "No date"
@@ -88,41 +208,40 @@ def get_recent_time_entries(limit: int = 5) -> str:
         Formatted string with time entries or error message
     """
     try:
-        client = get_odoo_client()
+        with odoo_session() as client:
+            if not client:
+                return f"❌ Could not connect to Odoo. Please check your configuration at:\n{ODOO_LOGGER_PATH}/.env"
 
-        if not client:
-            return "❌ Could not connect to Odoo. Please check your configuration at:\n/Users/quentin/Projects/odoo-logger/.env"
+            # Get all companies and select first one (or you can add company selection later)
+            companies = get_cached_companies(client)
 
-        # Get all companies and select first one (or you can add company selection later)
-        companies = client.get_companies()
+            if not companies:
+                return "❌ No companies found in your Odoo instance."
 
-        if not companies:
-            return "❌ No companies found in your Odoo instance."
+            # Use first company for now
+            company_id = companies[0]["id"]
+            company_name = companies[0]["name"]
 
-        # Use first company for now
-        company_id = companies[0].id
-        company_name = companies[0].name
+            # Get recent entries
+            entries = client.get_recent_entries(limit=limit, company_id=company_id)
 
-        # Get recent entries
-        entries = client.get_recent_entries(limit=limit, company_id=company_id)
+            if not entries:
+                return f"📊 No recent time entries found for {company_name}"
 
-        if not entries:
-            return f"📊 No recent time entries found for {company_name}"
+            # Format response
+            result = f"📊 *Recent Time Entries* ({company_name})\n"
+            result += "=" * 40 + "\n\n"
 
-        # Format response
-        result = f"📊 *Recent Time Entries* ({company_name})\n"
-        result += "=" * 40 + "\n\n"
+            for i, entry in enumerate(entries, 1):
+                result += f"*Entry {i}:*\n"
+                result += format_time_entry(entry)
+                result += "\n" + "-" * 40 + "\n\n"
 
-        for i, entry in enumerate(entries, 1):
-            result += f"*Entry {i}:*\n"
-            result += format_time_entry(entry)
-            result += "\n" + "-" * 40 + "\n\n"
-
-        # Calculate total hours
-        total_hours = sum(float(e.unit_amount) if e.unit_amount else 0.0 for e in entries)
-        result += f"*Total: {total_hours:.2f}h*"
+            # Calculate total hours
+            total_hours = sum(float(e.unit_amount) if e.unit_amount else 0.0 for e in entries)
+            result += f"*Total: {total_hours:.2f}h*"
 
-        return result
+            return result
 
     except Exception as e:
         return f"❌ Error fetching time entries: {str(e)}"
@@ -133,58 +252,57 @@ def get_weekly_summary() -> str:
     try:
         from datetime import date, timedelta
 
-        client = get_odoo_client()
-
-        if not client:
-            return "❌ Could not connect to Odoo."
+        with odoo_session() as client:
+            if not client:
+                return "❌ Could not connect to Odoo."
 
-        companies = client.get_companies()
-        if not companies:
-            return "❌ No companies found."
+            companies = get_cached_companies(client)
+            if not companies:
+                return "❌ No companies found."
 
-        company_id = companies[0].id
-        company_name = companies[0].name
+            company_id = companies[0]["id"]
+            company_name = companies[0]["name"]
 
-        # Get this week's date range
-        today = date.today()
-        week_start = today - timedelta(days=today.weekday())
-        week_end = week_start + timedelta(days=6)
+            # Get this week's date range
+            today = date.today()
+            week_start = today - timedelta(days=today.weekday())
+            week_end = week_start + timedelta(days=6)
 
-        # Fetch entries
-        entries = client.get_time_entries(week_start, week_end, company_id=company_id)
+            # Fetch entries
+            entries = client.get_time_entries(week_start, week_end, company_id=company_id)
 
-        if not entries:
-            return f"📊 No time entries for this week\n({week_start} to {week_end})"
+            if not entries:
+                return f"📊 No time entries for this week\n({week_start} to {week_end})"
 
-        # Calculate totals by project
-        project_hours = {}
-        total_hours = 0.0
+            # Calculate totals by project
+            project_hours = {}
+            total_hours = 0.0
 
-        for entry in entries:
-            project_name = str(entry.project_id.name) if entry.project_id else 'No Project'
-            hours = float(entry.unit_amount) if entry.unit_amount else 0.0
+            for entry in entries:
+                project_name = str(entry.project_id.name) if entry.project_id else 'No Project'
+                hours = float(entry.unit_amount) if entry.unit_amount else 0.0
 
-            if project_name not in project_hours:
-                project_hours[project_name] = 0.0
+                if project_name not in project_hours:
+                    project_hours[project_name] = 0.0
 
-            project_hours[project_name] += hours
-            total_hours += hours
+                project_hours[project_name] += hours
+                total_hours += hours
 
-        # Format response
-        result = f"📊 *Week Summary* ({company_name})\n"
-        result += f"📅 {week_start} to {week_end}\n"
-        result += "=" * 40 + "\n\n"
+            # Format response
+            result = f"📊 *Week Summary* ({company_name})\n"
+            result += f"📅 {week_start} to {week_end}\n"
+            result += "=" * 40 + "\n\n"
 
-        # Sort projects by hours (descending)
-        sorted_projects = sorted(project_hours.items(), key=lambda x: x[1], reverse=True)
+            # Sort projects by hours (descending)
+            sorted_projects = sorted(project_hours.items(), key=lambda x: x[1], reverse=True)
 
-        for project, hours in sorted_projects:
-            result += f"📁 {project}: *{hours:.2f}h*\n"
+            for project, hours in sorted_projects:
+                result += f"📁 {project}: *{hours:.2f}h*\n"
 
-        result += "\n" + "=" * 40 + "\n"
-        result += f"*Total: {total_hours:.2f}h*"
+            result += "\n" + "=" * 40 + "\n"
+            result += f"*Total: {total_hours:.2f}h*"
 
-        return result
+            return result
 
     except Exception as e:
         return f"❌ Error fetching weekly summary: {str(e)}"
@@ -195,59 +313,58 @@ def get_monthly_summary() -> str:
     try:
         from datetime import date, timedelta
 
-        client = get_odoo_client()
-
-        if not client:
-            return "❌ Could not connect to Odoo."
+        with odoo_session() as client:
+            if not client:
+                return "❌ Could not connect to Odoo."
 
-        companies = client.get_companies()
-        if not companies:
-            return "❌ No companies found."
+            companies = get_cached_companies(client)
+            if not companies:
+                return "❌ No companies found."
 
-        company_id = companies[0].id
-        company_name = companies[0].name
+            company_id = companies[0]["id"]
+            company_name = companies[0]["name"]
 
-        # Get this month's date range
-        today = date.today()
-        month_start = today.replace(day=1)
-        next_month = today.replace(day=28) + timedelta(days=4)
-        month_end = next_month.replace(day=1) - timedelta(days=1)
+            # Get this month's date range
+            today = date.today()
+            month_start = today.replace(day=1)
+            next_month = today.replace(day=28) + timedelta(days=4)
+            month_end = next_month.replace(day=1) - timedelta(days=1)
 
-        # Fetch entries
-        entries = client.get_time_entries(month_start, month_end, company_id=company_id)
+            # Fetch entries
+            entries = client.get_time_entries(month_start, month_end, company_id=company_id)
 
-        if not entries:
-            return f"📊 No time entries for this month\n({month_start} to {month_end})"
+            if not entries:
+                return f"📊 No time entries for this month\n({month_start} to {month_end})"
 
-        # Calculate totals by project
-        project_hours = {}
-        total_hours = 0.0
+            # Calculate totals by project
+            project_hours = {}
+            total_hours = 0.0
 
-        for entry in entries:
-            project_name = str(entry.project_id.name) if entry.project_id else 'No Project'
-            hours = float(entry.unit_amount) if entry.unit_amount else 0.0
+            for entry in entries:
+                project_name = str(entry.project_id.name) if entry.project_id else 'No Project'
+                hours = float(entry.unit_amount) if entry.unit_amount else 0.0
 
-            if project_name not in project_hours:
-                project_hours[project_name] = 0.0
+                if project_name not in project_hours:
+                    project_hours[project_name] = 0.0
 
-            project_hours[project_name] += hours
-            total_hours += hours
+                project_hours[project_name] += hours
+                total_hours += hours
 
-        # Format response
-        result = f"📊 *Month Summary* ({company_name})\n"
-        result += f"📅 {month_start.strftime('%B %Y')}\n"
-        result += "=" * 40 + "\n\n"
+            # Format response
+            result = f"📊 *Month Summary* ({company_name})\n"
+            result += f"📅 {month_start.strftime('%B %Y')}\n"
+            result += "=" * 40 + "\n\n"
 
-        # Sort projects by hours (descending)
-        sorted_projects = sorted(project_hours.items(), key=lambda x: x[1], reverse=True)
+            # Sort projects by hours (descending)
+            sorted_projects = sorted(project_hours.items(), key=lambda x: x[1], reverse=True)
 
-        for project, hours in sorted_projects:
-            result += f"📁 {project}: *{hours:.2f}h*\n"
+            for project, hours in sorted_projects:
+                result += f"📁 {project}: *{hours:.2f}h*\n"
 
-        result += "\n" + "=" * 40 + "\n"
-        result += f"*Total: {total_hours:.2f}h*"
+            result += "\n" + "=" * 40 + "\n"
+            result += f"*Total: {total_hours:.2f}h*"
 
-        return result
+            return result
 
     except Exception as e:
         return f"❌ Error fetching monthly summary: {str(e)}"
@@ -261,370 +378,382 @@ def get_time_summary_tables() -> str:
         Formatted markdown tables with time data or error message
     """
     try:
-        from datetime import date, timedelta
+        from datetime import date
+
+        with odoo_session() as client:
+            if not client:
+                return "❌ Could not connect to Odoo. Please check your configuration."
+
+            companies = get_cached_companies(client)
+            if not companies:
+                return "❌ No companies found."
+
+            company_id = companies[0]["id"]
+            company_name = companies[0]["name"]
+
+            today = date.today()
+
+            # Expected hours
+            EXPECTED_WEEK_HOURS = 40.0
+            EXPECTED_MONTH_HOURS = 160.0
+            EXPECTED_QUARTER_HOURS = 480.0
+
+            # Current + previous 3 weeks, months and quarters from a single fetch
+            periods = summarize_time_periods(client, company_id, today, count=4)
+            weeks_data = periods["weeks"]
+            months_data = periods["months"]
+            quarters_data = periods["quarters"]
+
+            # Format as markdown tables
+            result = f"📊 *Time Summary* ({company_name})\n\n"
+
+            # Weeks table
+            result += "*Weeks*\n```\n"
+            result += "| Week   | Hours |    % |\n"
+            result += "|--------|-------|------|\n"
+            for year, week_num, hours in weeks_data:
+                percentage = (hours / EXPECTED_WEEK_HOURS * 100) if EXPECTED_WEEK_HOURS > 0 else 0
+                result += f"| KW {week_num:02d}  | {hours:5.1f} | {percentage:3.0f}% |\n"
+            result += "```\n\n"
+
+            # Months table
+            result += "*Months*\n```\n"
+            result += "| Month     | Hours |    % |\n"
+            result += "|-----------|-------|------|\n"
+            for month_start, hours in months_data:
+                percentage = (hours / EXPECTED_MONTH_HOURS * 100) if EXPECTED_MONTH_HOURS > 0 else 0
+                result += f"| {month_start.strftime('%b %Y')}  | {hours:5.1f} | {percentage:3.0f}% |\n"
+            result += "```\n\n"
+
+            # Quarters table
+            result += "*Quarters*\n```\n"
+            result += "| Quarter  | Hours |    % |\n"
+            result += "|----------|-------|------|\n"
+            for year, quarter, hours in quarters_data:
+                percentage = (hours / EXPECTED_QUARTER_HOURS * 100) if EXPECTED_QUARTER_HOURS > 0 else 0
+                result += f"| Q{quarter} {year}  | {hours:5.1f} | {percentage:3.0f}% |\n"
+            result += "```"
+
+            return result
 
-        client = get_odoo_client()
+    except Exception as e:
+        return f"❌ Error fetching time summary: {str(e)}"
 
-        if not client:
-            return "❌ Could not connect to Odoo. Please check your configuration."
 
-        companies = client.get_companies()
-        if not companies:
-            return "❌ No companies found."
+def get_invoice_summary() -> str:
+    """
+    Get invoice summary with amounts invoiced and paid per month and quarter.
 
-        company_id = companies[0].id
-        company_name = companies[0].name
+    Returns:
+        Formatted markdown tables with invoice data or error message
+    """
+    try:
+        from datetime import date
+
+        with odoo_session() as client:
+            if not client:
+                return "❌ Could not connect to Odoo. Please check your configuration."
+
+            companies = get_cached_companies(client)
+            if not companies:
+                return "❌ No companies found."
+
+            company_id = companies[0]["id"]
+            company_name = companies[0]["name"]
+
+            today = date.today()
+
+            def format_thousands(amount: float) -> str:
+                return f"{amount / 1000:.1f}k"
+
+            # Last 3 months and 4 quarters from a single invoice fetch
+            periods = summarize_invoice_periods(client, company_id, today, month_count=3, quarter_count=4)
+            months_data = periods["months"]
+            quarters_data = periods["quarters"]
+
+            # Calculate monthly totals
+            total_invoiced_m = sum(invoiced for _, invoiced, _, _ in months_data)
+            total_paid_m = sum(paid for _, _, paid, _ in months_data)
+            total_percentage_m = (total_paid_m / total_invoiced_m * 100) if total_invoiced_m > 0 else 0.0
+
+            # Calculate quarterly totals
+            total_invoiced_q_all = sum(invoiced for _, _, invoiced, _, _ in quarters_data)
+            total_paid_q_all = sum(paid for _, _, _, paid, _ in quarters_data)
+            total_percentage_q = (total_paid_q_all / total_invoiced_q_all * 100) if total_invoiced_q_all > 0 else 0.0
+
+            # Format as markdown
+            result = f"💰 *Invoice Summary* ({company_name})\n\n"
+
+            # Months table
+            result += "*Invoices (excl. VAT)*\n```\n"
+            result += "| Month     | Invoiced | Paid    | Paid % |\n"
+            result += "|-----------|----------|---------|--------|\n"
+            for month_start, invoiced, paid, percentage in months_data:
+                invoiced_fmt = format_thousands(invoiced)
+                paid_fmt = format_thousands(paid)
+                result += f"| {month_start.strftime('%b %Y')}  | {invoiced_fmt:>8} | {paid_fmt:>7} | {percentage:5.0f}% |\n"
+            result += "|-----------|----------|---------|--------|\n"
+            total_inv_fmt = format_thousands(total_invoiced_m)
+            total_paid_fmt = format_thousands(total_paid_m)
+            result += f"| Total     | {total_inv_fmt:>8} | {total_paid_fmt:>7} | {total_percentage_m:5.0f}% |\n"
+            result += "```\n\n"
+
+            # Quarters table
+            result += "*Quarters*\n```\n"
+            result += "| Quarter  | Invoiced | Paid    | Paid % |\n"
+            result += "|----------|----------|---------|--------|\n"
+            for year, quarter, invoiced, paid, percentage in quarters_data:
+                invoiced_fmt = format_thousands(invoiced)
+                paid_fmt = format_thousands(paid)
+                result += f"| Q{quarter} {year}  | {invoiced_fmt:>8} | {paid_fmt:>7} | {percentage:5.0f}% |\n"
+            result += "|----------|----------|---------|--------|\n"
+            total_inv_fmt_q = format_thousands(total_invoiced_q_all)
+            total_paid_fmt_q = format_thousands(total_paid_q_all)
+            result += f"| Total    | {total_inv_fmt_q:>8} | {total_paid_fmt_q:>7} | {total_percentage_q:5.0f}% |\n"
+            result += "```"
+
+            return result
 
-        today = date.today()
+    except Exception as e:
+        return f"❌ Error fetching invoice summary: {str(e)}"
 
-        # Expected hours
-        EXPECTED_WEEK_HOURS = 40.0
-        EXPECTED_MONTH_HOURS = 160.0
-        EXPECTED_QUARTER_HOURS = 480.0
 
-        # Helper functions
-        def get_week_number(d: date) -> int:
-            return d.isocalendar()[1]
+def get_projects_list(company_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Get list of active projects for selection (cached per company)."""
+    cached = _projects_cache.get(company_id)
+    if cached is not None:
+        return list(cached)
 
-        def get_week_range(d: date) -> tuple:
-            week_start = d - timedelta(days=d.weekday())
-            week_end = week_start + timedelta(days=6)
-            return week_start, week_end
+    try:
+        with odoo_session() as client:
+            if not client:
+                return []
 
-        def get_month_range(year: int, month: int) -> tuple:
-            month_start = date(year, month, 1)
-            if month == 12:
-                next_month = date(year + 1, 1, 1)
-            else:
-                next_month = date(year, month + 1, 1)
-            month_end = next_month - timedelta(days=1)
-            return month_start, month_end
-
-        def get_quarter(d: date) -> int:
-            return (d.month - 1) // 3 + 1
-
-        def get_quarter_range(year: int, quarter: int) -> tuple:
-            start_month = (quarter - 1) * 3 + 1
-            quarter_start = date(year, start_month, 1)
-            end_month = start_month + 2
-            if end_month == 12:
-                quarter_end = date(year, 12, 31)
+            if company_id:
+                projects = client.get_projects_by_company(company_id)
             else:
-                next_quarter = date(year, end_month + 1, 1)
-                quarter_end = next_quarter - timedelta(days=1)
-            return quarter_start, quarter_end
-
-        # Calculate weeks (current + previous 3)
-        weeks_data = []
-        for i in range(4):
-            week_date = today - timedelta(weeks=i)
-            week_start, week_end = get_week_range(week_date)
-            week_num = get_week_number(week_date)
-            year = week_date.year
+                companies = get_cached_companies(client)
+                if companies:
+                    projects = client.get_projects_by_company(companies[0]["id"])
+                else:
+                    return []
 
-            entries = client.get_time_entries(week_start, week_end, company_id=company_id)
-            total_hours = sum(float(e.unit_amount) if e.unit_amount else 0.0 for e in entries)
-            weeks_data.append((year, week_num, total_hours))
-
-        # Calculate months (current + previous 3)
-        months_data = []
-        for i in range(4):
-            if today.month - i >= 1:
-                month = today.month - i
-                year = today.year
-            else:
-                month = 12 + (today.month - i)
-                year = today.year - 1
+            result = [{"id": p.id, "name": p.name} for p in projects]
+    except Exception:
+        return []
 
-            month_start, month_end = get_month_range(year, month)
-            entries = client.get_time_entries(month_start, month_end, company_id=company_id)
-            total_hours = sum(float(e.unit_amount) if e.unit_amount else 0.0 for e in entries)
-            months_data.append((month_start, total_hours))
-
-        # Calculate quarters (current + previous 3)
-        quarters_data = []
-        current_quarter = get_quarter(today)
-        current_year = today.year
-
-        for i in range(4):
-            quarter = current_quarter - i
-            year = current_year
-            while quarter < 1:
-                quarter += 4
-                year -= 1
-
-            quarter_start, quarter_end = get_quarter_range(year, quarter)
-            entries = client.get_time_entries(quarter_start, quarter_end, company_id=company_id)
-            total_hours = sum(float(e.unit_amount) if e.unit_amount else 0.0 for e in entries)
-            quarters_data.append((year, quarter, total_hours))
-
-        # Format as markdown tables
-        result = f"📊 *Time Summary* ({company_name})\n\n"
-
-        # Weeks table
-        result += "*Weeks*\n```\n"
-        result += "| Week   | Hours |    % |\n"
-        result += "|--------|-------|------|\n"
-        for year, week_num, hours in weeks_data:
-            percentage = (hours / EXPECTED_WEEK_HOURS * 100) if EXPECTED_WEEK_HOURS > 0 else 0
-            result += f"| KW {week_num:02d}  | {hours:5.1f} | {percentage:3.0f}% |\n"
-        result += "```\n\n"
-
-        # Months table
-        result += "*Months*\n```\n"
-        result += "| Month     | Hours |    % |\n"
-        result += "|-----------|-------|------|\n"
-        for month_start, hours in months_data:
-            percentage = (hours / EXPECTED_MONTH_HOURS * 100) if EXPECTED_MONTH_HOURS > 0 else 0
-            result += f"| {month_start.strftime('%b %Y')}  | {hours:5.1f} | {percentage:3.0f}% |\n"
-        result += "```\n\n"
-
-        # Quarters table
-        result += "*Quarters*\n```\n"
-        result += "| Quarter  | Hours |    % |\n"
-        result += "|----------|-------|------|\n"
-        for year, quarter, hours in quarters_data:
-            percentage = (hours / EXPECTED_QUARTER_HOURS * 100) if EXPECTED_QUARTER_HOURS > 0 else 0
-            result += f"| Q{quarter} {year}  | {hours:5.1f} | {percentage:3.0f}% |\n"
-        result += "```"
-
-        return result
+    if result:
+        _projects_cache.set(company_id, result)
+    return list(result)
 
-    except Exception as e:
-        return f"❌ Error fetching time summary: {str(e)}"
 
+def get_project_search_index(company_id: Optional[int] = None) -> ProjectSearchIndex:
+    """
+    Get the search index for a company's projects.
 
-def get_invoice_summary() -> str:
+    The index is shared by all users and rebuilt whenever the projects cache
+    has been refreshed (expired, invalidated or flushed).
     """
-    Get invoice summary with amounts invoiced and paid per month and quarter.
+    projects = _projects_cache.get(company_id)
+    if projects is None:
+        get_projects_list(company_id)
+        projects = _projects_cache.get(company_id) or []
+
+    with _project_indexes_lock:
+        index = _project_indexes.get(company_id)
+        if index is None or index.source is not projects:
+            index = ProjectSearchIndex(projects, usage=_project_usage)
+            _project_indexes[company_id] = index
+        return index
+
+
+def find_projects(
+    query: str,
+    limit: int = 20,
+    company_id: Optional[int] = None,
+    offset: int = 0
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Search projects by name, best matches first.
+
+    Args:
+        query: Part of the project name (typos are tolerated)
+        limit: Maximum number of projects returned
+        company_id: Company to search in (defaults to the user's first company)
+        offset: Number of ranked results to skip (for pagination)
 
     Returns:
-        Formatted markdown tables with invoice data or error message
+        (matching projects, total number of matches)
     """
-    try:
-        from datetime import date, timedelta
-        from typing import Tuple
+    return get_project_search_index(company_id).search(query, limit=limit, offset=offset)
 
-        client = get_odoo_client()
 
-        if not client:
-            return "❌ Could not connect to Odoo. Please check your configuration."
+def get_project(project_id: int, company_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """Look up a project by ID in the cached project list."""
+    return get_project_search_index(company_id).get(project_id)
 
-        companies = client.get_companies()
-        if not companies:
-            return "❌ No companies found."
 
-        company_id = companies[0].id
-        company_name = companies[0].name
+def get_task_search_index(project_id: int) -> ProjectSearchIndex:
+    """Get the search index for a project's tasks, rebuilt when the tasks cache refreshes."""
+    tasks = _tasks_cache.get(project_id)
+    if tasks is None:
+        get_tasks_list(project_id)
+        tasks = _tasks_cache.get(project_id) or []
 
-        today = date.today()
+    with _project_indexes_lock:
+        index = _task_indexes.get(project_id)
+        if index is None or index.source is not tasks:
+            index = ProjectSearchIndex(tasks)
+            _task_indexes[project_id] = index
 
-        def get_month_range(year: int, month: int) -> Tuple[date, date]:
-            month_start = date(year, month, 1)
-            if month == 12:
-                next_month = date(year + 1, 1, 1)
-            else:
-                next_month = date(year, month + 1, 1)
-            month_end = next_month - timedelta(days=1)
-            return month_start, month_end
-
-        def format_thousands(amount: float) -> str:
-            return f"{amount / 1000:.1f}k"
-
-        def get_quarter(d: date) -> int:
-            return (d.month - 1) // 3 + 1
-
-        def get_quarter_range(year: int, quarter: int) -> Tuple[date, date]:
-            start_month = (quarter - 1) * 3 + 1
-            quarter_start = date(year, start_month, 1)
-            end_month = start_month + 2
-            if end_month == 12:
-                quarter_end = date(year, 12, 31)
-            else:
-                next_quarter = date(year, end_month + 1, 1)
-                quarter_end = next_quarter - timedelta(days=1)
-            return quarter_start, quarter_end
-
-        # Calculate last 3 months
-        months_data = []
-        for i in range(3):
-            if today.month - i >= 1:
-                month = today.month - i
-                year = today.year
-            else:
-                month = 12 + (today.month - i)
-                year = today.year - 1
-
-            month_start, month_end = get_month_range(year, month)
-
-            invoice_domain = [
-                ('company_id', '=', company_id),
-                ('move_type', '=', 'out_invoice'),
-                ('invoice_date', '>=', month_start.isoformat()),
-                ('invoice_date', '<=', month_end.isoformat()),
-                ('state', '=', 'posted')
-            ]
-
-            invoice_ids = client.odoo.env['account.move'].search(invoice_domain)
-
-            total_invoiced = 0.0
-            total_paid = 0.0
-
-            if invoice_ids:
-                invoice_data = client.odoo.env['account.move'].read(
-                    invoice_ids,
-                    ['amount_untaxed', 'amount_residual', 'amount_total']
-                )
-
-                for invoice in invoice_data:
-                    invoice_amount = float(invoice.get('amount_untaxed', 0.0))
-                    residual_amount = float(invoice.get('amount_residual', 0.0))
-                    total_with_tax = float(invoice.get('amount_total', 0.0))
-
-                    if total_with_tax > 0:
-                        paid_with_tax = total_with_tax - residual_amount
-                        paid_amount = (paid_with_tax / total_with_tax) * invoice_amount
-                    else:
-                        paid_amount = 0.0
-
-                    total_invoiced += invoice_amount
-                    total_paid += paid_amount
-
-            percentage_paid = (total_paid / total_invoiced * 100) if total_invoiced > 0 else 0.0
-            months_data.append((month_start, total_invoiced, total_paid, percentage_paid))
-
-        # Calculate monthly totals
-        total_invoiced_m = sum(invoiced for _, invoiced, _, _ in months_data)
-        total_paid_m = sum(paid for _, _, paid, _ in months_data)
-        total_percentage_m = (total_paid_m / total_invoiced_m * 100) if total_invoiced_m > 0 else 0.0
-
-        # Calculate quarters
-        quarters_data = []
-        current_quarter = get_quarter(today)
-        current_year = today.year
-
-        for i in range(4):
-            quarter = current_quarter - i
-            year = current_year
-
-            while quarter < 1:
-                quarter += 4
-                year -= 1
-
-            quarter_start, quarter_end = get_quarter_range(year, quarter)
-
-            invoice_domain = [
-                ('company_id', '=', company_id),
-                ('move_type', '=', 'out_invoice'),
-                ('invoice_date', '>=', quarter_start.isoformat()),
-                ('invoice_date', '<=', quarter_end.isoformat()),
-                ('state', '=', 'posted')
-            ]
-
-            invoice_ids = client.odoo.env['account.move'].search(invoice_domain)
-
-            total_invoiced_q = 0.0
-            total_paid_q = 0.0
-
-            if invoice_ids:
-                invoice_data = client.odoo.env['account.move'].read(
-                    invoice_ids,
-                    ['amount_untaxed', 'amount_residual', 'amount_total']
-                )
-
-                for invoice in invoice_data:
-                    invoice_amount = float(invoice.get('amount_untaxed', 0.0))
-                    residual_amount = float(invoice.get('amount_residual', 0.0))
-                    total_with_tax = float(invoice.get('amount_total', 0.0))
-
-                    if total_with_tax > 0:
-                        paid_with_tax = total_with_tax - residual_amount
-                        paid_amount = (paid_with_tax / total_with_tax) * invoice_amount
-                    else:
-                        paid_amount = 0.0
-
-                    total_invoiced_q += invoice_amount
-                    total_paid_q += paid_amount
-
-            percentage_paid_q = (total_paid_q / total_invoiced_q * 100) if total_invoiced_q > 0 else 0.0
-            quarters_data.append((year, quarter, total_invoiced_q, total_paid_q, percentage_paid_q))
-
-        # Calculate quarterly totals
-        total_invoiced_q_all = sum(invoiced for _, _, invoiced, _, _ in quarters_data)
-        total_paid_q_all = sum(paid for _, _, _, paid, _ in quarters_data)
-        total_percentage_q = (total_paid_q_all / total_invoiced_q_all * 100) if total_invoiced_q_all > 0 else 0.0
-
-        # Format as markdown
-        result = f"💰 *Invoice Summary* ({company_name})\n\n"
-
-        # Months table
-        result += "*Invoices (excl. VAT)*\n```\n"
-        result += "| Month     | Invoiced | Paid    | Paid % |\n"
-        result += "|-----------|----------|---------|--------|\n"
-        for month_start, invoiced, paid, percentage in months_data:
-            invoiced_fmt = format_thousands(invoiced)
-            paid_fmt = format_thousands(paid)
-            result += f"| {month_start.strftime('%b %Y')}  | {invoiced_fmt:>8} | {paid_fmt:>7} | {percentage:5.0f}% |\n"
-        result += "|-----------|----------|---------|--------|\n"
-        total_inv_fmt = format_thousands(total_invoiced_m)
-        total_paid_fmt = format_thousands(total_paid_m)
-        result += f"| Total     | {total_inv_fmt:>8} | {total_paid_fmt:>7} | {total_percentage_m:5.0f}% |\n"
-        result += "```\n\n"
-
-        # Quarters table
-        result += "*Quarters*\n```\n"
-        result += "| Quarter  | Invoiced | Paid    | Paid % |\n"
-        result += "|----------|----------|---------|--------|\n"
-        for year, quarter, invoiced, paid, percentage in quarters_data:
-            invoiced_fmt = format_thousands(invoiced)
-            paid_fmt = format_thousands(paid)
-            result += f"| Q{quarter} {year}  | {invoiced_fmt:>8} | {paid_fmt:>7} | {percentage:5.0f}% |\n"
-        result += "|----------|----------|---------|--------|\n"
-        total_inv_fmt_q = format_thousands(total_invoiced_q_all)
-        total_paid_fmt_q = format_thousands(total_paid_q_all)
-        result += f"| Total    | {total_inv_fmt_q:>8} | {total_paid_fmt_q:>7} | {total_percentage_q:5.0f}% |\n"
-        result += "```"
-
-        return result
+            # Keep at most one index per cached task list
+            while len(_task_indexes) > _tasks_cache.max_size:
+                del _task_indexes[next(iter(_task_indexes))]
+        return index
 
-    except Exception as e:
-        return f"❌ Error fetching invoice summary: {str(e)}"
 
+def find_tasks(project_id: int, query: str, limit: int = 20, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+    """Search a project's tasks by name, like find_projects."""
+    return get_task_search_index(project_id).search(query, limit=limit, offset=offset)
+
+
+def get_task(project_id: int, task_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Look up a task by ID.
+
+    Served from the cached task list; only a task outside it costs a
+    single read from Odoo.
+    """
+    name = _task_names_cache.get((project_id, task_id))
+    if name is not None:
+        return {"id": task_id, "name": name}
+
+    tasks = _tasks_cache.get(project_id)
+    if tasks is not None:
+        return get_task_search_index(project_id).get(task_id)
 
-def get_projects_list(company_id: Optional[int] = None) -> List[Dict[str, Any]]:
-    """Get list of active projects for selection."""
     try:
-        client = get_odoo_client()
-        if not client:
-            return []
-
-        if company_id:
-            projects = client.get_projects_by_company(company_id)
-        else:
-            companies = client.get_companies()
-            if companies:
-                company_id = companies[0].id
-                projects = client.get_projects_by_company(company_id)
-            else:
-                return []
+        with odoo_session() as client:
+            if not client:
+                return None
 
-        return [{"id": p.id, "name": p.name} for p in projects]
+            rows = client.odoo.env['project.task'].search_read(
+                [('id', '=', task_id), ('project_id', '=', project_id)], ['name']
+            )
     except Exception:
-        return []
+        return None
+
+    if not rows:
+        return None
+
+    _task_names_cache.set((project_id, task_id), rows[0]['name'])
+    return {"id": task_id, "name": rows[0]['name']}
+
+
+def get_tasks_page(project_id: int, offset: int = 0, limit: int = 10) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Get one page of a project's tasks.
+
+    Pages are slices of get_tasks_list(), so they list exactly the tasks
+    (and order) odoo-logger's get_tasks() returns, and paging through a
+    project costs one Odoo call per cache TTL.
+
+    Args:
+        project_id: Project to list tasks for
+        offset: Number of tasks to skip
+        limit: Page size
+
+    Returns:
+        (tasks on this page, total number of tasks)
+    """
+    tasks = get_tasks_list(project_id)
+    return tasks[offset:offset + limit], len(tasks)
+
+
+def record_project_use(project_id: int):
+    """Boost a project in future search rankings after it was picked."""
+    _project_usage.record(project_id)
 
 
 def get_tasks_list(project_id: int) -> List[Dict[str, Any]]:
-    """Get list of tasks for a project."""
+    """Get list of tasks for a project (cached per project)."""
+    cached = _tasks_cache.get(project_id)
+    if cached is not None:
+        return list(cached)
+
     try:
-        client = get_odoo_client()
-        if not client:
-            return []
+        with odoo_session() as client:
+            if not client:
+                return []
 
-        tasks = client.get_tasks(project_id)
-        return [{"id": t.id, "name": t.name} for t in tasks]
+            tasks = client.get_tasks(project_id)
+            result = [{"id": t.id, "name": t.name} for t in tasks]
     except Exception:
         return []
 
+    if result:
+        _tasks_cache.set(project_id, result)
+    return list(result)
+
+
+def warm_up_reference_data(recent_days: int = 30, max_projects: int = 5) -> Dict[str, Any]:
+    """
+    Fill the pool and caches so the first command after startup is fast.
+
+    Authenticates a pooled client, then loads companies, projects (and their
+    search index) and the task lists of the projects the user logged time on
+    most recently.
+
+    Args:
+        recent_days: How far back to look for recently used projects
+        max_projects: Number of recent projects whose tasks are prefetched
+
+    Returns:
+        {"companies", "projects", "task_lists"} counts
+
+    Raises:
+        RuntimeError: If Odoo cannot be reached
+    """
+    from datetime import date, timedelta
+
+    with odoo_session() as client:
+        if not client:
+            raise RuntimeError("could not connect to Odoo")
+
+        companies = get_cached_companies(client)
+        if not companies:
+            raise RuntimeError("no companies found")
+
+        since = (date.today() - timedelta(days=recent_days)).isoformat()
+        rows = client.odoo.env[TIMESHEET_MODEL].search_read(
+            [
+                ('company_id', '=', companies[0]["id"]),
+                ('user_id', '=', client.odoo.env.uid),
+                ('project_id', '!=', False),
+                ('date', '>=', since),
+            ],
+            ['project_id'],
+            limit=200,
+            order='date desc',
+        )
+
+    projects = get_projects_list()
+    get_project_search_index()
+
+    # Most recent first, without duplicates
+    recent_ids: List[int] = []
+    for row in rows:
+        project_id = row['project_id'][0] if row['project_id'] else None
+        if project_id and project_id not in recent_ids:
+            recent_ids.append(project_id)
+
+    task_lists = 0
+    for project_id in recent_ids[:max_projects]:
+        if get_tasks_list(project_id):
+            task_lists += 1
+
+    return {"companies": len(companies), "projects": len(projects), "task_lists": task_lists}
+
 
 def log_time_entry(
     project_id: int,
@@ -649,36 +778,38 @@ def log_time_entry(
     try:
         from datetime import date as dt_date
 
-        client = get_odoo_client()
-        if not client:
-            return "❌ Could not connect to Odoo."
+        with odoo_session() as client:
+            if not client:
+                return "❌ Could not connect to Odoo."
 
-        companies = client.get_companies()
-        if not companies:
-            return "❌ No companies found."
-
-        company_id = companies[0].id
-
-        # Use today if no date specified
-        if not log_date:
-            log_date = dt_date.today().isoformat()
-
-        # Validate employee exists
-        if not client.check_employee_exists(company_id):
-            return ("❌ You don't have an active employee record in the selected company.\n"
-                   "Please contact your Odoo administrator.")
-
-        # Create the time entry
-        timesheet_id = client.log_time(
-            project_id=project_id,
-            task_id=task_id,
-            description=description,
-            time_spent=hours,
-            log_date=log_date,
-            company_id=company_id
-        )
+            companies = get_cached_companies(client)
+            if not companies:
+                return "❌ No companies found."
+
+            company_id = companies[0]["id"]
+
+            # Use today if no date specified
+            if not log_date:
+                log_date = dt_date.today().isoformat()
+
+            # Validate employee exists
+            if not client.check_employee_exists(company_id):
+                return ("❌ You don't have an active employee record in the selected company.\n"
+                       "Please contact your Odoo administrator.")
+
+            # Create the time entry
+            timesheet_id = client.log_time(
+                project_id=project_id,
+                task_id=task_id,
+                description=description,
+                time_spent=hours,
+                log_date=log_date,
+                company_id=company_id
+            )
+
+            invalidate_odoo_caches(project_id)
 
-        return f"✅ Time logged successfully!\n📝 {hours}h on {log_date}\n🆔 Entry ID: {timesheet_id}"
+            return f"✅ Time logged successfully!\n📝 {hours}h on {log_date}\n🆔 Entry ID: {timesheet_id}"
 
     except Exception as e:
         return f"❌ Error logging time: {str(e)}"
@@ -0,0 +1,248 @@
+"""
+Bot State Persistence
+Keeps user_data, chat_data and conversation states (e.g. an in-flight /logtime)
+across restarts, in SQLite or a local pickle file
+"""
+
+import os
+import json
+import sqlite3
+import asyncio
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from telegram.ext import BasePersistence, PersistenceInput, PicklePersistence
+
+# Default storage directory: data/ in the project root, wherever the bot is started from
+DATA_DIR = Path(__file__).resolve().parents[2] / "data"
+
+
+def _dumps(value: Any) -> str:
+    # Compact JSON: no whitespace, non-ASCII kept as-is. Anything else (dates,
+    # sets, objects) raises TypeError instead of coming back as a string
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+class SQLitePersistence(BasePersistence[Dict[str, Any], Dict[str, Any], Dict[str, Any]]):
+    """
+    Stores bot state as compact JSON rows in a single SQLite table.
+
+    The Application hands over changed data every ``update_interval``
+    seconds; those writes are buffered and committed together in one
+    transaction on a worker thread (write-behind), and rows whose content
+    did not change are skipped. Store only small, JSON-serializable values
+    in user_data: IDs and names, not whole Odoo result sets.
+
+    Several processes may open the same file as long as no row has two
+    writers. UpdateWorkerPool gives every chat (and so its chat_data and
+    conversation rows) to one worker, but a user who talks to the bot in
+    several chats can reach several workers, each with its own copy of that
+    user's user_data. Pass ``worker`` so each worker stores its copy in its
+    own rows, and let only one process store bot_data.
+    """
+
+    def __init__(self, path: str, update_interval: float = 60, store_bot_data: bool = True,
+                 worker: Optional[int] = None):
+        """
+        Initialize the persistence.
+
+        Args:
+            path: SQLite database file (created if missing)
+            update_interval: Seconds between two batches of writes
+            store_bot_data: Save bot_data (disable in all but one process sharing the file)
+            worker: UpdateWorkerPool worker index; user_data is kept per worker
+        """
+        super().__init__(
+            store_data=PersistenceInput(bot_data=store_bot_data, callback_data=False),
+            update_interval=update_interval
+        )
+        self.path = path
+        self._user_kind = "user" if worker is None else f"user:{worker}"
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        # WAL lets several worker processes share the file
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS state ("
+            " kind TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+            " PRIMARY KEY (kind, key)) WITHOUT ROWID"
+        )
+        self._db_lock = threading.Lock()
+
+        # (kind, key) -> serialized value, or None to delete the row
+        self._pending: Dict[Tuple[str, str], Optional[str]] = {}
+        self._written: Dict[Tuple[str, str], str] = {}
+        self._write_task: Optional[asyncio.Task] = None
+
+    def _load(self, kind: str) -> Dict[str, Any]:
+        with self._db_lock:
+            rows = self._db.execute("SELECT key, value FROM state WHERE kind = ?", (kind,)).fetchall()
+
+        for key, value in rows:
+            self._written[(kind, key)] = value
+        return {key: json.loads(value) for key, value in rows}
+
+    def _stage(self, kind: str, key: str, value: Any):
+        entry = (kind, key)
+        try:
+            serialized = None if value is None else _dumps(value)
+        except TypeError as e:
+            raise TypeError(f"Cannot persist {kind} {key}: {e}. Store only JSON values (IDs, names, numbers).") from e
+
+        if serialized is not None and self._written.get(entry) == serialized:
+            self._pending.pop(entry, None)
+            return
+        if serialized is None and entry not in self._written and entry not in self._pending:
+            return
+
+        self._pending[entry] = serialized
+
+        if self._write_task is None or self._write_task.done():
+            self._write_task = asyncio.get_running_loop().create_task(self._write_soon())
+
+    async def _write_soon(self):
+        # Let the rest of this persistence run stage its changes first
+        await asyncio.sleep(0)
+
+        # Changes staged while a batch is being written go into the next one
+        while self._pending:
+            batch, self._pending = self._pending, {}
+            try:
+                await asyncio.to_thread(self._commit, batch)
+            except Exception:
+                # Keep the batch (newer staged values win) so the next run retries it
+                self._pending = {**batch, **self._pending}
+                raise
+
+            for entry, value in batch.items():
+                if value is None:
+                    self._written.pop(entry, None)
+                else:
+                    self._written[entry] = value
+
+    def _commit(self, batch: Dict[Tuple[str, str], Optional[str]]):
+        upserts = [(kind, key, value) for (kind, key), value in batch.items() if value is not None]
+        deletes = [(kind, key) for (kind, key), value in batch.items() if value is None]
+
+        with self._db_lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany(
+                    "INSERT INTO state (kind, key, value) VALUES (?, ?, ?) "
+                    "ON CONFLICT (kind, key) DO UPDATE SET value = excluded.value",
+                    upserts
+                )
+                self._db.executemany("DELETE FROM state WHERE kind = ? AND key = ?", deletes)
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+    async def get_user_data(self) -> Dict[int, Dict[str, Any]]:
+        return {int(key): value for key, value in self._load(self._user_kind).items()}
+
+    async def get_chat_data(self) -> Dict[int, Dict[str, Any]]:
+        return {int(key): value for key, value in self._load("chat").items()}
+
+    async def get_bot_data(self) -> Dict[str, Any]:
+        return self._load("bot").get("bot", {})
+
+    async def get_callback_data(self) -> Optional[Any]:
+        return None
+
+    async def get_conversations(self, name: str) -> Dict[Tuple[int, ...], object]:
+        return {tuple(json.loads(key)): state for key, state in self._load(f"conversation:{name}").items()}
+
+    async def update_conversation(self, name: str, key: Tuple[int, ...], new_state: Optional[object]) -> None:
+        self._stage(f"conversation:{name}", _dumps(list(key)), new_state)
+
+    async def update_user_data(self, user_id: int, data: Dict[str, Any]) -> None:
+        # Empty dicts are dropped rather than stored for every user who ever wrote
+        self._stage(self._user_kind, str(user_id), data or None)
+
+    async def update_chat_data(self, chat_id: int, data: Dict[str, Any]) -> None:
+        self._stage("chat", str(chat_id), data or None)
+
+    async def update_bot_data(self, data: Dict[str, Any]) -> None:
+        self._stage("bot", "bot", data)
+
+    async def update_callback_data(self, data: Any) -> None:
+        pass
+
+    async def drop_user_data(self, user_id: int) -> None:
+        self._stage(self._user_kind, str(user_id), None)
+
+    async def drop_chat_data(self, chat_id: int) -> None:
+        self._stage("chat", str(chat_id), None)
+
+    async def refresh_user_data(self, user_id: int, user_data: Dict[str, Any]) -> None:
+        pass
+
+    async def refresh_chat_data(self, chat_id: int, chat_data: Dict[str, Any]) -> None:
+        pass
+
+    async def refresh_bot_data(self, bot_data: Dict[str, Any]) -> None:
+        pass
+
+    async def flush(self) -> None:
+        """Write everything still pending (called when the Application stops)."""
+        if self._write_task is not None and not self._write_task.done():
+            await self._write_task
+        if self._pending:
+            self._write_task = asyncio.get_running_loop().create_task(self._write_soon())
+            await self._write_task
+
+
+def build_persistence(backend: Optional[str] = None, path: Optional[str] = None) -> Optional[BasePersistence]:
+    """
+    Create the persistence backend configured in the environment.
+
+    Args:
+        backend: 'sqlite', 'pickle' or 'none' (reads TELEGRAM_PERSISTENCE, defaults to none)
+        path: Storage file (reads TELEGRAM_PERSISTENCE_PATH, defaults to data/bot_state.sqlite3
+              or data/bot_state.pickle in the project root)
+
+    Returns:
+        A persistence instance, or None if persistence is disabled
+
+    Raises:
+        ValueError: For an unknown backend, or pickle in an UpdateWorkerPool worker
+    """
+    backend = (backend or os.getenv('TELEGRAM_PERSISTENCE') or 'none').lower()
+    update_interval = float(os.getenv('TELEGRAM_PERSISTENCE_INTERVAL', '10'))
+
+    # Set in UpdateWorkerPool workers, which share one storage file
+    worker_index = os.getenv('TELEGRAM_WORKER_INDEX')
+
+    if backend in ("none", "off", ""):
+        return None
+
+    if backend == "sqlite":
+        path = path or os.getenv('TELEGRAM_PERSISTENCE_PATH') or str(DATA_DIR / "bot_state.sqlite3")
+        # Workers own disjoint chats but may share users; bot_data is shared, so only worker 0 writes it
+        return SQLitePersistence(
+            path,
+            update_interval=update_interval,
+            store_bot_data=int(worker_index or 0) == 0,
+            worker=None if worker_index is None else int(worker_index)
+        )
+
+    if backend == "pickle":
+        # Single process only: each write replaces the whole file
+        if worker_index is not None:
+            raise ValueError("TELEGRAM_PERSISTENCE=pickle only works in a single process. "
+                             "Use 'sqlite' with TELEGRAM_WORKERS.")
+        path = path or os.getenv('TELEGRAM_PERSISTENCE_PATH') or str(DATA_DIR / "bot_state.pickle")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        return PicklePersistence(
+            path,
+            store_data=PersistenceInput(callback_data=False),
+            update_interval=update_interval
+        )
+
+    raise ValueError(f"Unknown TELEGRAM_PERSISTENCE '{backend}'. Use 'sqlite', 'pickle' or 'none'.")
@@ -0,0 +1,162 @@
+"""
+Project Search Index
+Trigram index over project names with fuzzy, usage-aware ranking
+"""
+
+import re
+import time
+import threading
+import unicodedata
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+
+def normalize_name(text: str) -> str:
+    """Lowercase, strip accents and collapse punctuation/whitespace."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(re.sub(r"[^\w]+", " ", text.lower()).split())
+
+
+def trigrams(text: str) -> Set[str]:
+    """Return the trigrams of a normalized string, padded so word starts count."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ProjectUsage:
+    """
+    Remembers which projects were picked recently, shared by all users.
+
+    Each pick adds 1 to a project's score; older picks fade with a half-life
+    so last week's projects outrank last year's.
+    """
+
+    def __init__(self, half_life: float = 7 * 24 * 3600):
+        """
+        Initialize the usage tracker.
+
+        Args:
+            half_life: Seconds after which a pick counts half as much
+        """
+        self.half_life = half_life
+        self._scores: Dict[int, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, project_id: int):
+        """Count one pick of project_id."""
+        now = time.time()
+        with self._lock:
+            self._scores[project_id] = (self._decayed(project_id, now) + 1.0, now)
+
+    def score(self, project_id: int) -> float:
+        """Return the decayed pick count of project_id."""
+        with self._lock:
+            return self._decayed(project_id, time.time())
+
+    def _decayed(self, project_id: int, now: float) -> float:
+        score, updated_at = self._scores.get(project_id, (0.0, now))
+        return score * 0.5 ** ((now - updated_at) / self.half_life)
+
+
+class ProjectSearchIndex:
+    """
+    Search index over a list of {"id", "name"} dicts (projects or tasks).
+
+    Names are normalized once at build time and every trigram points to the
+    projects containing it, so a search only scores projects that share
+    trigrams with the query instead of scanning the whole list. Results are
+    ranked by name similarity (exact, prefix, word prefix, substring) plus a
+    small boost for recently used projects. Trigram overlap finds misspelled
+    names when no project contains the query.
+    """
+
+    def __init__(self, projects: Sequence[Dict[str, Any]], usage: Optional[ProjectUsage] = None, min_similarity: float = 0.3):
+        """
+        Build the index.
+
+        Args:
+            projects: Projects as returned by get_projects_list()
+            usage: Shared usage tracker for ranking (optional)
+            min_similarity: Minimum trigram overlap for a fuzzy match (0-1)
+        """
+        self.source = projects
+        self.usage = usage
+        self.min_similarity = min_similarity
+
+        self._projects = list(projects)
+        self._by_id = {project["id"]: project for project in self._projects}
+        self._names = [normalize_name(project["name"]) for project in self._projects]
+        self._grams: Dict[str, List[int]] = {}
+
+        for position, name in enumerate(self._names):
+            for gram in trigrams(name):
+                self._grams.setdefault(gram, []).append(position)
+
+    def __len__(self) -> int:
+        return len(self._projects)
+
+    def get(self, project_id: int) -> Optional[Dict[str, Any]]:
+        """Look up a project by ID."""
+        return self._by_id.get(project_id)
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Find projects matching query.
+
+        Args:
+            query: Text typed by the user (empty lists everything, recently used first)
+            limit: Maximum number of results returned
+            offset: Number of ranked results to skip (for pagination)
+
+        Returns:
+            (best matches, ranked; total number of matches)
+        """
+        query = normalize_name(query)
+
+        if not query:
+            candidates = {position: 0.0 for position in range(len(self._names))}
+        elif len(query) < 3:
+            # Too short for trigrams: plain substring match on the pre-normalized names
+            candidates = {position: 0.0 for position, name in enumerate(self._names) if query in name}
+        else:
+            query_grams = trigrams(query)
+            shared: Dict[int, int] = {}
+            for gram in query_grams:
+                for position in self._grams.get(gram, ()):
+                    shared[position] = shared.get(position, 0) + 1
+
+            candidates = {
+                position: count / len(query_grams)
+                for position, count in shared.items()
+                if count / len(query_grams) >= self.min_similarity or query in self._names[position]
+            }
+
+            # Fuzzy matches are only a fallback when nothing contains the query
+            exact = {position: sim for position, sim in candidates.items() if query in self._names[position]}
+            if exact:
+                candidates = exact
+
+        scored = []
+        for position, similarity in candidates.items():
+            name = self._names[position]
+
+            if name == query:
+                score = 4.0
+            elif name.startswith(query):
+                score = 3.0
+            elif f" {query}" in f" {name}":
+                score = 2.5
+            elif query in name:
+                score = 2.0
+            else:
+                score = similarity
+
+            # Prefer tighter matches, then recently used projects
+            score += similarity * 0.5 - len(name) / 1000
+            if self.usage is not None:
+                score += min(1.0, self.usage.score(self._projects[position]["id"]) * 0.2)
+
+            scored.append((score, position))
+
+        scored.sort(key=lambda item: (-item[0], self._names[item[1]]))
+        return [self._projects[position] for _, position in scored[offset:offset + limit]], len(scored)
@@ -0,0 +1,219 @@
+"""
+Telegram Outbound Rate Limiter
+Schedules Bot API requests within Telegram's flood limits, honors
+retry_after and retries transient network errors
+"""
+
+import os
+import time
+import random
+import asyncio
+import heapq
+import itertools
+import contextlib
+from collections import OrderedDict
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Union
+
+from telegram.error import BadRequest, NetworkError, RetryAfter
+from telegram.ext import BaseRateLimiter
+
+# Message priorities: lower value is sent first
+PRIORITY_URGENT = 0
+PRIORITY_NORMAL = 1
+PRIORITY_BULK = 2
+
+
+class TokenBucket:
+    """
+    An asyncio token bucket with priority-aware waiting.
+
+    Waiters are served in (priority, arrival) order: urgent messages overtake
+    bulk ones when the bucket runs dry, and messages of the same priority keep
+    the order they were sent in.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self._waiters: List[tuple] = []
+        self._tickets = itertools.count()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def pause(self, seconds: float):
+        """Hand out no tokens for the next seconds (e.g. after a RetryAfter)."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    @property
+    def idle(self) -> bool:
+        """True if the bucket is full and nobody is waiting (safe to discard)."""
+        self._refill(time.monotonic())
+        return self.tokens >= self.capacity and not self._waiters
+
+    async def acquire(self, priority: int = PRIORITY_NORMAL):
+        """Wait until a token is available and it is this caller's turn, then take it."""
+        ticket = (priority, next(self._tickets))
+        heapq.heappush(self._waiters, ticket)
+
+        try:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+
+                if self.tokens >= 1 and self._waiters[0] == ticket:
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep(max((1 - self.tokens) / self.rate, 0.01))
+        finally:
+            self._waiters.remove(ticket)
+            heapq.heapify(self._waiters)
+
+
+class TelegramRateLimiter(BaseRateLimiter[Union[int, Dict[str, Any]]]):
+    """
+    Rate limiter for every request sent through a python-telegram-bot Bot.
+
+    Requests addressed to a chat take a token from a global bucket (about 30
+    messages per second) and from that chat's bucket (about 1 per second for
+    private chats, 20 per minute for groups). RetryAfter pauses the affected
+    buckets for the time Telegram asks for; timeouts and network errors are
+    retried with exponential backoff and jitter.
+
+    Pass the priority per call with ``rate_limit_args``, either as an int or
+    as ``{"priority": PRIORITY_URGENT}``:
+
+        await bot.send_message(chat_id, text, rate_limit_args=PRIORITY_URGENT)
+    """
+
+    def __init__(
+        self,
+        global_rate: Optional[float] = None,
+        chat_rate: Optional[float] = None,
+        group_rate: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        backoff_base: float = 0.5,
+        max_chats: int = 10000
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            global_rate: Messages per second across all chats (reads TELEGRAM_GLOBAL_RATE, defaults to 30)
+            chat_rate: Messages per second per private chat (reads TELEGRAM_CHAT_RATE, defaults to 1)
+            group_rate: Messages per second per group or channel (reads TELEGRAM_GROUP_RATE, defaults to 20/60)
+            max_retries: Retries after RetryAfter or network errors (reads TELEGRAM_MAX_RETRIES, defaults to 5)
+            backoff_base: First backoff delay in seconds for network errors
+            max_chats: Number of per-chat buckets kept before idle ones are dropped
+        """
+        self.global_rate = global_rate or float(os.getenv('TELEGRAM_GLOBAL_RATE', '30'))
+        self.chat_rate = chat_rate or float(os.getenv('TELEGRAM_CHAT_RATE', '1'))
+        self.group_rate = group_rate or float(os.getenv('TELEGRAM_GROUP_RATE', str(20 / 60)))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('TELEGRAM_MAX_RETRIES', '5'))
+        self.backoff_base = backoff_base
+        self.max_chats = max_chats
+
+        self._global = TokenBucket(self.global_rate, self.global_rate)
+        self._chats: "OrderedDict[Union[int, str], TokenBucket]" = OrderedDict()
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        self._chats.clear()
+
+    def _chat_bucket(self, chat_id: Union[int, str]) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+
+        if bucket is None:
+            # Negative IDs and @usernames are groups or channels
+            is_group = isinstance(chat_id, str) or chat_id < 0
+            rate = self.group_rate if is_group else self.chat_rate
+            bucket = TokenBucket(rate, capacity=max(1.0, rate * 3))
+            self._chats[chat_id] = bucket
+            self._evict_idle_chats()
+        else:
+            self._chats.move_to_end(chat_id)
+
+        return bucket
+
+    def _evict_idle_chats(self):
+        while len(self._chats) > self.max_chats:
+            oldest_id = next(iter(self._chats))
+            if not self._chats[oldest_id].idle:
+                break
+            del self._chats[oldest_id]
+
+    @staticmethod
+    def _priority(rate_limit_args: Optional[Union[int, Dict[str, Any]]]) -> int:
+        if isinstance(rate_limit_args, dict):
+            return int(rate_limit_args.get("priority", PRIORITY_NORMAL))
+        if isinstance(rate_limit_args, int):
+            return rate_limit_args
+        return PRIORITY_NORMAL
+
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, Union[bool, Dict[str, Any], List[Dict[str, Any]]]]],
+        args: Any,
+        kwargs: Dict[str, Any],
+        endpoint: str,
+        data: Dict[str, Any],
+        rate_limit_args: Optional[Union[int, Dict[str, Any]]],
+    ) -> Union[bool, Dict[str, Any], List[Dict[str, Any]]]:
+        chat_id = data.get("chat_id")
+        with contextlib.suppress(ValueError, TypeError):
+            chat_id = int(chat_id)
+
+        priority = self._priority(rate_limit_args)
+        chat_bucket = self._chat_bucket(chat_id) if chat_id is not None else None
+
+        for attempt in range(self.max_retries + 1):
+            if chat_bucket is not None:
+                await chat_bucket.acquire(priority)
+                await self._global.acquire(priority)
+
+            try:
+                return await callback(*args, **kwargs)
+            except RetryAfter as e:
+                if attempt == self.max_retries:
+                    raise
+
+                retry_after = e.retry_after
+                if hasattr(retry_after, "total_seconds"):
+                    retry_after = retry_after.total_seconds()
+
+                # Flood control is per chat when we know the chat, global otherwise
+                (chat_bucket or self._global).pause(float(retry_after) + 0.1)
+                print(f"⏳ Flood control on {endpoint}, retrying in {retry_after}s")
+            except BadRequest:
+                # Subclass of NetworkError, but retrying will not help
+                raise
+            except NetworkError as e:
+                if attempt == self.max_retries:
+                    raise
+
+                delay = self.backoff_base * (2 ** attempt)
+                delay = random.uniform(delay / 2, delay * 1.5)
+                print(f"⚠️ {endpoint} failed ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+            if chat_bucket is None:
+                # Requests without a chat are not throttled but still wait out a pause
+                await asyncio.sleep(max(0.0, self._global.blocked_until - time.monotonic()))
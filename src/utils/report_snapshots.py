@@ -0,0 +1,149 @@
+"""
+Report Snapshots
+Precomputes slow reports (e.g. /summary, /invoiced) on the JobQueue so
+commands can answer instantly with the last snapshot
+"""
+
+import time
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional
+
+from telegram.ext import ContextTypes, JobQueue
+
+
+@dataclass
+class ReportSnapshot:
+    """A rendered report and when it was computed."""
+    text: str
+    computed_at: float
+    error: Optional[str] = None
+
+    @property
+    def age(self) -> float:
+        """Seconds since the report was computed."""
+        return time.time() - self.computed_at
+
+    def age_text(self) -> str:
+        """Human-readable age, e.g. "just now" or "12 min ago"."""
+        age = self.age
+        if age < 60:
+            return "just now"
+        if age < 3600:
+            return f"{int(age // 60)} min ago"
+        return f"{age / 3600:.1f} h ago"
+
+
+class ReportSnapshotStore:
+    """
+    Keeps the latest snapshot of each registered report.
+
+    Reports are async functions returning the message text; they are
+    recomputed on a schedule, after writes (refresh_soon) or on demand.
+    Concurrent refreshes of the same report share one computation, and a
+    failed refresh (text starting with ❌ or an exception) keeps serving the
+    previous good snapshot.
+
+    Example:
+        store = ReportSnapshotStore({"summary": get_time_summary_tables})
+        store.schedule(app.job_queue, interval=900)
+        snapshot = await store.get_or_refresh("summary")
+    """
+
+    def __init__(self, reports: Dict[str, Callable[[], Awaitable[str]]]):
+        """
+        Initialize the store.
+
+        Args:
+            reports: Mapping of report name to async function producing its text
+        """
+        self.reports = reports
+        # Set when no refresh jobs run in this process: snapshots older than this refresh on use
+        self.max_age: Optional[float] = None
+        self._snapshots: Dict[str, ReportSnapshot] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+    def get(self, name: str) -> Optional[ReportSnapshot]:
+        """Return the latest snapshot of a report, or None if never computed."""
+        return self._snapshots.get(name)
+
+    async def refresh(self, name: str) -> ReportSnapshot:
+        """Recompute a report now (joining a refresh already in progress)."""
+        task = self._refreshing.get(name)
+        if task is None or task.done():
+            task = asyncio.get_running_loop().create_task(self._compute(name))
+            self._refreshing[name] = task
+        return await asyncio.shield(task)
+
+    async def _compute(self, name: str) -> ReportSnapshot:
+        try:
+            text = await self.reports[name]()
+            error = text if text.startswith("❌") else None
+        except Exception as e:
+            text, error = f"❌ Error: {str(e)}", str(e)
+
+        previous = self._snapshots.get(name)
+        if error and previous is not None and previous.error is None:
+            # Keep serving the last good report, but remember the failure
+            previous.error = error
+            return previous
+
+        snapshot = ReportSnapshot(text=text, computed_at=time.time(), error=error)
+        self._snapshots[name] = snapshot
+        return snapshot
+
+    async def get_or_refresh(self, name: str) -> ReportSnapshot:
+        """
+        Return the latest snapshot, computing it first if there is none.
+
+        Without refresh jobs (see schedule), a snapshot older than max_age is
+        still returned but refreshed in the background for the next request.
+        """
+        snapshot = self._snapshots.get(name)
+        if snapshot is not None and snapshot.error is None:
+            if self.max_age is not None and snapshot.age > self.max_age:
+                self.refresh_soon(name)
+            return snapshot
+        return await self.refresh(name)
+
+    def clear(self):
+        """Forget every snapshot, so the next request computes the report again."""
+        self._snapshots.clear()
+
+    def refresh_soon(self, *names: str):
+        """Schedule a background refresh, e.g. after a write changed the data."""
+        for name in names or tuple(self.reports):
+            if name in self.reports:
+                asyncio.get_running_loop().create_task(self.refresh(name))
+
+    async def _refresh_job(self, context: ContextTypes.DEFAULT_TYPE):
+        await self.refresh(context.job.data)
+
+    def schedule(self, job_queue: Optional[JobQueue], interval: float, first: float = 5, jobs: bool = True):
+        """
+        Refresh every report on the JobQueue.
+
+        Args:
+            job_queue: The Application's job queue (None if the job-queue extra is missing)
+            interval: Seconds between refreshes
+            first: Seconds after startup for the first refresh
+            jobs: Run the refresh jobs in this process (only one worker process
+                  should); otherwise reports refresh on use once older than interval
+        """
+        if job_queue is None and jobs:
+            print("⚠️  JobQueue unavailable (pip install 'python-telegram-bot[job-queue]'), "
+                  "reports will be computed on first use")
+
+        if job_queue is None or not jobs:
+            self.max_age = interval
+            return
+
+        for index, name in enumerate(self.reports):
+            # Stagger reports so they do not hit Odoo at the same moment
+            job_queue.run_repeating(
+                self._refresh_job,
+                interval=interval,
+                first=first + index * 5,
+                data=name,
+                name=f"report:{name}",
+            )
@@ -0,0 +1,172 @@
+"""
+System Metrics Sampler
+Records CPU, memory, disk and network usage in the background so /status
+can answer instantly
+"""
+
+import os
+import time
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional, Tuple
+
+import psutil
+
+
+@dataclass
+class SystemSample:
+    """One reading of system usage."""
+    timestamp: float
+    cpu_percent: float
+    memory_percent: float
+    memory_used: int
+    memory_total: int
+    disk_percent: float
+    disk_used: int
+    disk_total: int
+    net_sent_per_sec: float
+    net_recv_per_sec: float
+
+
+# Fields summarized by SystemMetricsSampler.summary()
+SUMMARY_FIELDS = ("cpu_percent", "memory_percent", "disk_percent", "net_sent_per_sec", "net_recv_per_sec")
+
+
+class SystemMetricsSampler:
+    """
+    Background task sampling system usage into a fixed-size ring buffer.
+
+    psutil.cpu_percent() is called without an interval, so it reports the
+    usage since the previous sample instead of sleeping; disk and network
+    counters are read on a worker thread. Nothing here blocks the event loop.
+    """
+
+    def __init__(self, interval: Optional[float] = None, window: Optional[float] = None, disk_path: str = "/"):
+        """
+        Initialize the sampler.
+
+        Args:
+            interval: Seconds between samples (reads SYSTEM_METRICS_INTERVAL, defaults to 10;
+                      0 disables background sampling and every reading is taken on demand)
+            window: Seconds of history kept (reads SYSTEM_METRICS_WINDOW, defaults to 3600)
+            disk_path: Mount point whose usage is reported
+        """
+        self.interval = interval if interval is not None else float(os.getenv('SYSTEM_METRICS_INTERVAL') or 10)
+        self.window = window if window is not None else float(os.getenv('SYSTEM_METRICS_WINDOW') or 3600)
+        self.disk_path = disk_path
+
+        # Disabled: no history, only the latest on-demand sample is kept
+        history = int(self.window / self.interval) if self.enabled else 1
+        self.samples: Deque[SystemSample] = deque(maxlen=max(1, history))
+        self._task: Optional[asyncio.Task] = None
+        self._last_net: Optional[Tuple[float, int, int]] = None
+
+        # The first cpu_percent(None) call only sets the baseline
+        psutil.cpu_percent(interval=None)
+
+    def sample(self) -> SystemSample:
+        """Take one sample now and add it to the buffer."""
+        now = time.time()
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage(self.disk_path)
+        net = psutil.net_io_counters()
+
+        sent_rate = recv_rate = 0.0
+        if self._last_net is not None:
+            last_time, last_sent, last_recv = self._last_net
+            elapsed = max(now - last_time, 1e-6)
+            sent_rate = max(0, net.bytes_sent - last_sent) / elapsed
+            recv_rate = max(0, net.bytes_recv - last_recv) / elapsed
+        self._last_net = (now, net.bytes_sent, net.bytes_recv)
+
+        sample = SystemSample(
+            timestamp=now,
+            cpu_percent=psutil.cpu_percent(interval=None),
+            memory_percent=memory.percent,
+            memory_used=memory.used,
+            memory_total=memory.total,
+            disk_percent=disk.percent,
+            disk_used=disk.used,
+            disk_total=disk.total,
+            net_sent_per_sec=sent_rate,
+            net_recv_per_sec=recv_rate,
+        )
+        self.samples.append(sample)
+        return sample
+
+    @property
+    def enabled(self) -> bool:
+        """Whether samples are taken in the background."""
+        return self.interval > 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start sampling on the running event loop (does nothing when disabled)."""
+        if self.enabled and not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def stop(self):
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.sample)
+            except Exception as e:
+                print(f"⚠️ System metrics sample failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def latest(self) -> SystemSample:
+        """Return the newest sample, taking one now if the buffer is empty or sampling is disabled."""
+        if self.enabled and self.samples:
+            return self.samples[-1]
+        return self.sample()
+
+    def summary(self, seconds: Optional[float] = None) -> Dict[str, Tuple[float, float, float]]:
+        """
+        Summarize the samples of the last seconds.
+
+        Args:
+            seconds: Time span to cover (defaults to the whole buffer)
+
+        Returns:
+            Mapping of field name to (min, avg, max); empty if there are no samples
+            or sampling is disabled
+        """
+        if not self.enabled:
+            return {}
+
+        since = time.time() - seconds if seconds else 0.0
+        recent = [sample for sample in self.samples if sample.timestamp >= since]
+        if not recent:
+            return {}
+
+        result = {}
+        for field in SUMMARY_FIELDS:
+            values = [getattr(sample, field) for sample in recent]
+            result[field] = (min(values), sum(values) / len(values), max(values))
+        return result
+
+
+_sampler: Optional[SystemMetricsSampler] = None
+
+
+def get_system_sampler() -> SystemMetricsSampler:
+    """Get the process-wide system metrics sampler."""
+    global _sampler
+
+    if _sampler is None:
+        _sampler = SystemMetricsSampler()
+
+    return _sampler
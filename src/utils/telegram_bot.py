@@ -5,25 +5,54 @@ Provides functionality to send notifications and messages to Telegram
 
 import os
 import asyncio
-from typing import Optional
+import itertools
+import threading
+from concurrent.futures import Future
+from typing import Optional, List, Tuple, Dict, Any, Iterable, Union
 from dotenv import load_dotenv
-from telegram import Bot
+from telegram.constants import MessageLimit
 from telegram.error import TelegramError
+from telegram.ext import ExtBot
+from telegram.request import HTTPXRequest
+
+from .rate_limiter import TelegramRateLimiter, PRIORITY_NORMAL, PRIORITY_URGENT
+
+# Queued message: (priority, sequence, chat_id, text, parse_mode, result future)
+_QueuedMessage = Tuple[int, int, str, str, Optional[str], Future]
 
 
 class TelegramNotifier:
     """
     A class to handle Telegram bot connections and message sending.
     Ideal for sending notifications from cron jobs or other automated processes.
+
+    For bursts of messages, use it as a long-lived notifier: start() runs a
+    background event loop that keeps one HTTP connection pool open and drains
+    an internal send queue. Messages queued with enqueue() within
+    ``coalesce_window`` seconds of each other are merged into one message.
+
+    Example:
+        with TelegramNotifier(coalesce_window=2.0) as notifier:
+            for alert in alerts:
+                notifier.enqueue(alert)
+        # leaving the block flushes the queue and closes the connection
     """
 
-    def __init__(self, bot_token: Optional[str] = None, chat_id: Optional[str] = None):
+    def __init__(
+        self,
+        bot_token: Optional[str] = None,
+        chat_id: Optional[str] = None,
+        coalesce_window: float = 0.0,
+        connection_pool_size: int = 8
+    ):
         """
         Initialize the Telegram bot connection.
 
         Args:
             bot_token: Telegram bot token (if not provided, reads from TELEGRAM_BOT_TOKEN env var)
             chat_id: Chat ID to send messages to (if not provided, reads from TELEGRAM_CHAT_ID env var)
+            coalesce_window: Seconds to wait for more queued messages to merge into one (0 disables)
+            connection_pool_size: Number of HTTP connections kept open to the Bot API
         """
         load_dotenv()
 
@@ -36,26 +65,55 @@ class TelegramNotifier:
         if not self.chat_id:
             raise ValueError("Chat ID not provided. Set TELEGRAM_CHAT_ID environment variable or pass chat_id parameter.")
 
-        self.bot = Bot(token=self.bot_token)
+        self.coalesce_window = coalesce_window
+        self.connection_pool_size = connection_pool_size
+
+        # Sends are scheduled within Telegram's rate limits, with retries on flood control
+        self.bot = ExtBot(
+            token=self.bot_token,
+            request=HTTPXRequest(connection_pool_size=connection_pool_size),
+            rate_limiter=TelegramRateLimiter()
+        )
 
-    async def send_message(self, message: str, parse_mode: Optional[str] = None) -> bool:
+        # Background loop state (long-lived mode)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._sender_task: Optional[asyncio.Task] = None
+        self._sequence = itertools.count()
+        # enqueue() starts the loop on first use, possibly from several threads at once
+        self._start_lock = threading.Lock()
+
+    async def send_message(
+        self,
+        message: str,
+        parse_mode: Optional[str] = None,
+        chat_id: Optional[str] = None,
+        priority: int = PRIORITY_NORMAL
+    ) -> bool:
         """
         Send a message to the configured chat.
 
         Args:
             message: The message text to send
             parse_mode: Optional parse mode ('Markdown', 'MarkdownV2', or 'HTML')
+            chat_id: Chat to send to (defaults to the configured chat)
+            priority: PRIORITY_URGENT, PRIORITY_NORMAL or PRIORITY_BULK; urgent
+                      messages overtake bulk ones when rate-limited
 
         Returns:
             bool: True if message was sent successfully, False otherwise
         """
+        chat_id = chat_id or self.chat_id
+
         try:
             await self.bot.send_message(
-                chat_id=self.chat_id,
+                chat_id=chat_id,
                 text=message,
-                parse_mode=parse_mode
+                parse_mode=parse_mode,
+                rate_limit_args={"priority": priority}
             )
-            print(f"✓ Message sent successfully to chat {self.chat_id}")
+            print(f"✓ Message sent successfully to chat {chat_id}")
             return True
         except TelegramError as e:
             print(f"✗ Failed to send message: {e}")
@@ -78,19 +136,26 @@ class TelegramNotifier:
             print(f"✗ Connection failed: {e}")
             return False
 
-    def send_sync(self, message: str, parse_mode: Optional[str] = None) -> bool:
+    def send_sync(self, message: str, parse_mode: Optional[str] = None, priority: int = PRIORITY_NORMAL) -> bool:
         """
         Synchronous wrapper for send_message.
         Useful for calling from non-async code.
 
+        If the notifier was started, the message is sent on the background
+        loop and reuses its open connection instead of creating a new loop.
+
         Args:
             message: The message text to send
             parse_mode: Optional parse mode ('Markdown', 'MarkdownV2', or 'HTML')
+            priority: PRIORITY_URGENT, PRIORITY_NORMAL or PRIORITY_BULK
 
         Returns:
             bool: True if message was sent successfully, False otherwise
         """
-        return asyncio.run(self.send_message(message, parse_mode))
+        send = self.send_message(message, parse_mode, priority=priority)
+        if self.is_running:
+            return asyncio.run_coroutine_threadsafe(send, self._loop).result()
+        return asyncio.run(send)
 
     def test_connection_sync(self) -> bool:
         """
@@ -102,9 +167,252 @@ class TelegramNotifier:
         """
         return asyncio.run(self.test_connection())
 
+    async def broadcast(
+        self,
+        message: str,
+        chat_ids: Iterable[Union[int, str]],
+        parse_mode: Optional[str] = None,
+        priority: int = PRIORITY_NORMAL
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Send the same message to many chats concurrently.
+
+        Requests share the notifier's connection pool (at most
+        connection_pool_size in flight) and go through the rate limiter, so a
+        large fan-out stays within Telegram's global and per-chat limits.
+
+        Args:
+            message: The message text to send
+            chat_ids: Chats to send to (duplicates are sent once)
+            parse_mode: Optional parse mode ('Markdown', 'MarkdownV2', or 'HTML')
+            priority: PRIORITY_URGENT, PRIORITY_NORMAL or PRIORITY_BULK
+
+        Returns:
+            Dict mapping each chat ID (as str) to {"ok": bool, "error": str or None}
+        """
+        recipients = list(dict.fromkeys(str(chat_id) for chat_id in chat_ids))
+        in_flight = asyncio.Semaphore(self.connection_pool_size)
+
+        async def deliver(chat_id: str) -> Tuple[str, Dict[str, Any]]:
+            async with in_flight:
+                try:
+                    await self.bot.send_message(
+                        chat_id=chat_id,
+                        text=message,
+                        parse_mode=parse_mode,
+                        rate_limit_args={"priority": priority}
+                    )
+                    return chat_id, {"ok": True, "error": None}
+                except TelegramError as e:
+                    return chat_id, {"ok": False, "error": str(e)}
+
+        results = dict(await asyncio.gather(*(deliver(chat_id) for chat_id in recipients)))
+
+        delivered = sum(1 for result in results.values() if result["ok"])
+        print(f"✓ Broadcast delivered to {delivered}/{len(recipients)} chats")
+        return results
+
+    def broadcast_sync(
+        self,
+        message: str,
+        chat_ids: Iterable[Union[int, str]],
+        parse_mode: Optional[str] = None,
+        priority: int = PRIORITY_NORMAL
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Synchronous wrapper for broadcast.
+        Useful for calling from non-async code.
+
+        Returns:
+            Dict mapping each chat ID (as str) to {"ok": bool, "error": str or None}
+        """
+        fan_out = self.broadcast(message, chat_ids, parse_mode, priority)
+        if self.is_running:
+            return asyncio.run_coroutine_threadsafe(fan_out, self._loop).result()
+        return asyncio.run(fan_out)
+
+    # ============================================
+    # LONG-LIVED MODE
+    # ============================================
+
+    @property
+    def is_running(self) -> bool:
+        """True if the background loop is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "TelegramNotifier":
+        """
+        Start the background loop and open the connection pool.
+
+        Returns:
+            self, so it can be chained: notifier = TelegramNotifier().start()
+        """
+        with self._start_lock:
+            if not self.is_running:
+                self._start_loop()
+        return self
+
+    def _start_loop(self):
+        ready = threading.Event()
+        errors: List[BaseException] = []
+        self._loop = asyncio.new_event_loop()
+
+        def run_loop():
+            asyncio.set_event_loop(self._loop)
+            try:
+                self._loop.run_until_complete(self._open())
+            except BaseException as e:
+                errors.append(e)
+                return
+            finally:
+                ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run_loop, name="telegram-notifier", daemon=True)
+        self._thread.start()
+        ready.wait()
+
+        if errors:
+            self._thread.join()
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+            raise errors[0]
+
+    async def _open(self):
+        await self.bot.initialize()
+        self._queue = asyncio.PriorityQueue()
+        self._sender_task = asyncio.create_task(self._sender())
+
+    def enqueue(
+        self,
+        message: str,
+        parse_mode: Optional[str] = None,
+        chat_id: Optional[str] = None,
+        priority: int = PRIORITY_NORMAL
+    ) -> Future:
+        """
+        Queue a message for sending without waiting for it.
+
+        Starts the background loop on first use. Queued urgent messages are
+        sent before queued bulk ones.
+
+        Args:
+            message: The message text to send
+            parse_mode: Optional parse mode ('Markdown', 'MarkdownV2', or 'HTML')
+            chat_id: Chat to send to (defaults to the configured chat)
+            priority: PRIORITY_URGENT, PRIORITY_NORMAL or PRIORITY_BULK
+
+        Returns:
+            Future resolving to True once the message (or the coalesced message
+            containing it) was sent, False if sending failed
+        """
+        self.start()
+
+        result: Future = Future()
+        item = (priority, next(self._sequence), chat_id or self.chat_id, message, parse_mode, result)
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, item)
+        return result
+
+    async def _sender(self):
+        """Drain the queue, merging messages that arrive within the coalesce window."""
+        while True:
+            first = await self._queue.get()
+            batch: List[_QueuedMessage] = [first]
+
+            if self.coalesce_window > 0:
+                deadline = self._loop.time() + self.coalesce_window
+                while True:
+                    remaining = deadline - self._loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+
+            try:
+                try:
+                    messages = _coalesce(sorted(batch))
+                except Exception as e:
+                    print(f"⚠️ Could not merge queued messages, sending them one by one: {e}")
+                    messages = [(priority, chat_id, text, parse_mode, [future])
+                                for priority, _, chat_id, text, parse_mode, future in batch]
+
+                for priority, chat_id, text, parse_mode, futures in messages:
+                    # Any failure only fails this message: the sender must keep draining the queue
+                    try:
+                        sent = await self.send_message(text, parse_mode, chat_id=chat_id, priority=priority)
+                    except Exception as e:
+                        print(f"✗ Failed to send message: {e}")
+                        sent = False
+                    for future in futures:
+                        if not future.done():
+                            future.set_result(sent)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def flush(self, timeout: Optional[float] = None):
+        """Block until every queued message has been sent."""
+        if not self.is_running:
+            return
+        asyncio.run_coroutine_threadsafe(self._queue.join(), self._loop).result(timeout)
+
+    def close(self, timeout: Optional[float] = None):
+        """Flush the queue, close the connection pool and stop the background loop."""
+        if not self.is_running:
+            return
+
+        self.flush(timeout)
+        asyncio.run_coroutine_threadsafe(self._close(), self._loop).result(timeout)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        self._loop.close()
+
+        self._loop = None
+        self._thread = None
+        self._queue = None
+
+    async def _close(self):
+        self._sender_task.cancel()
+        try:
+            await self._sender_task
+        except asyncio.CancelledError:
+            pass
+        await self.bot.shutdown()
+
+    def __enter__(self) -> "TelegramNotifier":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _coalesce(batch: List[_QueuedMessage]) -> List[Tuple[int, str, str, Optional[str], List[Future]]]:
+    """
+    Merge consecutive queued messages for the same priority, chat and parse mode.
+
+    Merged texts are separated by a blank line and never exceed Telegram's
+    message length limit.
+    """
+    merged: List[Tuple[int, str, str, Optional[str], List[Future]]] = []
+
+    for priority, _, chat_id, text, parse_mode, future in batch:
+        if merged:
+            last_priority, last_chat, last_text, last_mode, futures = merged[-1]
+            combined = f"{last_text}\n\n{text}"
+            same_target = (last_priority, last_chat, last_mode) == (priority, chat_id, parse_mode)
+            if same_target and len(combined) <= MessageLimit.MAX_TEXT_LENGTH:
+                merged[-1] = (priority, chat_id, combined, parse_mode, futures + [future])
+                continue
+        merged.append((priority, chat_id, text, parse_mode, [future]))
+
+    return merged
+
 
 async def main():
-    """Example usage of the TelegramNotifier class."""
+    """Example usage of the TelegramNotifier class (run with python -m src.utils.telegram_bot)."""
     try:
         # Initialize the notifier
         notifier = TelegramNotifier()
@@ -112,9 +420,9 @@ async def main():
         # Test the connection
         print("\n=== Testing Connection ===")
         if await notifier.test_connection():
-            # Send a test message
+            # Send a test message; urgent messages skip ahead of queued bulk ones
             print("\n=== Sending Test Message ===")
-            await notifier.send_message("🤖 Telegram bot connection successful!")
+            await notifier.send_message("🤖 Telegram bot connection successful!", priority=PRIORITY_URGENT)
     except ValueError as e:
         print(f"Configuration error: {e}")
         print("\nPlease create a .env file with:")
@@ -4,11 +4,32 @@ Listens for commands sent to your bot and executes actions
 """
 
 import os
+import ssl
 import asyncio
-from typing import Optional, Callable, Dict
+from urllib.parse import urlsplit
+from typing import Optional, Callable, Dict, Any, List, Tuple
 from dotenv import load_dotenv
 from telegram import Update
-from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
+from telegram.helpers import escape_markdown
+from telegram.ext import Application, BasePersistence, CommandHandler, MessageHandler, filters, ContextTypes
+
+from .rate_limiter import TelegramRateLimiter
+from .update_processor import ChatOrderedUpdateProcessor
+from .persistence import build_persistence
+from .system_metrics import get_system_sampler
+from .metrics import (
+    HANDLER_ERRORS,
+    HANDLER_LATENCY,
+    ODOO_CALL_ERRORS,
+    ODOO_CALL_LATENCY,
+    ODOO_RPC_LATENCY,
+    OPENAI_ERRORS,
+    OPENAI_LATENCY,
+    VOICE_INTENTS,
+    MetricsServer,
+    instrument_handler,
+    summarize,
+)
 
 
 class TelegramCommandBot:
@@ -17,12 +38,28 @@ class TelegramCommandBot:
     You send commands to your bot, and it responds or triggers actions.
     """
 
-    def __init__(self, bot_token: Optional[str] = None):
+    def __init__(
+        self,
+        bot_token: Optional[str] = None,
+        mode: Optional[str] = None,
+        rate_limiter: Optional[TelegramRateLimiter] = None,
+        concurrent_updates: Optional[int] = None,
+        persistence: Optional[BasePersistence] = None,
+        persistent: bool = True
+    ):
         """
         Initialize the command bot.
 
         Args:
             bot_token: Telegram bot token (reads from TELEGRAM_BOT_TOKEN env var if not provided)
+            mode: 'polling' or 'webhook' (reads from TELEGRAM_MODE env var, defaults to polling)
+            rate_limiter: Rate limiter for replies (defaults to a TelegramRateLimiter configured from env)
+            concurrent_updates: Updates handled at once (reads TELEGRAM_CONCURRENT_UPDATES, defaults to 8;
+                                1 handles updates strictly one at a time)
+            persistence: Where user_data and conversation states are kept across restarts
+                         (defaults to the backend configured by TELEGRAM_PERSISTENCE)
+            persistent: Set to False to keep no state at all, e.g. for a process that
+                        only forwards updates
         """
         load_dotenv()
 
@@ -31,8 +68,53 @@ class TelegramCommandBot:
         if not self.bot_token:
             raise ValueError("Bot token not provided. Set TELEGRAM_BOT_TOKEN environment variable.")
 
-        self.app = Application.builder().token(self.bot_token).build()
+        self.mode = (mode or os.getenv('TELEGRAM_MODE', 'polling')).lower()
+
+        if self.mode not in ("polling", "webhook"):
+            raise ValueError(f"Unknown TELEGRAM_MODE '{self.mode}'. Use 'polling' or 'webhook'.")
+
+        self.webhook_settings = load_webhook_settings() if self.mode == "webhook" else None
+
+        concurrent_updates = concurrent_updates or int(os.getenv('TELEGRAM_CONCURRENT_UPDATES', '8'))
+
+        # All replies go through the rate limiter (flood limits, retry_after, retries)
+        builder = Application.builder().token(self.bot_token).rate_limiter(rate_limiter or TelegramRateLimiter())
+
+        # Self-hosted Bot API server (or a local fake for benchmarks)
+        api_base_url = os.getenv('TELEGRAM_API_BASE_URL', '').rstrip('/')
+        if api_base_url:
+            builder = builder.base_url(f"{api_base_url}/bot").base_file_url(f"{api_base_url}/file/bot")
+
+        if concurrent_updates > 1:
+            # Chats run concurrently, each chat's updates stay in order
+            self.update_processor = ChatOrderedUpdateProcessor(max_concurrent_updates=concurrent_updates)
+            builder = builder.concurrent_updates(self.update_processor)
+        else:
+            self.update_processor = None
+
+        self.persistence = (persistence or build_persistence()) if persistent else None
+        if self.persistence is not None:
+            builder = builder.persistence(self.persistence)
+
+        # Startup and shutdown hooks run around polling/webhook serving (and in every worker)
+        builder = builder.post_init(self._run_startup_tasks).post_shutdown(self._run_shutdown_tasks)
+
+        self.app = builder.build()
         self.commands: Dict[str, Callable] = {}
+        self._startup_tasks: List[Tuple[Callable, bool]] = []
+        self._shutdown_tasks: List[Callable] = []
+        self._background_tasks: List[asyncio.Task] = []
+
+        # Sample system usage in the background so /status never blocks
+        if float(os.getenv('SYSTEM_METRICS_INTERVAL') or 10) > 0:
+            self.add_startup_task(_start_system_sampler, background=False)
+            self.add_shutdown_task(_stop_system_sampler)
+
+        # Prometheus metrics endpoint (off unless METRICS_PORT is set)
+        self.metrics_server = MetricsServer() if int(os.getenv('METRICS_PORT') or 0) else None
+        if self.metrics_server is not None:
+            self.add_startup_task(self._start_metrics_server, background=False)
+            self.add_shutdown_task(self._stop_metrics_server)
 
     def add_command(self, command: str, handler: Callable):
         """
@@ -50,7 +132,7 @@ class TelegramCommandBot:
             bot.add_command("hello", hello_handler)
         """
         self.commands[command] = handler
-        self.app.add_handler(CommandHandler(command, handler))
+        self.app.add_handler(CommandHandler(command, instrument_handler(handler, f"/{command}")))
         print(f"✓ Registered command: /{command}")
 
     def add_message_handler(self, handler: Callable):
@@ -61,9 +143,65 @@ class TelegramCommandBot:
             handler: Async function to handle messages
                      Should accept (update: Update, context: ContextTypes.DEFAULT_TYPE)
         """
-        self.app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handler))
+        self.app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, instrument_handler(handler)))
         print(f"✓ Registered message handler")
 
+    def add_startup_task(self, task: Callable, background: bool = True):
+        """
+        Run an async function when the bot starts.
+
+        Args:
+            task: Async function accepting the Application
+            background: Run alongside polling startup instead of delaying it
+                        (errors are printed, not raised)
+
+        Example:
+            async def warm_up(app):
+                await load_caches()
+
+            bot.add_startup_task(warm_up)
+        """
+        self._startup_tasks.append((task, background))
+
+    def add_shutdown_task(self, task: Callable):
+        """Run an async function accepting the Application when the bot stops."""
+        self._shutdown_tasks.append(task)
+
+    async def _run_startup_tasks(self, app: Application):
+        for task, background in self._startup_tasks:
+            if background:
+                self._background_tasks.append(asyncio.create_task(self._run_background(task, app)))
+            else:
+                await task(app)
+
+    async def _run_background(self, task: Callable, app: Application):
+        try:
+            await task(app)
+        except Exception as e:
+            print(f"⚠️ Startup task {task.__name__} failed: {e}")
+
+    async def _start_metrics_server(self, app: Application):
+        server = self.metrics_server
+        try:
+            server.start()
+            print(f"✓ Metrics on http://{server.host}:{server.port}/metrics")
+        except OSError as e:
+            print(f"⚠️ Metrics endpoint disabled, could not listen on {server.host}:{server.port}: {e}")
+
+    async def _stop_metrics_server(self, app: Application):
+        self.metrics_server.stop()
+
+    async def _run_shutdown_tasks(self, app: Application):
+        for background_task in self._background_tasks:
+            background_task.cancel()
+        self._background_tasks.clear()
+
+        for task in self._shutdown_tasks:
+            try:
+                await task(app)
+            except Exception as e:
+                print(f"⚠️ Shutdown task {task.__name__} failed: {e}")
+
     def run(self):
         """
         Start the bot and begin listening for commands.
@@ -75,9 +213,142 @@ class TelegramCommandBot:
             print(f"📝 Registered commands: {', '.join(['/' + cmd for cmd in self.commands.keys()])}")
         print("\nPress Ctrl+C to stop\n")
 
+        if self.mode == "webhook":
+            settings = self.webhook_settings
+            print(f"🌐 Webhook listening on {settings['listen']}:{settings['port']}/{settings['url_path']}")
+
+            if not settings["webhook_url"]:
+                # Telegram only accepts public HTTPS URLs, so there is nothing to register
+                print("⚠️ TELEGRAM_WEBHOOK_URL is empty: not registering the webhook with Telegram, "
+                      "send updates with src/scripts/send_fake_update.py")
+                asyncio.run(self._serve_unregistered_webhook(settings))
+                return
+
+            # Telegram pushes updates to us; requests without the secret token are rejected
+            self.app.run_webhook(allowed_updates=Update.ALL_TYPES, **settings)
+            return
+
         # Run the bot with polling
         self.app.run_polling(allowed_updates=Update.ALL_TYPES)
 
+    async def _serve_unregistered_webhook(self, settings: Dict[str, Any]):
+        """
+        Serve the webhook endpoint without calling setWebhook, for local testing.
+
+        Uses the same request handler as run_webhook (secret token check
+        included), so handlers see exactly what they would behind Telegram.
+        """
+        # python-telegram-bot's own webhook server (pinned version, see requirements.txt)
+        from telegram.ext._utils.webhookhandler import WebhookAppClass, WebhookServer
+
+        ssl_ctx = None
+        if settings["cert"] and settings["key"]:
+            ssl_ctx = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+            ssl_ctx.load_cert_chain(settings["cert"], settings["key"])
+
+        app = self.app
+        webhook_app = WebhookAppClass(f"/{settings['url_path']}", app.bot, app.update_queue, settings["secret_token"])
+        server = WebhookServer(settings["listen"], settings["port"], webhook_app, ssl_ctx)
+
+        async with app:
+            if app.post_init:
+                await app.post_init(app)
+
+            await app.start()
+            try:
+                await server.serve_forever()
+                # Until Ctrl+C cancels us
+                await asyncio.Event().wait()
+            finally:
+                await server.shutdown()
+                await app.stop()
+
+                if app.post_stop:
+                    await app.post_stop(app)
+
+        if app.post_shutdown:
+            await app.post_shutdown(app)
+
+
+def load_webhook_settings() -> Dict[str, Any]:
+    """
+    Read webhook configuration from the environment.
+
+    TELEGRAM_WEBHOOK_SECRET is required: Telegram sends it in the
+    X-Telegram-Bot-Api-Secret-Token header and requests without it are rejected.
+    Set TELEGRAM_WEBHOOK_CERT/KEY to serve HTTPS directly, or leave them empty
+    when a reverse proxy terminates TLS. Without TELEGRAM_WEBHOOK_URL the
+    endpoint is served but not registered with Telegram (local testing).
+
+    Returns:
+        Keyword arguments for Application.run_webhook
+    """
+    secret_token = os.getenv('TELEGRAM_WEBHOOK_SECRET')
+    if not secret_token:
+        raise ValueError("Webhook mode needs a secret. Set TELEGRAM_WEBHOOK_SECRET environment variable.")
+
+    url_path = os.getenv('TELEGRAM_WEBHOOK_PATH', 'telegram').strip('/')
+    webhook_url = os.getenv('TELEGRAM_WEBHOOK_URL') or None
+    if webhook_url:
+        webhook_url = webhook_url.rstrip('/')
+        # Append the path unless the URL already ends with it (whole segments, not characters)
+        path_segments = url_path.split('/') if url_path else []
+        url_segments = urlsplit(webhook_url).path.strip('/').split('/')
+        if path_segments and url_segments[-len(path_segments):] != path_segments:
+            webhook_url = f"{webhook_url}/{url_path}"
+
+    return {
+        "listen": os.getenv('TELEGRAM_WEBHOOK_LISTEN', '127.0.0.1'),
+        "port": int(os.getenv('TELEGRAM_WEBHOOK_PORT', '8443')),
+        "url_path": url_path,
+        "webhook_url": webhook_url,
+        "secret_token": secret_token,
+        "cert": os.getenv('TELEGRAM_WEBHOOK_CERT') or None,
+        "key": os.getenv('TELEGRAM_WEBHOOK_KEY') or None,
+    }
+
+
+async def _start_system_sampler(app: Application):
+    get_system_sampler().start()
+
+
+async def _stop_system_sampler(app: Application):
+    await get_system_sampler().stop()
+
+
+# Readiness of slow-to-start components (e.g. Odoo warm-up), shown by /status
+_readiness: Dict[str, str] = {}
+
+
+def set_readiness(component: str, state: str):
+    """
+    Record the startup state of a component.
+
+    Args:
+        component: Name shown in /status, e.g. "Odoo"
+        state: Short state text, e.g. "⏳ warming up" or "✅ ready"
+    """
+    _readiness[component] = state
+
+
+def get_readiness() -> Dict[str, str]:
+    """Return the recorded startup states by component."""
+    return dict(_readiness)
+
+
+def is_admin(update: Update) -> bool:
+    """
+    Check whether the sender of an update may run admin commands.
+
+    Admins are the user IDs listed in TELEGRAM_ADMIN_IDS (comma-separated);
+    if that is not set, the owner chat from TELEGRAM_CHAT_ID is the only admin.
+    """
+    admin_ids = os.getenv('TELEGRAM_ADMIN_IDS') or os.getenv('TELEGRAM_CHAT_ID') or ''
+    allowed = {item.strip() for item in admin_ids.split(',') if item.strip()}
+
+    user = update.effective_user
+    return user is not None and str(user.id) in allowed
+
 
 # Built-in command handlers for common use cases
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -118,15 +389,20 @@ async def echo_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 # Example: System status command
 async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Get basic system status"""
+    """Get basic system status: /status [minutes] (answers from the background sampler)"""
     import platform
     import psutil
     from datetime import datetime
 
     try:
-        cpu_percent = psutil.cpu_percent(interval=1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
+        minutes = float(context.args[0]) if context.args else 15.0
+    except ValueError:
+        await update.message.reply_text("❌ Usage: /status [minutes]")
+        return
+
+    try:
+        sampler = get_system_sampler()
+        sample = sampler.latest()
         boot_time = datetime.fromtimestamp(psutil.boot_time())
         uptime = datetime.now() - boot_time
 
@@ -134,18 +410,82 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 📊 *System Status*
 
 💻 Platform: {platform.system()} {platform.release()}
-🔧 CPU Usage: {cpu_percent}%
-💾 Memory: {memory.percent}% used ({memory.used // (1024**3)}GB / {memory.total // (1024**3)}GB)
-💿 Disk: {disk.percent}% used ({disk.used // (1024**3)}GB / {disk.total // (1024**3)}GB)
+🔧 CPU Usage: {sample.cpu_percent}%
+💾 Memory: {sample.memory_percent}% used ({sample.memory_used // (1024**3)}GB / {sample.memory_total // (1024**3)}GB)
+💿 Disk: {sample.disk_percent}% used ({sample.disk_used // (1024**3)}GB / {sample.disk_total // (1024**3)}GB)
+🌐 Network: ↑ {sample.net_sent_per_sec / 1024:.0f} KB/s ↓ {sample.net_recv_per_sec / 1024:.0f} KB/s
 ⏱ Uptime: {uptime.days} days, {uptime.seconds // 3600} hours
 
 ✅ All systems operational
 """
+        summary = sampler.summary(minutes * 60)
+        if summary:
+            labels = [
+                ("cpu_percent", "CPU", "%", 1),
+                ("memory_percent", "Memory", "%", 1),
+                ("disk_percent", "Disk", "%", 1),
+                ("net_sent_per_sec", "Net ↑", " KB/s", 1024),
+                ("net_recv_per_sec", "Net ↓", " KB/s", 1024),
+            ]
+            status_message += f"\n📈 *Last {minutes:g} min* (min / avg / max)\n"
+            for field, label, unit, scale in labels:
+                low, avg, high = (value / scale for value in summary[field])
+                status_message += f"{label}: {low:.0f} / {avg:.0f} / {high:.0f}{unit}\n"
+
+        readiness = get_readiness()
+        if readiness:
+            status_message += "\n🧩 *Components*\n"
+            status_message += "\n".join(
+                f"{escape_markdown(name)}: {escape_markdown(state)}" for name, state in readiness.items()
+            )
+            status_message += "\n"
         await update.message.reply_text(status_message, parse_mode="Markdown")
     except Exception as e:
         await update.message.reply_text(f"❌ Error getting status: {str(e)}")
 
 
+def _stats_table(title: str, rows: List[Dict[str, Any]], rpcs: Optional[Dict[str, int]] = None, limit: int = 15) -> str:
+    if not rows:
+        return ""
+
+    lines = [f"*{title}*", "```"]
+    header = f"{'':<24} {'calls':>6} {'err':>4} {'p50':>6} {'p95':>6}"
+    lines.append(header + (f" {'rpc':>5}" if rpcs is not None else ""))
+    for row in rows[:limit]:
+        line = (f"{row['label'][:24]:<24} {row['count']:>6} {row['errors']:>4} "
+                f"{row['p50'] * 1000:>6.0f} {row['p95'] * 1000:>6.0f}")
+        if rpcs is not None:
+            line += f" {rpcs.get(row['label'], 0):>5}"
+        lines.append(line)
+    lines.append("```")
+    return "\n".join(lines) + "\n"
+
+
+async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Admin command: /stats - Handler latency, Odoo and OpenAI call metrics since startup"""
+    if not is_admin(update):
+        await update.message.reply_text("⛔ This command is restricted to admins.")
+        return
+
+    try:
+        rpcs = {row["label"]: row["count"] for row in summarize(ODOO_RPC_LATENCY)}
+        message = "📈 *Bot metrics* (since startup, times in ms)\n\n"
+        message += _stats_table("Handlers", summarize(HANDLER_LATENCY, HANDLER_ERRORS))
+        message += _stats_table("Odoo calls", summarize(ODOO_CALL_LATENCY, ODOO_CALL_ERRORS), rpcs)
+        message += _stats_table("OpenAI", summarize(OPENAI_LATENCY, OPENAI_ERRORS))
+
+        intents = {key[0]: int(value) for key, value in VOICE_INTENTS.values().items()}
+        local, llm = intents.get("intent_matcher", 0), intents.get("llm", 0)
+        if local or llm:
+            message += f"🎤 Voice intents: {local} local, {llm} via LLM ({local / (local + llm):.0%} local)\n\n"
+        if not HANDLER_LATENCY.snapshot():
+            message += "No updates handled yet."
+
+        await update.message.reply_text(message, parse_mode="Markdown")
+    except Exception as e:
+        await update.message.reply_text(f"❌ Error getting metrics: {str(e)}")
+
+
 if __name__ == "__main__":
     """
     Example: Run a bot with default commands
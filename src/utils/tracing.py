@@ -0,0 +1,180 @@
+"""
+Tracing
+Spans with one trace ID per update, written as JSON lines to TRACE_FILE so
+a slow update can be broken down into its stages (see
+src/scripts/trace_timeline.py for a timeline view)
+"""
+
+import os
+import json
+import time
+import atexit
+import inspect
+import secrets
+import threading
+import functools
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, Iterator, Optional
+
+
+@dataclass
+class Span:
+    """One timed stage of handling an update."""
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    name: str
+    start: float
+    duration: float = 0.0
+    thread: str = ""
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def set(self, **attributes: Any):
+        """Add attributes, e.g. what a stage decided."""
+        self.attributes.update(attributes)
+
+
+class JsonLinesExporter:
+    """Appends finished spans to a file, one JSON object per line."""
+
+    def __init__(self, path: str):
+        """
+        Initialize the exporter.
+
+        Args:
+            path: File to append to (its directory is created if missing)
+        """
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        # Line buffered, so spans survive the bot being killed
+        self._file = open(path, "a", buffering=1, encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        line = json.dumps(asdict(span), default=str)
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line + "\n")
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+# Span the running code belongs to (copied into Odoo pool threads by run_odoo_call)
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+_exporter: Optional[JsonLinesExporter] = None
+_configured = False
+_exporter_lock = threading.Lock()
+
+
+def get_exporter() -> Optional[JsonLinesExporter]:
+    """Get the exporter for TRACE_FILE (None if tracing is off)."""
+    global _exporter, _configured
+
+    if not _configured:
+        with _exporter_lock:
+            if not _configured:
+                path = os.getenv('TRACE_FILE', '')
+                _exporter = JsonLinesExporter(path) if path else None
+                _configured = True
+                if _exporter is not None:
+                    atexit.register(_exporter.close)
+
+    return _exporter
+
+
+def set_trace_file(path: Optional[str]):
+    """
+    Start writing spans to another file, or stop tracing with None.
+
+    Args:
+        path: JSON-lines file to append spans to
+    """
+    global _exporter, _configured
+
+    with _exporter_lock:
+        if _exporter is not None:
+            _exporter.close()
+        _exporter = JsonLinesExporter(path) if path else None
+        _configured = True
+
+
+def current_span() -> Optional[Span]:
+    """The span of the code running now (None outside a trace or with tracing off)."""
+    return _current_span.get()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Time a block as a span.
+
+    Inside another span it becomes a child and shares its trace ID;
+    otherwise it starts a new trace. Yields None when tracing is off.
+
+    Example:
+        with span("transcribe_voice", bytes=len(audio)) as stage:
+            text = await transcribe(audio)
+            if stage:
+                stage.set(words=len(text.split()))
+    """
+    exporter = get_exporter()
+    if exporter is None:
+        yield None
+        return
+
+    parent = _current_span.get()
+    current = Span(
+        trace_id=parent.trace_id if parent else secrets.token_hex(8),
+        span_id=secrets.token_hex(4),
+        parent_id=parent.span_id if parent else None,
+        name=name,
+        start=time.time(),
+        thread=threading.current_thread().name,
+        attributes=attributes,
+    )
+
+    token = _current_span.set(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.duration = time.perf_counter() - started
+        _current_span.reset(token)
+        exporter.export(current)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """
+    Decorator running a function (sync or async) inside a span.
+
+    Args:
+        name: Span name (defaults to the function name)
+    """
+    def decorate(func: Callable) -> Callable:
+        label = name or func.__name__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(label):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(label):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorate
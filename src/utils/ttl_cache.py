@@ -0,0 +1,119 @@
+"""
+TTL Cache
+Small thread-safe in-process cache with per-entry expiry, LRU eviction and hit counters
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    A thread-safe cache where entries expire after ``ttl`` seconds.
+
+    When more than ``max_size`` entries are stored, the least recently used
+    one is evicted. Hits, misses and evictions are counted for monitoring.
+    """
+
+    def __init__(self, name: str, ttl: float, max_size: int = 128):
+        """
+        Initialize the cache.
+
+        Args:
+            name: Name used in stats output
+            ttl: Seconds an entry stays valid
+            max_size: Maximum number of entries before LRU eviction
+        """
+        self.name = name
+        self.ttl = ttl
+        self.max_size = max_size
+
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def _lookup(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return _MISSING
+
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.misses += 1
+                return _MISSING
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store value under key, evicting the least recently used entry if full."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], cache_if: Callable[[Any], bool] = bool) -> Any:
+        """
+        Return the cached value, or call loader and cache its result.
+
+        Args:
+            key: Cache key
+            loader: Callable producing the value on a miss
+            cache_if: Predicate deciding whether a loaded value is cached
+                      (by default empty results are not cached)
+        """
+        value = self._lookup(key)
+        if value is not _MISSING:
+            return value
+
+        value = loader()
+        if cache_if(value):
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key: Hashable):
+        """Drop a single entry."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
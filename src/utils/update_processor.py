@@ -0,0 +1,209 @@
+"""
+Chat-Ordered Update Processor
+Processes updates concurrently while keeping each chat's updates in order
+and capping how many copies of expensive commands run at once
+"""
+
+import os
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Dict, Hashable, Optional
+
+from telegram import Update
+from telegram.ext import Application, BaseUpdateProcessor
+
+
+def parse_command_limits(value: Optional[str]) -> Dict[str, int]:
+    """
+    Parse per-command limits like "invoiced=2,summary=3".
+
+    Args:
+        value: Comma-separated command=limit pairs (a leading / is ignored)
+
+    Returns:
+        Mapping of command name to maximum concurrent runs
+    """
+    limits: Dict[str, int] = {}
+
+    for item in (value or "").split(","):
+        if not item.strip():
+            continue
+
+        command, _, limit = item.partition("=")
+        try:
+            limits[command.strip().lstrip("/").lower()] = max(1, int(limit))
+        except ValueError:
+            raise ValueError(f"Invalid command limit '{item.strip()}'. Use command=number, e.g. invoiced=2.")
+
+    return limits
+
+
+def _chat_key(update: object) -> Optional[Hashable]:
+    if not isinstance(update, Update):
+        return None
+    if update.effective_chat is not None:
+        return update.effective_chat.id
+    if update.effective_user is not None:
+        return ("user", update.effective_user.id)
+    return None
+
+
+def _command_name(update: object) -> Optional[str]:
+    if not isinstance(update, Update) or update.effective_message is None:
+        return None
+
+    text = update.effective_message.text or ""
+    if not text.startswith("/"):
+        return None
+
+    # "/invoiced@my_bot args" -> "invoiced"
+    return text[1:].split(maxsplit=1)[0].split("@")[0].lower() if len(text) > 1 else None
+
+
+class _ChatLock:
+    __slots__ = ("lock", "users")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.users = 0
+
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """
+    Update processor with a global limit, per-chat ordering and per-command caps.
+
+    Updates from different chats run concurrently, up to
+    ``max_concurrent_updates`` at a time. Updates from the same chat run one
+    after another in arrival order, so ConversationHandler state (e.g. the
+    /logtime flow) never sees two steps at once. Commands listed in
+    ``command_limits`` are additionally capped, e.g. at most 2 /invoiced
+    reports building at the same time. Only typed ``/command`` messages are
+    matched; handlers that run a capped command some other way (a button,
+    a voice message) take the same slot with command_slot().
+
+    Updates waiting for their chat or command do not take one of the
+    ``max_concurrent_updates`` slots, so a busy chat cannot starve the others.
+    """
+
+    def __init__(
+        self,
+        max_concurrent_updates: Optional[int] = None,
+        command_limits: Optional[Dict[str, int]] = None,
+        max_pending_updates: Optional[int] = None
+    ):
+        """
+        Initialize the processor.
+
+        Args:
+            max_concurrent_updates: Handlers running at once across all chats
+                                    (reads TELEGRAM_CONCURRENT_UPDATES, defaults to 8)
+            command_limits: Maximum concurrent runs per command
+                            (reads TELEGRAM_COMMAND_LIMITS, e.g. "invoiced=2")
+            max_pending_updates: Updates accepted (running or waiting) before new ones queue up
+                                 (reads TELEGRAM_MAX_PENDING_UPDATES, defaults to 1024)
+        """
+        self.concurrency = max_concurrent_updates or int(os.getenv('TELEGRAM_CONCURRENT_UPDATES', '8'))
+        if self.concurrency < 1:
+            raise ValueError("TELEGRAM_CONCURRENT_UPDATES must be a positive integer.")
+
+        if command_limits is None:
+            command_limits = parse_command_limits(os.getenv('TELEGRAM_COMMAND_LIMITS'))
+        self.command_limits = command_limits
+
+        pending = max_pending_updates or int(os.getenv('TELEGRAM_MAX_PENDING_UPDATES', '1024'))
+
+        # The base class semaphore bounds admitted updates; ours bounds running handlers
+        super().__init__(max(pending, self.concurrency))
+
+        self._running = asyncio.Semaphore(self.concurrency)
+        self._command_slots = {name: asyncio.Semaphore(limit) for name, limit in command_limits.items()}
+        self._chats: Dict[Hashable, _ChatLock] = {}
+        self.active = 0
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        self._chats.clear()
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        chat_key = _chat_key(update)
+        command_slot = self._command_slots.get(_command_name(update))
+
+        if chat_key is None:
+            await self._run(coroutine, command_slot)
+            return
+
+        chat = self._chats.get(chat_key)
+        if chat is None:
+            chat = self._chats[chat_key] = _ChatLock()
+        chat.users += 1
+
+        try:
+            # asyncio.Lock wakes waiters in FIFO order, which keeps the chat's updates in sequence
+            async with chat.lock:
+                await self._run(coroutine, command_slot)
+        finally:
+            chat.users -= 1
+            if chat.users == 0 and self._chats.get(chat_key) is chat:
+                del self._chats[chat_key]
+
+    async def _run(self, coroutine: Awaitable[Any], command_slot: Optional[asyncio.Semaphore]):
+        if command_slot is not None:
+            await command_slot.acquire()
+
+        try:
+            async with self._running:
+                self.active += 1
+                try:
+                    await coroutine
+                finally:
+                    self.active -= 1
+        finally:
+            if command_slot is not None:
+                command_slot.release()
+
+    @asynccontextmanager
+    async def command_slot(self, command: str) -> AsyncIterator[None]:
+        """
+        Hold one of a command's slots, for handlers that run it without a typed /command.
+
+        Unlike typed commands, the caller already holds a running slot while it waits.
+
+        Args:
+            command: Command name, e.g. "summary" (no-op if it has no limit)
+        """
+        slot = self._command_slots.get(command.lstrip("/").lower())
+        if slot is None:
+            yield
+            return
+
+        async with slot:
+            yield
+
+    def stats(self) -> Dict[str, Any]:
+        """Return running and waiting counters."""
+        return {
+            "max_concurrent_updates": self.concurrency,
+            "active": self.active,
+            "busy_chats": len(self._chats),
+            "command_limits": dict(self.command_limits),
+        }
+
+
+@asynccontextmanager
+async def command_slot(application: Application, command: str) -> AsyncIterator[None]:
+    """
+    Hold a slot of TELEGRAM_COMMAND_LIMITS for command, if the application caps it.
+
+    Args:
+        application: Application whose update processor enforces the limits
+        command: Command name, e.g. "summary"
+    """
+    processor = application.update_processor
+    if not isinstance(processor, ChatOrderedUpdateProcessor):
+        yield
+        return
+
+    async with processor.command_slot(command):
+        yield
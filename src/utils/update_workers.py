@@ -0,0 +1,300 @@
+"""
+Update Workers
+Splits the bot into one ingress process (polling or webhook) and N worker
+processes that run the registered handlers
+"""
+
+import os
+import json
+import time
+import zlib
+import signal
+import asyncio
+import threading
+import multiprocessing
+from queue import Empty
+from typing import Callable, Dict, List, Optional, Set
+
+from telegram import Update
+from telegram.ext import ContextTypes, TypeHandler
+
+from .rate_limiter import TelegramRateLimiter
+from .telegram_listener import TelegramCommandBot
+
+
+def shard_for(update: Update, workers: int) -> int:
+    """
+    Pick the worker for an update.
+
+    Updates are keyed by chat (or by user for inline queries and other
+    chat-less updates), so one chat always lands on the same worker and its
+    updates are handled in the order they arrived.
+
+    Args:
+        update: Incoming update
+        workers: Number of workers
+
+    Returns:
+        Worker index between 0 and workers - 1
+    """
+    if update.effective_chat is not None:
+        key = update.effective_chat.id
+    elif update.effective_user is not None:
+        key = update.effective_user.id
+    else:
+        key = update.update_id
+
+    return zlib.crc32(str(key).encode()) % workers
+
+
+def is_primary_worker() -> bool:
+    """
+    Whether this process should run process-wide background work.
+
+    True in single-process mode and in worker 0; scheduled jobs and warm-ups
+    registered only here run once instead of once per worker.
+    """
+    return int(os.getenv('TELEGRAM_WORKER_INDEX') or 0) == 0
+
+
+def _run_worker(index: int, queue, setup: Callable[[TelegramCommandBot], None], bot_token: Optional[str], global_rate: float):
+    """Worker process entry point."""
+    # Ctrl+C goes to the whole process group; the ingress stops us with a sentinel instead
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    os.environ['TELEGRAM_WORKER_INDEX'] = str(index)
+
+    # The ingress serves METRICS_PORT; worker N serves its own handler metrics on METRICS_PORT + 1 + N
+    metrics_port = int(os.getenv('METRICS_PORT') or 0)
+    if metrics_port:
+        os.environ['METRICS_PORT'] = str(metrics_port + 1 + index)
+
+    try:
+        asyncio.run(_worker_loop(index, queue, setup, bot_token, global_rate))
+    except Exception as e:
+        print(f"❌ Worker {index} crashed: {e}")
+        raise
+
+
+async def _worker_loop(index: int, queue, setup: Callable[[TelegramCommandBot], None], bot_token: Optional[str], global_rate: float):
+    # Each worker gets its share of Telegram's per-bot global limit
+    bot = TelegramCommandBot(
+        bot_token=bot_token,
+        mode="polling",
+        rate_limiter=TelegramRateLimiter(global_rate=global_rate),
+    )
+    setup(bot)
+
+    app = bot.app
+    loop = asyncio.get_running_loop()
+
+    async with app:
+        if app.post_init:
+            await app.post_init(app)
+
+        await app.start()
+        print(f"✓ Worker {index} ready (pid {os.getpid()})")
+
+        try:
+            while True:
+                payload = await loop.run_in_executor(None, queue.get)
+                if payload is None:
+                    break
+
+                update = Update.de_json(json.loads(payload), app.bot)
+                await app.update_queue.put(update)
+        finally:
+            # Finishes the updates already queued before returning
+            await app.stop()
+
+            if app.post_stop:
+                await app.post_stop(app)
+
+        if app.post_shutdown:
+            await app.post_shutdown(app)
+
+
+class UpdateWorkerPool:
+    """
+    Runs handlers in several processes behind a single update stream.
+
+    Telegram only allows one poller (or one webhook) per bot token, so a
+    single ingress process receives every update and forwards it to one of
+    ``workers`` processes over a multiprocessing queue. Each worker builds
+    its own TelegramCommandBot with ``setup`` and processes its share of
+    chats, so slow or CPU-heavy commands in one chat no longer hold up the
+    others. Conversation state stays valid because a chat always goes to
+    the same worker.
+
+    A worker that dies is restarted (its queued updates are handed to the
+    new process). One that keeps crashing is given up on and its chats are
+    routed to the remaining workers.
+
+    Example:
+        def register_handlers(bot):
+            bot.add_command("ping", ping_command)
+
+        UpdateWorkerPool(register_handlers, workers=4).run()
+    """
+
+    # A worker restarted this often within RESTART_WINDOW seconds is given up on
+    MAX_RESTARTS = 5
+    RESTART_WINDOW = 60.0
+
+    def __init__(self, setup: Callable[[TelegramCommandBot], None], workers: Optional[int] = None,
+                 bot_token: Optional[str] = None, monitor_interval: float = 5.0):
+        """
+        Initialize the pool.
+
+        Args:
+            setup: Module-level function registering handlers on a TelegramCommandBot
+                   (called once in every worker, so it must be picklable; use
+                   is_primary_worker() for work that should only run once)
+            workers: Number of worker processes (reads TELEGRAM_WORKERS, defaults to CPU count)
+            bot_token: Telegram bot token (reads from TELEGRAM_BOT_TOKEN env var if not provided)
+            monitor_interval: Seconds between liveness checks of the workers
+        """
+        self.setup = setup
+        self.workers = workers or int(os.getenv('TELEGRAM_WORKERS', '0')) or (os.cpu_count() or 1)
+        self.bot_token = bot_token
+        self.monitor_interval = monitor_interval
+
+        # Spawn gives every worker a clean interpreter (no inherited event loops or threads)
+        self._context = multiprocessing.get_context("spawn")
+        self._global_rate = float(os.getenv('TELEGRAM_GLOBAL_RATE', '30')) / self.workers
+        self._queues: List = []
+        self._processes: List = []
+        self._restarts: Dict[int, List[float]] = {}
+        self._retired: Set[int] = set()
+
+        # dispatch() runs on the ingress event loop, the monitor on its own thread
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+
+    def _spawn(self, index: int, queue) -> multiprocessing.Process:
+        process = self._context.Process(
+            target=_run_worker,
+            args=(index, queue, self.setup, self.bot_token, self._global_rate),
+            name=f"telegram-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        return process
+
+    def start(self):
+        """Start the worker processes and the liveness monitor."""
+        for index in range(self.workers):
+            queue = self._context.Queue()
+            self._queues.append(queue)
+            self._processes.append(self._spawn(index, queue))
+
+        self._stopping.clear()
+        self._monitor = threading.Thread(target=self._watch, name="worker-monitor", daemon=True)
+        self._monitor.start()
+
+        print(f"✓ Started {self.workers} update workers")
+
+    def _watch(self):
+        while not self._stopping.wait(self.monitor_interval):
+            with self._lock:
+                for index in range(len(self._processes)):
+                    self._ensure_alive(index)
+
+    def _ensure_alive(self, index: int) -> bool:
+        """
+        Restart a dead worker (call with the lock held).
+
+        Returns:
+            True if the worker is running, False if it was given up on
+        """
+        process = self._processes[index]
+        if process.is_alive():
+            return True
+        if index in self._retired:
+            return False
+
+        now = time.monotonic()
+        restarts = [at for at in self._restarts.get(index, []) if now - at < self.RESTART_WINDOW]
+        if len(restarts) >= self.MAX_RESTARTS:
+            self._retired.add(index)
+            print(f"❌ Worker {index} keeps crashing (exit code {process.exitcode}), "
+                  f"routing its chats to the other workers")
+            return False
+
+        print(f"⚠️ Worker {index} died (exit code {process.exitcode}), restarting it")
+        self._restarts[index] = restarts + [now]
+
+        # The dead process may have held the queue's read lock: move what is left to a new queue
+        old_queue, new_queue = self._queues[index], self._context.Queue()
+        moved = 0
+        while True:
+            try:
+                new_queue.put(old_queue.get_nowait())
+                moved += 1
+            except (Empty, OSError, ValueError):
+                break
+        old_queue.close()
+        if moved:
+            print(f"   {moved} queued updates handed to the new worker {index}")
+
+        self._queues[index] = new_queue
+        self._processes[index] = self._spawn(index, new_queue)
+        return True
+
+    def dispatch(self, update: Update):
+        """Forward an update to the worker that owns its chat."""
+        with self._lock:
+            index = shard_for(update, self.workers)
+
+            if not self._ensure_alive(index):
+                # Re-route the chats of a worker that was given up on (their conversations restart)
+                alive = [i for i in range(self.workers) if i not in self._retired]
+                if not alive:
+                    print(f"⚠️ No update workers left, dropping update {update.update_id}")
+                    return
+                index = alive[shard_for(update, len(alive))]
+
+            self._queues[index].put(update.to_json())
+
+    async def _forward(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        self.dispatch(update)
+
+    def stop(self, timeout: float = 30.0):
+        """Let the workers finish their queued updates, then stop them."""
+        self._stopping.set()
+        if self._monitor is not None:
+            self._monitor.join()
+            self._monitor = None
+
+        for queue in self._queues:
+            queue.put(None)
+
+        for index, process in enumerate(self._processes):
+            process.join(timeout)
+            if process.is_alive():
+                print(f"⚠️ Worker {index} did not stop in {timeout:g}s, terminating")
+                process.terminate()
+                process.join()
+
+        self._queues.clear()
+        self._processes.clear()
+        self._restarts.clear()
+        self._retired.clear()
+        print("✓ Update workers stopped")
+
+    def run(self, mode: Optional[str] = None):
+        """
+        Start the workers and the ingress. Blocks until the bot is stopped.
+
+        Args:
+            mode: 'polling' or 'webhook' for the ingress (reads TELEGRAM_MODE if not provided)
+        """
+        # The ingress runs no handlers, so it keeps no state; only the workers open the storage
+        ingress = TelegramCommandBot(bot_token=self.bot_token, mode=mode, persistent=False)
+        ingress.app.add_handler(TypeHandler(Update, self._forward))
+
+        self.start()
+        try:
+            ingress.run()
+        finally:
+            self.stop()
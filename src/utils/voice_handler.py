@@ -4,24 +4,36 @@ Transcribes voice messages and interprets them as commands using AI
 """
 
 import os
-import tempfile
-from typing import Optional, Dict, Any
+import asyncio
+from typing import Optional, Dict, Any, Iterable, Union
 from dotenv import load_dotenv
+import httpx
 import openai
 
+from .intent_matcher import build_intent_matcher
+from .metrics import VOICE_INTENTS, measure_openai
+from .tracing import current_span, traced
+
 
 class VoiceCommandHandler:
     """
     Handles voice message transcription and command interpretation.
     Uses OpenAI Whisper for transcription and GPT for command interpretation.
+
+    All OpenAI calls go through one async client with a shared connection pool,
+    so several voice messages can be processed concurrently without blocking
+    the event loop. The client retries connection errors, 429s and 5xx
+    responses with exponential backoff.
     """
 
-    def __init__(self, openai_api_key: Optional[str] = None):
+    def __init__(self, openai_api_key: Optional[str] = None, command_names: Optional[Iterable[str]] = None):
         """
         Initialize the voice handler.
 
         Args:
             openai_api_key: OpenAI API key (reads from OPENAI_API_KEY env var if not provided)
+            command_names: Commands that have a handler (e.g. COMMAND_MAP keys);
+                           only these are resolved locally without the LLM
         """
         load_dotenv()
 
@@ -30,8 +42,25 @@ class VoiceCommandHandler:
         if not self.api_key:
             raise ValueError("OpenAI API key not provided. Set OPENAI_API_KEY environment variable.")
 
-        # Initialize OpenAI client
-        self.client = openai.OpenAI(api_key=self.api_key)
+        # Concurrency, timeout and retry limits for OpenAI calls
+        self.max_concurrency = int(os.getenv('OPENAI_MAX_CONCURRENCY', '4'))
+        self.timeout = float(os.getenv('OPENAI_TIMEOUT', '30'))
+        self.max_retries = int(os.getenv('OPENAI_MAX_RETRIES', '3'))
+
+        # Initialize async OpenAI client with a shared keep-alive connection pool
+        self.http_client = openai.DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency
+            )
+        )
+        self.client = openai.AsyncOpenAI(
+            api_key=self.api_key,
+            timeout=self.timeout,
+            max_retries=self.max_retries,
+            http_client=self.http_client
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
 
         # Available commands that the AI can trigger
         self.available_commands = {
@@ -51,27 +80,41 @@ class VoiceCommandHandler:
             "logtime": "Start interactive time logging on a project and task",
         }
 
-    async def transcribe_voice(self, audio_file_path: str) -> str:
+        # Local matcher for obvious commands; low-confidence input goes to GPT
+        self.intent_matcher = build_intent_matcher(
+            self.available_commands,
+            command_names,
+            threshold=float(os.getenv('VOICE_INTENT_THRESHOLD', '0.8'))
+        )
+
+    @traced()
+    async def transcribe_voice(self, audio: Union[bytes, bytearray, str]) -> str:
         """
-        Transcribe audio file to text using OpenAI Whisper.
+        Transcribe audio to text using OpenAI Whisper.
 
         Args:
-            audio_file_path: Path to the audio file
+            audio: OGG audio bytes (streamed straight to the API) or a path to an audio file
 
         Returns:
             Transcribed text
         """
         try:
-            with open(audio_file_path, "rb") as audio_file:
-                transcript = self.client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    language="en"  # Can be removed for auto-detection
-                )
+            if isinstance(audio, str):
+                with open(audio, "rb") as audio_file:
+                    audio = audio_file.read()
+
+            async with self._semaphore:
+                with measure_openai("transcription"):
+                    transcript = await self.client.audio.transcriptions.create(
+                        model="whisper-1",
+                        file=("voice.ogg", bytes(audio), "audio/ogg"),
+                        language="en"  # Can be removed for auto-detection
+                    )
             return transcript.text
         except Exception as e:
             raise Exception(f"Transcription failed: {str(e)}")
 
+    @traced()
     async def interpret_command(self, transcription: str) -> Dict[str, Any]:
         """
         Use AI to interpret the transcribed text and determine what command to execute.
@@ -82,6 +125,19 @@ class VoiceCommandHandler:
         Returns:
             Dict with 'command' (str or None) and 'explanation' (str)
         """
+        # Fast path: resolve obvious commands locally
+        command = self.intent_matcher.resolve(transcription)
+        resolved_by = "intent_matcher" if command else "llm"
+        VOICE_INTENTS.inc(resolved_by=resolved_by)
+        stage = current_span()
+        if stage:
+            stage.set(resolved_by=resolved_by)
+        if command:
+            return {
+                "command": command,
+                "explanation": f"I heard: '{transcription}'\n\nExecuting command: /{command}"
+            }
+
         commands_list = "\n".join([f"- {cmd}: {desc}" for cmd, desc in self.available_commands.items()])
 
         prompt = f"""You are a voice command interpreter for a Telegram bot. The user said:
@@ -98,15 +154,17 @@ If the user is asking a question or making a statement that doesn't match a comm
 Command:"""
 
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are a command interpreter. Respond with only the command name or 'none'."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=50
-            )
+            async with self._semaphore:
+                with measure_openai("chat"):
+                    response = await self.client.chat.completions.create(
+                        model="gpt-4o-mini",
+                        messages=[
+                            {"role": "system", "content": "You are a command interpreter. Respond with only the command name or 'none'."},
+                            {"role": "user", "content": prompt}
+                        ],
+                        temperature=0.3,
+                        max_tokens=50
+                    )
 
             command = response.choices[0].message.content.strip().lower()
 
@@ -125,18 +183,18 @@ Command:"""
         except Exception as e:
             raise Exception(f"Command interpretation failed: {str(e)}")
 
-    async def process_voice_message(self, audio_file_path: str) -> Dict[str, Any]:
+    async def process_voice_message(self, audio: Union[bytes, bytearray, str]) -> Dict[str, Any]:
         """
         Complete pipeline: transcribe voice and interpret command.
 
         Args:
-            audio_file_path: Path to the audio file
+            audio: OGG audio bytes or a path to an audio file
 
         Returns:
             Dict with 'transcription', 'command', and 'explanation'
         """
         # Step 1: Transcribe
-        transcription = await self.transcribe_voice(audio_file_path)
+        transcription = await self.transcribe_voice(audio)
 
         # Step 2: Interpret
         interpretation = await self.interpret_command(transcription)
@@ -147,24 +205,25 @@ Command:"""
             "explanation": interpretation["explanation"]
         }
 
+    def get_intent_stats(self) -> Dict[str, float]:
+        """Get local intent matcher hit and LLM fallback counters."""
+        return self.intent_matcher.stats()
+
+    async def close(self):
+        """Close the shared OpenAI HTTP connection pool."""
+        await self.client.close()
 
-async def download_voice_file(telegram_file, bot) -> str:
+
+@traced()
+async def download_voice_file(telegram_file, bot) -> bytearray:
     """
-    Download voice file from Telegram and save to temp location.
+    Download voice file from Telegram into memory.
 
     Args:
         telegram_file: The file object from Telegram
         bot: The bot instance
 
     Returns:
-        Path to downloaded file
+        The OGG audio bytes (nothing is written to disk)
     """
-    # Create temp file
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".ogg")
-    temp_path = temp_file.name
-    temp_file.close()
-
-    # Download file
-    await telegram_file.download_to_drive(temp_path)
-
-    return temp_path
+    return await telegram_file.download_as_bytearray()
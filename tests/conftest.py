@@ -0,0 +1,30 @@
+"""Shared fixtures: a small fake Odoo served in-process."""
+
+import pytest
+
+from benchmarks.fake_odoo import FakeOdooServer, DATABASE, LOGIN, PASSWORD
+from benchmarks.odoo_client import XmlRpcOdooClient
+
+
+@pytest.fixture(scope="session")
+def fake_odoo_server():
+    server = FakeOdooServer(timesheets=2000, invoices=50, projects=20, tasks_per_project=5).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def fake_odoo(fake_odoo_server):
+    """Point the wrapper's client pool at the fake Odoo, with empty caches."""
+    from src.utils.odoo_time_wrapper import set_odoo_client_factory, flush_odoo_caches, get_odoo_pool
+
+    url = fake_odoo_server.url
+    original = get_odoo_pool().factory
+    set_odoo_client_factory(lambda: XmlRpcOdooClient(url, DATABASE, LOGIN, PASSWORD))
+    flush_odoo_caches()
+
+    yield fake_odoo_server
+
+    flush_odoo_caches()
+    get_odoo_pool().factory = original
+    get_odoo_pool().clear()
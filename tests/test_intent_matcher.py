@@ -0,0 +1,35 @@
+"""Tests for the local voice intent matcher."""
+
+import pytest
+
+from src.utils.intent_matcher import IntentMatcher, DEFAULT_SYNONYMS
+
+COMMANDS = {name: f"Run {name}" for name in DEFAULT_SYNONYMS}
+
+
+@pytest.fixture
+def matcher():
+    return IntentMatcher(COMMANDS, threshold=0.8)
+
+
+@pytest.mark.parametrize("text, command", [
+    ("statis", "status"),
+    ("pingg", "ping"),
+    ("summery", "summary"),
+    ("invoyced", "invoiced"),
+    ("deploi", "deploy"),
+    ("Show me the summery please", "summary"),
+])
+def test_misheard_words_resolve_locally(matcher, text, command):
+    assert matcher.resolve(text) == command
+    assert matcher.stats()["local_hits"] == 1
+
+
+@pytest.mark.parametrize("text", ["weather", "banana", "weak"])
+def test_unclear_words_fall_back_to_the_llm(matcher, text):
+    assert matcher.resolve(text) is None
+    assert matcher.stats()["llm_fallbacks"] == 1
+
+
+def test_exact_phrases_score_highest(matcher):
+    assert matcher.match("what time is it") == ("time", 1.0)
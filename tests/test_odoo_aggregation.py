@@ -0,0 +1,48 @@
+"""Tests for the /summary rollup against the fake Odoo."""
+
+from datetime import date
+
+import pytest
+
+from benchmarks.fake_odoo import DATABASE, LOGIN, PASSWORD, UID
+from benchmarks.odoo_client import XmlRpcOdooClient
+from src.utils.odoo_aggregation import summarize_time_periods, last_weeks, last_months, last_quarters
+
+
+def _hours(client, company_id, start, end):
+    return sum(float(entry.unit_amount or 0.0) for entry in client.get_time_entries(start, end, company_id=company_id))
+
+
+@pytest.fixture
+def line_without_project(fake_odoo):
+    """A timesheet line get_time_entries leaves out, removed after the test."""
+    client = XmlRpcOdooClient(fake_odoo.url, DATABASE, LOGIN, PASSWORD)
+    company_id = client.get_companies()[0].id
+
+    with fake_odoo.data.lock:
+        line_id = fake_odoo.data.add('account.analytic.line', {
+            "name": "No project", "date": date.today().isoformat(), "unit_amount": 7.0,
+            "user_id": UID, "project_id": False, "task_id": False, "company_id": company_id,
+        })
+    yield company_id
+
+    with fake_odoo.data.lock:
+        del fake_odoo.data.models['account.analytic.line'][line_id]
+
+
+def test_summary_matches_get_time_entries_per_period(fake_odoo, line_without_project):
+    client = XmlRpcOdooClient(fake_odoo.url, DATABASE, LOGIN, PASSWORD)
+    company_id = line_without_project
+    today = date.today()
+
+    # The line without a project must not be counted either
+    periods = summarize_time_periods(client, company_id, today, count=4)
+
+    expected_weeks = [_hours(client, company_id, start, end) for _, _, start, end in last_weeks(today, 4)]
+    expected_months = [_hours(client, company_id, start, end) for _, _, start, end in last_months(today, 4)]
+    expected_quarters = [_hours(client, company_id, start, end) for _, _, start, end in last_quarters(today, 4)]
+
+    assert [hours for _, _, hours in periods["weeks"]] == expected_weeks
+    assert [hours for _, hours in periods["months"]] == expected_months
+    assert [hours for _, _, hours in periods["quarters"]] == expected_quarters
+    assert sum(expected_quarters) > 0
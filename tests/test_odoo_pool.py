@@ -0,0 +1,77 @@
+"""Tests for the Odoo client pool."""
+
+import time
+import threading
+
+from src.utils.odoo_pool import OdooClientPool
+
+
+class FakeClient:
+    def __init__(self, number: int):
+        self.number = number
+
+
+def test_expired_idle_clients_are_replaced_within_max_size():
+    created = []
+    lock = threading.Lock()
+
+    def factory():
+        with lock:
+            client = FakeClient(len(created))
+            created.append(client)
+        return client
+
+    pool = OdooClientPool(factory, max_size=2, health_check_interval=300, max_lifetime=0.05)
+
+    # Fill the pool with two idle clients, then let them expire
+    with pool.session(), pool.session():
+        pass
+    assert pool.stats()["idle"] == 2
+    time.sleep(0.1)
+
+    active = 0
+    peak = 0
+    errors = []
+    state = threading.Lock()
+
+    def worker():
+        nonlocal active, peak
+        try:
+            with pool.session(timeout=5):
+                with state:
+                    active += 1
+                    peak = max(peak, active)
+                time.sleep(0.02)
+                with state:
+                    active -= 1
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert peak <= 2
+
+    stats = pool.stats()
+    assert stats["size"] <= 2
+    assert stats["in_use"] == 0
+    assert stats["idle"] == stats["size"]
+    # The two expired clients were replaced, not kept
+    assert len(created) >= 4
+
+
+def test_unhealthy_idle_client_keeps_its_slot():
+    pool = OdooClientPool(lambda: FakeClient(0), max_size=1, health_check_interval=0,
+                          health_check=lambda client: False)
+
+    with pool.session():
+        pass
+    with pool.session() as client:
+        assert client is not None
+        assert pool.stats() == {"size": 1, "idle": 0, "in_use": 1, "max_size": 1}
+
+    assert pool.stats() == {"size": 1, "idle": 1, "in_use": 0, "max_size": 1}
@@ -0,0 +1,41 @@
+"""Tests for the SQLite bot state persistence."""
+
+import asyncio
+import datetime
+
+import pytest
+
+from src.utils.persistence import SQLitePersistence
+
+
+def test_workers_keep_their_own_user_data(tmp_path):
+    path = str(tmp_path / "state.sqlite3")
+
+    async def run():
+        # The same user reached two workers through two chats
+        first = SQLitePersistence(path, worker=0)
+        second = SQLitePersistence(path, worker=1, store_bot_data=False)
+        await first.update_user_data(7, {"project_id": 1})
+        await second.update_user_data(7, {"project_id": 2})
+        await first.flush()
+        await second.flush()
+
+        # One worker clearing its session leaves the other's untouched
+        await first.update_user_data(7, {})
+        await first.flush()
+
+        return (
+            await SQLitePersistence(path, worker=0).get_user_data(),
+            await SQLitePersistence(path, worker=1).get_user_data(),
+        )
+
+    assert asyncio.run(run()) == ({}, {7: {"project_id": 2}})
+
+
+def test_non_json_values_are_rejected(tmp_path):
+    async def run():
+        persistence = SQLitePersistence(str(tmp_path / "state.sqlite3"))
+        await persistence.update_user_data(7, {"day": datetime.date(2024, 1, 1)})
+
+    with pytest.raises(TypeError, match="Cannot persist user 7"):
+        asyncio.run(run())
@@ -0,0 +1,19 @@
+"""Tests for paging a project's tasks in the /logtime conversation."""
+
+from benchmarks.fake_odoo import DATABASE, LOGIN, PASSWORD
+from benchmarks.odoo_client import XmlRpcOdooClient
+from src.utils.odoo_time_wrapper import get_tasks_page, get_tasks_list
+
+
+def test_pages_stay_consistent_when_the_task_list_gets_cached(fake_odoo):
+    client = XmlRpcOdooClient(fake_odoo.url, DATABASE, LOGIN, PASSWORD)
+    expected = [task.id for task in client.get_tasks(1)]
+    assert len(expected) > 20
+
+    # Page 1 comes from Odoo, then find_tasks or the warm-up caches the full list
+    first, total = get_tasks_page(1, offset=0, limit=10)
+    get_tasks_list(1)
+    second, _ = get_tasks_page(1, offset=10, limit=10)
+
+    assert total == len(expected)
+    assert [task["id"] for task in first + second] == expected[:20]
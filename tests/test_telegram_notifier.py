@@ -0,0 +1,71 @@
+"""Tests for the long-lived TelegramNotifier send queue."""
+
+import threading
+
+from telegram.ext import ExtBot
+
+from src.utils.telegram_bot import TelegramNotifier
+
+
+async def _noop(self, *args, **kwargs):
+    pass
+
+
+def _notifier(monkeypatch) -> TelegramNotifier:
+    # No Bot API here: skip the connection pool setup
+    monkeypatch.setattr(ExtBot, "initialize", _noop)
+    monkeypatch.setattr(ExtBot, "shutdown", _noop)
+    return TelegramNotifier(bot_token="123:abc", chat_id="1")
+
+
+def test_sender_survives_unexpected_errors(monkeypatch):
+    notifier = _notifier(monkeypatch)
+    sent = []
+
+    async def send_message(text, parse_mode=None, chat_id=None, priority=None):
+        if text == "boom":
+            raise RuntimeError("rate limiter broke")
+        sent.append(text)
+        return True
+
+    monkeypatch.setattr(notifier, "send_message", send_message)
+
+    with notifier:
+        failed = notifier.enqueue("boom")
+        assert failed.result(timeout=5) is False
+
+        later = notifier.enqueue("after")
+        assert later.result(timeout=5) is True
+        notifier.flush(timeout=5)
+
+    assert sent == ["after"]
+
+
+def test_concurrent_first_use_starts_one_loop(monkeypatch):
+    notifier = _notifier(monkeypatch)
+    started = []
+    start_loop = notifier._start_loop
+
+    def counting_start_loop():
+        started.append(threading.current_thread())
+        start_loop()
+
+    monkeypatch.setattr(notifier, "_start_loop", counting_start_loop)
+
+    barrier = threading.Barrier(8)
+
+    def first_use():
+        barrier.wait()
+        notifier.start()
+
+    threads = [threading.Thread(target=first_use) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    try:
+        assert len(started) == 1
+        assert notifier.is_running
+    finally:
+        notifier.close(timeout=5)
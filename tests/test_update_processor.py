@@ -0,0 +1,59 @@
+"""Tests for the chat-ordered update processor's command limits."""
+
+import asyncio
+
+from telegram import Update
+
+from src.utils.update_processor import ChatOrderedUpdateProcessor
+
+
+def _command_update(update_id: int, chat_id: int, text: str) -> Update:
+    return Update.de_json({
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id, "date": 0, "text": text,
+            "chat": {"id": chat_id, "type": "private"},
+            "from": {"id": chat_id, "is_bot": False, "first_name": "Test"},
+        },
+    }, None)
+
+
+def test_command_slot_shares_the_typed_command_limit():
+    async def run():
+        processor = ChatOrderedUpdateProcessor(max_concurrent_updates=4, command_limits={"summary": 1})
+        events = []
+        typed_started = asyncio.Event()
+        release_typed = asyncio.Event()
+
+        async def typed_summary():
+            events.append("typed start")
+            typed_started.set()
+            await release_typed.wait()
+            events.append("typed end")
+
+        async def refresh_button():
+            async with processor.command_slot("summary"):
+                events.append("refresh")
+
+        typed = asyncio.create_task(processor.do_process_update(_command_update(1, 1, "/summary"), typed_summary()))
+        await typed_started.wait()
+
+        # From another chat, e.g. the Refresh button: waits for the typed /summary
+        refresh = asyncio.create_task(refresh_button())
+        await asyncio.sleep(0.05)
+        assert events == ["typed start"]
+
+        release_typed.set()
+        await asyncio.gather(typed, refresh)
+        return events
+
+    assert asyncio.run(run()) == ["typed start", "typed end", "refresh"]
+
+
+def test_command_slot_without_a_limit_does_not_wait():
+    async def run():
+        processor = ChatOrderedUpdateProcessor(max_concurrent_updates=4, command_limits={})
+        async with processor.command_slot("summary"):
+            return True
+
+    assert asyncio.run(run())